@@ -1,35 +1,59 @@
 # app/email_config.py
+"""
+SMTP settings for fastapi-mail, read from the environment / .env on first use.
 
-from pydantic_settings import BaseSettings
-from fastapi_mail import ConnectionConfig
-import os
-from dotenv import load_dotenv
-
-# ✅ Load .env file
-load_dotenv()
-
-class Settings(BaseSettings):
-    MAIL_USERNAME: str
-    MAIL_PASSWORD: str
-    MAIL_FROM: str
-    MAIL_PORT: int = 587
-    MAIL_SERVER: str = "smtp.gmail.com"
-    MAIL_STARTTLS: bool = True
-    MAIL_SSL_TLS: bool = False
-    USE_CREDENTIALS: bool = True
-
-    class Config:
-        env_file = ".env"
-
-settings = Settings()
-
-email_config = ConnectionConfig(
-    MAIL_USERNAME=settings.MAIL_USERNAME,
-    MAIL_PASSWORD=settings.MAIL_PASSWORD,
-    MAIL_FROM=settings.MAIL_FROM,
-    MAIL_PORT=settings.MAIL_PORT,
-    MAIL_SERVER=settings.MAIL_SERVER,
-    MAIL_STARTTLS=settings.MAIL_STARTTLS,
-    MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
-    USE_CREDENTIALS=settings.USE_CREDENTIALS,
-)
+Importing this module needs neither the MAIL_* variables nor fastapi_mail;
+get_settings() / get_email_config() build (and cache) them when called, and
+the old module attributes `settings` / `email_config` still work.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_settings():
+    from dotenv import load_dotenv
+    from pydantic_settings import BaseSettings
+
+    # ✅ Load .env file
+    load_dotenv()
+
+    class Settings(BaseSettings):
+        MAIL_USERNAME: str
+        MAIL_PASSWORD: str
+        MAIL_FROM: str
+        MAIL_PORT: int = 587
+        MAIL_SERVER: str = "smtp.gmail.com"
+        MAIL_STARTTLS: bool = True
+        MAIL_SSL_TLS: bool = False
+        USE_CREDENTIALS: bool = True
+
+        class Config:
+            env_file = ".env"
+
+    return Settings()
+
+
+@lru_cache(maxsize=None)
+def get_email_config():
+    from fastapi_mail import ConnectionConfig
+
+    settings = get_settings()
+    return ConnectionConfig(
+        MAIL_USERNAME=settings.MAIL_USERNAME,
+        MAIL_PASSWORD=settings.MAIL_PASSWORD,
+        MAIL_FROM=settings.MAIL_FROM,
+        MAIL_PORT=settings.MAIL_PORT,
+        MAIL_SERVER=settings.MAIL_SERVER,
+        MAIL_STARTTLS=settings.MAIL_STARTTLS,
+        MAIL_SSL_TLS=settings.MAIL_SSL_TLS,
+        USE_CREDENTIALS=settings.USE_CREDENTIALS,
+    )
+
+
+def __getattr__(name: str):
+    # `from app.email_config import settings, email_config` keeps working, built on first access
+    if name == "settings":
+        return get_settings()
+    if name == "email_config":
+        return get_email_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
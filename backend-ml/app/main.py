@@ -1,23 +1,91 @@
 # app/main.py
-import os, sys
+import asyncio, logging, os, sys, time
+from contextlib import asynccontextmanager
+from typing import Callable, Dict
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if BASE_DIR not in sys.path:
     sys.path.append(BASE_DIR)
 
-from app.routes.auth_routes import router as auth_router
-from app.routes.resume_routes import router as resume_router
-from app.routes.profile_routes import router as profile_router
-from app.routes.recommendation_routes import router as recommendation_router
-from app.routes.exam_routes import router as exam_router
+from app.utils.logging_setup import setup_logging
+setup_logging()
+
+from app.utils.passwords import password_hasher
+from app.utils import metrics
+from app.utils.http_metrics import MetricsMiddleware
+from app.utils.fast_json import FastJSONResponse
+from app.utils.lazy_routes import LazyRouters
+from app.utils.database import profile_cache_stats
+from app.services.parse_pool import resume_parse_pool
+
+log = logging.getLogger(__name__)
+
+# eager: import every router at startup | lazy: on the first request that needs it (see utils/lazy_routes.py)
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager")
+# lazy mode: load routers, catalogue, parsers and the scrypt cost in the background once serving
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "1") == "1"
+STARTUP_WARMUP_DELAY = float(os.getenv("STARTUP_WARMUP_DELAY", "0"))   # seconds after startup
+
+
+def _warm_steps():
+    from app.services.catalogue import catalogue
+    from app.services.resume_service import preload_parsers
+    return (password_hasher.calibrate, catalogue.current, preload_parsers)
+
+
+async def _warm_up() -> None:
+    await asyncio.sleep(STARTUP_WARMUP_DELAY)
+    t0 = time.perf_counter()
+    try:
+        await routers.load_all()
+        for step in await asyncio.to_thread(_warm_steps):
+            await asyncio.to_thread(step)
+    except Exception:
+        log.exception("warm-up failed; the rest loads on first use")
+        return
+    log.info("warm-up done", extra={"ms": round((time.perf_counter() - t0) * 1000, 1)})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up = None
+    if routers.lazy:
+        # serve right away; the first login calibrates if the warm-up hasn't yet
+        if STARTUP_WARMUP:
+            warm_up = asyncio.create_task(_warm_up())
+    else:
+        # pick the scrypt cost for this machine before the first login needs it
+        await asyncio.to_thread(password_hasher.calibrate)
+    yield
+    if warm_up is not None:
+        warm_up.cancel()
+    # let queued OTP mails go out before the worker exits (if the mailer was ever loaded)
+    email_sender = sys.modules.get("app.utils.email_sender")
+    if email_sender is not None:
+        await email_sender.email_queue.close()
+
+
+def _stats_of(module: str, name: str) -> Callable[[], Dict]:
+    # singletons of lazily imported modules report nothing until they're loaded
+    def read() -> Dict:
+        mod = sys.modules.get(module)
+        return getattr(mod, name).stats() if mod is not None else {}
+    return read
+
 
 app = FastAPI(
     title="Careerise Backend",
     version="2.0.0",
-    description="Careerise backend — Career, Exam & Internship recommendations"
+    description="Careerise backend — Career, Exam & Internship recommendations",
+    lifespan=lifespan,
+    # compact JSON, through orjson when FAST_JSON=1 (see utils/fast_json.py)
+    default_response_class=FastJSONResponse,
 )
+# before the other middleware, so its first-use imports sit inside them
+routers = LazyRouters(app, lazy=STARTUP_MODE == "lazy")
 
 app.add_middleware(
     CORSMiddleware,
@@ -26,17 +94,34 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# outermost, so the latency includes CORS and error handling
+app.add_middleware(MetricsMiddleware)
+
+# state that already lives elsewhere is read at scrape time
+metrics.stats_gauge("app_email_queue", "OTP email queue", _stats_of("app.utils.email_sender", "email_queue"))
+metrics.stats_gauge("app_resume_parse_pool", "Resume parse pool", resume_parse_pool.stats)
+metrics.stats_gauge("app_password_hasher", "Password hashing pool", password_hasher.stats)
+metrics.stats_gauge("app_profile_cache", "Profile read-through cache", profile_cache_stats)
+metrics.stats_gauge("app_results_cache", "Precomputed recommendation results",
+                    _stats_of("app.services.results_cache", "results_cache"))
+metrics.stats_gauge("app_routers", "Router import time in ms", routers.stats)
 
-# register routers
-app.include_router(auth_router, prefix="/auth", tags=["Auth"])
-app.include_router(resume_router, prefix="/resume", tags=["Resume"])
-app.include_router(profile_router, prefix="/profile", tags=["Profile"])
-app.include_router(recommendation_router, prefix="/recommend", tags=["Recommendations"])
+# register routers (imported here, or on first use with STARTUP_MODE=lazy)
+routers.add("app.routes.auth_routes", ("/auth", ["Auth"]))
+routers.add("app.routes.resume_routes", ("/resume", ["Resume"]))
+routers.add("app.routes.profile_routes", ("/profile", ["Profile"]))
+routers.add("app.routes.recommendation_routes", ("/recommend", ["Recommendations"]))
 
 # **Register exam_router under both preferred paths**
-app.include_router(exam_router, prefix="/exams", tags=["Exams"])                # -> /exams/{user_id}
-app.include_router(exam_router, prefix="/recommend/exams", tags=["Exams"])     # -> /recommend/exams/{user_id}
+routers.add("app.routes.exam_routes",
+            ("/exams", ["Exams"]),                 # -> /exams/{user_id}
+            ("/recommend/exams", ["Exams"]))       # -> /recommend/exams/{user_id}
 
 @app.get("/")
 def root():
     return {"message": "Careerise Backend Running ✅"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    """Prometheus scrape target (per-process numbers)."""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
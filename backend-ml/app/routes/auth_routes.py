@@ -1,29 +1,14 @@
 # app/routes/auth_routes.py
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, EmailStr
-import secrets, time, json, os
-from typing import Dict
+import secrets, time
 from app.utils.email_sender import send_otp_email
+from app.utils.database import get_user, user_exists, create_user, update_user
+from app.utils.otp_store import otp_store, MISSING, EXPIRED, MISMATCH
+from app.utils.passwords import password_hasher, set_password, HasherBusy
 
 router = APIRouter()
 
-# Path to users.json at repo root (adjust if different)
-DATA_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "users.json"))
-
-def _load_users() -> Dict[str, dict]:
-    if not os.path.exists(DATA_FILE):
-        return {}
-    try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except:
-        return {}
-
-def _save_users(data: Dict[str, dict]):
-    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
 class SignupIn(BaseModel):
     name: str
     email: EmailStr
@@ -45,78 +30,108 @@ class ResetPassword(BaseModel):
     otp: str
     new_password: str
 
+_BUSY = HTTPException(status_code=503, detail="Too many sign-ins right now, please retry shortly",
+                      headers={"Retry-After": "2"})
+
+# scrypt runs in the hasher's thread pool, never on the event loop
+async def _hash(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except HasherBusy:
+        raise _BUSY
+
 # ---------- SIGNUP (no OTP) ----------
 @router.post("/signup")
 async def signup(payload: SignupIn):
-    users = _load_users()
-    if payload.email in users:
+    # cheap index check first: a duplicate signup must not cost a scrypt hash
+    if user_exists(payload.email):
         raise HTTPException(status_code=400, detail="User already exists")
-
     user_id = secrets.token_hex(8)
-    users[payload.email] = {
+    created = create_user(payload.email, {
         "id": user_id,
         "name": payload.name,
         "email": payload.email,
-        "password": payload.password,
+        "password_hash": await _hash(payload.password),
         "created_at": int(time.time())
-    }
-    _save_users(users)
+    })
+    if not created:  # lost a race with a concurrent signup for the same email
+        raise HTTPException(status_code=400, detail="User already exists")
     return {"success": True, "userId": user_id, "name": payload.name}
 
 # ---------- LOGIN ----------
 @router.post("/login")
 async def login(payload: LoginIn):
-    users = _load_users()
-    user = users.get(payload.email)
-    if not user or user.get("password") != payload.password:
+    user = get_user(payload.email)
+    try:
+        ok, new_hash = await password_hasher.check_user(user, payload.password)
+    except HasherBusy:
+        raise _BUSY
+    if not ok:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # legacy plaintext (or a cheaper hash): upgrade it now that we know the password,
+        # unless the stored credential changed while we were hashing (a reset must not be undone)
+        verified = (user.get("password_hash"), user.get("password"))
+
+        def _upgrade(u):
+            if (u.get("password_hash"), u.get("password")) != verified:
+                return None
+            return set_password(u, new_hash)
+
+        update_user(payload.email, _upgrade)
     return {"success": True, "userId": user["id"], "name": user.get("name", "")}
 
 # ---------- SEND OTP (forgot) ----------
 @router.post("/send-otp")
 async def send_otp(payload: SendOTP):
-    users = _load_users()
-    user = users.get(payload.email)
     # Always respond success to avoid user enumeration
-    if not user:
+    if not user_exists(payload.email):
         return {"success": True, "message": "If account exists, OTP sent"}
 
     otp = str(secrets.randbelow(900000) + 100000)
-    user["otp"] = otp
-    user["otp_ts"] = int(time.time())
-    _save_users(users)
-
-    # send email (may raise HTTPException)
+    # queued, not sent: delivery + retries run in the background (503 if the queue is full).
+    # Queued first, so a full queue leaves no unsent code behind (and the previous one still works);
+    # nothing awaits in between, so the mail can't go out before the code is stored.
     await send_otp_email(payload.email, otp)
+    otp_store.issue(payload.email, otp)
     return {"success": True, "message": "OTP sent successfully"}
 
 # ---------- VERIFY OTP ----------
 @router.post("/verify-otp")
 async def verify_otp(payload: VerifyOTP):
-    users = _load_users()
-    user = users.get(payload.email)
-    if not user or "otp" not in user:
+    status = otp_store.check(payload.email, payload.otp)
+    if status == MISSING:
         raise HTTPException(status_code=400, detail="Invalid OTP")
-    if int(time.time()) - int(user.get("otp_ts", 0)) > 300:
+    if status == EXPIRED:
         raise HTTPException(status_code=400, detail="OTP expired")
-    if payload.otp != user.get("otp"):
+    if status == MISMATCH:
         raise HTTPException(status_code=400, detail="Incorrect OTP")
     return {"success": True, "message": "OTP verified"}
 
 # ---------- RESET PASSWORD ----------
 @router.post("/reset-password")
 async def reset_password(payload: ResetPassword):
-    users = _load_users()
-    user = users.get(payload.email)
-    if not user:
+    if not user_exists(payload.email):
+        raise HTTPException(status_code=404, detail="User not found")
+    def _check_otp(status: str) -> None:
+        if status in (MISSING, MISMATCH):
+            raise HTTPException(status_code=400, detail="Invalid OTP")
+        if status == EXPIRED:
+            raise HTTPException(status_code=400, detail="OTP expired")
+
+    # only a valid OTP gets a hash computed, and a busy hasher doesn't burn the OTP
+    _check_otp(otp_store.check(payload.email, payload.otp))
+    new_hash = await _hash(payload.new_password)
+    # consume() is atomic, so a racing reset can't reuse the same OTP
+    _check_otp(otp_store.consume(payload.email, payload.otp))
+
+    def _reset(user: dict) -> dict:
+        # update password (and drop OTP fields left by older versions)
+        set_password(user, new_hash)
+        user.pop("otp", None)
+        user.pop("otp_ts", None)
+        return user
+
+    if update_user(payload.email, _reset) is None:
         raise HTTPException(status_code=404, detail="User not found")
-    if "otp" not in user or payload.otp != user.get("otp"):
-        raise HTTPException(status_code=400, detail="Invalid OTP")
-    if int(time.time()) - int(user.get("otp_ts", 0)) > 300:
-        raise HTTPException(status_code=400, detail="OTP expired")
-    # update password
-    user["password"] = payload.new_password
-    user.pop("otp", None)
-    user.pop("otp_ts", None)
-    _save_users(users)
     return {"success": True, "message": "Password reset successful"}
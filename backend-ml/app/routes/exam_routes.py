@@ -1,21 +1,29 @@
 # app/routes/exam_routes.py
-from fastapi import APIRouter, HTTPException
+import logging
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Header
 from app.utils.database import get_profile
 from app.services.exam_service import recommend_exams
+from app.services.catalogue import catalogue
+from app.services.similarity import results_version
+from app.services.results_cache import results_cache, cached_response
+
+log = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.get("/{user_id}")
-def exams_route(user_id: str):
-    # helpful logs for debugging
-    print("🔍 Exam route hit for user:", user_id)
+# results are precomputed on profile save and re-keyed when the exam catalogue (or MATCH_ENGINE) changes
+results_cache.register("exams", recommend_exams, lambda: results_version(catalogue.current(), "exams"))
 
+@router.get("/{user_id}")
+def exams_route(user_id: str, if_none_match: Optional[str] = Header(None)):
     profile = get_profile(user_id)
-    print("📌 Loaded profile:", bool(profile))
+    # helpful logs for debugging (LOG_LEVEL=DEBUG)
+    log.debug("Exam route hit", extra={"user_id": user_id, "profile_found": bool(profile)})
 
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    result = recommend_exams(profile)
-    print("📌 Exam result keys:", list(result.keys()))
-    return result
+    response = cached_response("exams", profile, if_none_match)
+    log.debug("Exam result", extra={"user_id": user_id, "status": response.status_code})
+    return response
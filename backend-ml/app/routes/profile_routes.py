@@ -1,8 +1,15 @@
 # app/routes/profile_routes.py
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-from app.utils.database import get_profile, upsert_profile  # ✅ updated imports
+from fastapi import APIRouter, HTTPException, Header, Body
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import List, Dict, Any, Optional, Set
+from app.utils.database import (get_profile_versioned, upsert_profile, update_profile, iter_profiles,  # ✅ updated imports
+                                profile_cache_stats)
+from app.utils.record_store import VersionConflict
+from app.services.profile_features import with_features, public_view
+from app.services.profile_patch import Patch, PatchError, PatchTestFailed, apply_patch
+from app.services.results_cache import results_cache
+from app.services.catalogue import catalogue
+from app.utils.fast_json import json_response
 
 router = APIRouter(tags=["Profile"])
 
@@ -42,40 +49,139 @@ class ProfilePayload(BaseModel):
     resumeInfo: Optional[ResumeInfo] = ResumeInfo()
 
 
+# one validator per top-level field, so a PATCH only validates what it changed
+_FIELD_ADAPTERS = {name: TypeAdapter(field.annotation) for name, field in ProfilePayload.model_fields.items()}
+
+
+# ---------- versions (ETag / If-Match) ----------
+def _etag(version: int) -> str:
+    return f'"{version}"'
+
+def _expected_version(if_match: Optional[str]) -> Optional[int]:
+    """Version the client last saw (from If-Match); None = unconditional write."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    if not tag.isdigit():
+        raise HTTPException(status_code=400, detail="If-Match must be an ETag from this API")
+    return int(tag)
+
+def _conflict(e: VersionConflict) -> HTTPException:
+    # stale write: the client refetches (GET) and reapplies its change
+    headers = {"ETag": _etag(e.current)} if e.current is not None else None
+    return HTTPException(status_code=409, headers=headers,
+                         detail={"message": "Profile was changed by another save", "version": e.current})
+
+
 # ✅ Fetch User Profile (used by Flutter to pre-fill profile fields)
 @router.get("/{user_id}")
 def get_profile_route(user_id: str):
     try:
-        doc = get_profile(user_id)
+        doc, version = get_profile_versioned(user_id)
         if not doc:
             return {"message": "Profile not found", "profile": {}}
-        return doc
+        # store docs are plain JSON already: encode once, no jsonable_encoder walk
+        return json_response(public_view(doc), headers={"ETag": _etag(version)})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch profile: {e}")
 
 
 # ✅ Save or Update Profile (called from Flutter Save button)
 @router.post("/save")
-def save_profile(payload: ProfilePayload):
+def save_profile(payload: ProfilePayload, if_match: Optional[str] = Header(None)):
+    expected = _expected_version(if_match)
     try:
         # Convert payload to dictionary for saving
         profile_data = payload.model_dump()
+        # normalized skills/terms reused by every recommender
+        with_features(profile_data)
 
-        # Save/Update profile in profiles.json
-        upsert_profile(payload.userId, profile_data)
+        # Save/Update profile in the profile store (only over the version the client saw, with If-Match)
+        version = upsert_profile(payload.userId, profile_data, expected)
+        # recompute exam / career results in the background for the next dashboard load
+        results_cache.schedule(profile_data)
 
-        return {"status": "ok", "message": "Profile saved successfully"}
+        return json_response({"status": "ok", "message": "Profile saved successfully", "version": version},
+                             headers={"ETag": _etag(version)})
+    except VersionConflict as e:
+        raise _conflict(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save profile: {e}")
 
 
+def _validate_changes(doc: Dict[str, Any], changed: Set[str]) -> Dict[str, Any]:
+    """Validate (and normalize, like model_dump) only the top-level fields a patch changed."""
+    for name in changed:
+        if name == "userId" or name not in _FIELD_ADAPTERS:
+            raise PatchError(f"Field can't be patched: {name}")
+        adapter = _FIELD_ADAPTERS[name]
+        # a removed field goes back to its default, as if it had been left out of /save
+        value = doc[name] if name in doc else ProfilePayload.model_fields[name].get_default(call_default_factory=True)
+        try:
+            doc[name] = adapter.dump_python(adapter.validate_python(value))
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=[
+                {"loc": ["body", name, *err["loc"]], "msg": err["msg"], "type": err["type"]} for err in e.errors()])
+    return doc
+
+
+# ✅ Partial update: merge patch ({...}) or JSON Patch ([ops]); If-Match makes it conditional
+@router.patch("/{user_id}")
+def patch_profile(user_id: str, patch: Patch = Body(...), if_match: Optional[str] = Header(None)):
+    expected = _expected_version(if_match)
+
+    def apply(stored: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # runs under the store's write lock: nobody can save in between read and write
+        patched, changed = apply_patch(public_view(stored), patch)
+        if not changed:
+            return None
+        return with_features(_validate_changes(patched, changed))
+
+    try:
+        doc, version = update_profile(user_id, apply, expected)
+    except VersionConflict as e:
+        raise _conflict(e)
+    except PatchTestFailed as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except PatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    if version is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if doc is None:
+        # nothing changed: no write, same version
+        doc, version = get_profile_versioned(user_id)
+    else:
+        results_cache.schedule(doc)
+    return json_response(public_view(doc), headers={"ETag": _etag(version)})
+
+
 # ✅ Optional Debug Route (to verify backend data)
 @router.get("/debug/all")
 def debug_all_profiles():
     """Quick debug route to view all profiles (for testing only)"""
-    import os, json
-    DATA_PATH = os.path.join("app", "data", "profiles.json")
-    if not os.path.exists(DATA_PATH):
-        return {"message": "No profiles.json found"}
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    profiles = dict(iter_profiles())
+    if not profiles:
+        return {"message": "No profiles found"}
+    return profiles
+
+
+@router.get("/debug/cache")
+def debug_profile_cache():
+    """Hit / miss / eviction counters of the in-process profile cache"""
+    return profile_cache_stats()
+
+
+@router.get("/debug/results")
+def debug_results_cache():
+    """Precomputed recommendation results: cache counters and catalogue versions"""
+    return results_cache.stats()
+
+
+@router.get("/debug/catalogue")
+def debug_catalogue():
+    """Loaded catalogue: section sizes / versions, hot reloads, derived indexes"""
+    return catalogue.stats()
@@ -1,29 +1,66 @@
 # app/routes/resume_routes.py
 import os
-from uuid import uuid4
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import JSONResponse
-from app.services.resume_service import extract_resume_data
+from app.services.resume_service import extract_resume_data_timed
+from app.services.parse_pool import resume_parse_pool, ParserBusy, ParseTimeout
+from app.services.resume_cache import ResumeCache, new_hasher
+from app.utils.upload_stream import stream_upload, UploadRejected
+from app.utils.metrics import observe_stage, stage
 
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "uploads")
 UPLOAD_DIR = os.path.abspath(UPLOAD_DIR)
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# uploads are stored and parsed once per distinct file content
+resume_cache = ResumeCache(UPLOAD_DIR)
+
+# largest single resume accepted
+RESUME_MAX_FILE_BYTES = int(os.getenv("RESUME_MAX_FILE_BYTES", str(10 << 20)))
+
 router = APIRouter(tags=["Resume"])
 
-@router.post("/upload/{user_id}")
-async def upload_resume(user_id: str, file: UploadFile = File(...)):
+# the body is parsed by hand (see upload_stream), so describe it for the docs
+_UPLOAD_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {"file": {"type": "string", "format": "binary"}},
+        }}},
+    }
+}
+
+@router.post("/upload/{user_id}", openapi_extra=_UPLOAD_SCHEMA)
+async def upload_resume(user_id: str, request: Request):
     try:
-        ext = (file.filename or "").lower().split(".")[-1]
-        if ext not in ["pdf", "docx"]:
-            raise HTTPException(status_code=400, detail="Only PDF or DOCX allowed")
+        # streamed to disk in chunks; hashed, size-capped and type-sniffed on the way
+        try:
+            upload = await stream_upload(request, UPLOAD_DIR, RESUME_MAX_FILE_BYTES, new_hasher())
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        digest, ext = upload.digest, upload.ext
 
-        fname = f"{uuid4().hex}.{ext}"
-        fpath = os.path.join(UPLOAD_DIR, fname)
-        with open(fpath, "wb") as out:
-            out.write(await file.read())
+        # same bytes uploaded before: reuse the earlier parse
+        parsed = resume_cache.get(digest)
+        if parsed is not None:
+            os.remove(upload.path)
+        else:
+            fpath = resume_cache.store_blob(digest, ext, upload.path)
 
-        parsed = extract_resume_data(fpath)
+            # parse in a worker process so the event loop keeps serving other requests
+            try:
+                parsed, timings = await resume_parse_pool.run(extract_resume_data_timed, fpath)
+            except ParserBusy:
+                raise HTTPException(status_code=429, detail="Resume parser is busy, please retry shortly",
+                                    headers={"Retry-After": "5"})
+            except ParseTimeout:
+                raise HTTPException(status_code=504, detail="Resume parsing timed out")
+            for name, seconds in timings.items():
+                observe_stage(name, seconds)
+            with stage("storage_write"):
+                resume_cache.put(digest, parsed)
 
         # minimal sanity
         if not parsed.get("skills"):
@@ -32,5 +69,7 @@ async def upload_resume(user_id: str, file: UploadFile = File(...)):
         return JSONResponse(
             content={"status": "ok", "user_id": user_id, "resume_info": parsed}
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Resume parse failed: {e}")
@@ -0,0 +1,140 @@
+# app/services/batch_scoring.py
+"""
+Bulk recommendation scoring.
+
+Profiles are scored in batches: every batch becomes one sparse profile x term
+matrix that is multiplied against the exam and career catalogue matrices, so
+the per-profile cost is a row of a sparse product instead of an HTTP round
+trip. Output is JSON lines, one {"userId", "exams", "careers"} object per
+profile, in input order.
+
+The POST /recommend/batch route scores in-process; the CLI spreads batches
+over worker processes for full-store runs:
+
+    cd backend-ml && python -m app.services.batch_scoring --out scores.jsonl [--workers 8] [--batch-size 2000]
+"""
+import argparse, os, sys, time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.utils import fast_json
+from app.utils.database import iter_profiles, read_profile
+from app.services.profile_features import FEATURES_KEY, get_features
+from app.services.exam_service import recommend_exams_batch
+from app.services.career_service import recommend_careers_batch
+
+BATCH_SIZE = int(os.getenv("BATCH_SCORING_SIZE", "1000"))
+BATCH_WORKERS = int(os.getenv("BATCH_SCORING_WORKERS", str(os.cpu_count() or 1)))
+
+Item = Tuple[str, Dict]
+
+
+def batched(items: Iterable, size: int) -> Iterator[List]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, max(1, size)))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _featured(profile: Dict) -> Dict:
+    # profiles saved before features existed get them built once, not once per recommender
+    feats = get_features(profile)
+    return profile if feats is profile.get(FEATURES_KEY) else {**profile, FEATURES_KEY: feats}
+
+
+def score_profiles(items: List[Item]) -> List[Dict]:
+    """Exams + careers for a batch of (user_id, profile) pairs."""
+    profiles = [_featured(p) for _, p in items]
+    exams = recommend_exams_batch(profiles)
+    careers = recommend_careers_batch(profiles)
+    return [{"userId": uid, "exams": e, "careers": c}
+            for (uid, _), e, c in zip(items, exams, careers)]
+
+
+def score_lines(items: List[Item]) -> bytes:
+    """One batch as encoded JSON lines (workers encode too, the parent only writes)."""
+    return b"".join(fast_json.dumps(row) + b"\n" for row in score_profiles(items))
+
+
+def select_profiles(user_ids: Optional[List[str]] = None) -> Iterator[Item]:
+    """Every stored profile, or just the given ids (unknown ids are skipped).
+
+    Reads bypass the profile cache: a bulk run would evict the interactive users' entries.
+    """
+    if user_ids is None:
+        yield from iter_profiles()
+        return
+    for uid in user_ids:
+        profile = read_profile(uid)
+        if profile:
+            yield uid, profile
+
+
+def iter_scored(items: Iterable[Item], batch_size: int = BATCH_SIZE, workers: int = 1) -> Iterator[bytes]:
+    """Yield JSONL chunks, one per batch, in input order.
+
+    With workers > 1 batches go to a process pool; at most 2 * workers batches
+    are in flight, so memory stays flat however many profiles there are.
+    """
+    if workers <= 1:
+        for chunk in batched(items, batch_size):
+            yield score_lines(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in batched(items, batch_size):
+            pending.append(pool.submit(score_lines, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_jsonl(out_path: str, user_ids: Optional[List[str]] = None, batch_size: int = BATCH_SIZE,
+                workers: int = BATCH_WORKERS) -> int:
+    """Score the store into out_path (written to a temp file, then renamed). Returns profiles written."""
+    tmp = out_path + ".tmp"
+    count = 0
+    try:
+        with open(tmp, "wb") as f:
+            for lines in iter_scored(select_profiles(user_ids), batch_size, workers):
+                f.write(lines)
+                count += lines.count(b"\n")
+        os.replace(tmp, out_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Score every stored profile into a JSONL file")
+    ap.add_argument("--out", required=True, help="output .jsonl path ('-' for stdout)")
+    ap.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    ap.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    ap.add_argument("--user-ids", help="file with one user id per line (default: all profiles)")
+    args = ap.parse_args(argv)
+
+    user_ids = None
+    if args.user_ids:
+        with open(args.user_ids, encoding="utf-8") as f:
+            user_ids = [line.strip() for line in f if line.strip()]
+
+    t0 = time.perf_counter()
+    if args.out == "-":
+        count = 0
+        for lines in iter_scored(select_profiles(user_ids), args.batch_size, args.workers):
+            sys.stdout.buffer.write(lines)
+            count += lines.count(b"\n")
+    else:
+        count = write_jsonl(args.out, user_ids, args.batch_size, args.workers)
+    print(f"✅ Scored {count} profiles in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# app/services/career_service.py
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import heapq
+import numpy as np
+from scipy import sparse
+from app.utils import fast_json
+from app.services.profile_features import get_features, normalize_skill, indicator_matrix
+from app.services.catalogue import catalogue, Snapshot
+from app.services import similarity
+from app.services.similarity import MATCH_ENGINE, percent
+
+
+CAREER_TOP_K = 10
+
+
+# careers (role, skills, roadmap, links) live in app/data/catalogue.json;
+# see services/catalogue.py
+
+def _build_career_index(careers) -> Dict[str, List[int]]:
+    """normalized skill -> positions (in catalogue order) of the careers that need it"""
+    index: Dict[str, List[int]] = defaultdict(list)
+    for pos, data in enumerate(careers):
+        for skill in {normalize_skill(x) for x in data["skills"]}:
+            index[skill].append(pos)
+    return dict(index)
+
+def _compile_career_matrix(index: Dict[str, List[int]], n_careers: int):
+    """Skill vocabulary + sparse career x skill matrix (the index, as a matrix)."""
+    vocab = {skill: j for j, skill in enumerate(index)}
+    rows = [pos for positions in index.values() for pos in positions]
+    cols = [vocab[skill] for skill, positions in index.items() for _ in positions]
+    data = np.ones(len(rows), dtype=np.int32)
+    return vocab, sparse.csr_matrix((data, (rows, cols)), shape=(n_careers, len(vocab)), dtype=np.int32)
+
+def _build_career_tables(snap: Snapshot) -> Tuple[Dict[str, List[int]], Dict[str, int], sparse.csr_matrix]:
+    index = _build_career_index(snap.careers)
+    vocab, matrix = _compile_career_matrix(index, len(snap.careers))
+    return index, vocab, matrix
+
+# built once per catalogue version: skill -> careers postings + the same as a matrix
+catalogue.derive("career_tables", _build_career_tables)
+
+
+def _career_row(snap: Snapshot, pos: int, score: int) -> dict:
+    data = snap.careers[pos]
+    return {
+        "role": data["role"],
+        "matchingScore": score,
+        "skillsRequired": data["skills"],
+        "study_level": data["study_level"],
+        "course_link": data["course_link"],
+        "playlist_link": data["playlist_link"],
+        "roadmap": data["roadmap"]
+    }
+
+
+def _encode_career_rows(snap: Snapshot) -> List[Tuple[bytes, bytes]]:
+    """Per career, its _career_row JSON split around matchingScore: (head, tail)."""
+    out = []
+    for pos in range(len(snap.careers)):
+        # a placeholder score marks where the per-profile number goes
+        raw = fast_json.dumps(_career_row(snap, pos, -1))
+        head, tail = raw.split(b'"matchingScore":-1', 1)
+        out.append((head + b'"matchingScore":', tail))
+    return out
+
+# static career fields (skills, roadmap, links) encoded once per catalogue version
+catalogue.derive("career_rows_json", _encode_career_rows, eager=False)
+
+
+def _match_careers(snap: Snapshot, user_skills: List[str], k: int = CAREER_TOP_K) -> List[Tuple[int, int]]:
+    """(catalogue position, score) of the best careers, best first."""
+    # walk only the user's own skills; cost doesn't depend on catalogue size
+    career_index = snap.get("career_tables")[0]
+    overlap: Dict[int, int] = defaultdict(int)
+    for skill in user_skills:
+        for pos in career_index.get(skill, ()):
+            overlap[pos] += 1
+
+    # best overlap first, ties in catalogue order
+    best = heapq.nsmallest(k, overlap.items(), key=lambda kv: (-kv[1], kv[0]))
+    return [(pos, count * 20) for pos, count in best]
+
+
+def _similar_careers(snap: Snapshot, features: Dict, k: int = CAREER_TOP_K) -> List[Tuple[int, int]]:
+    # TF-IDF cosine over skills + roadmap text (MATCH_ENGINE=tfidf)
+    scores = similarity.scores(snap.get("similarity"), "careers", features)
+    best = heapq.nsmallest(k, ((pos, s) for pos, s in scores.items() if s > 0), key=lambda kv: (-kv[1], kv[0]))
+    return [(pos, percent(s)) for pos, s in best]
+
+
+def _no_skills() -> Dict:
+    return {
+        "message": "Add more skills or upload resume",
+        "careers": []
+    }
+
+
+def _ranked(profile: Dict) -> Tuple[Snapshot, Optional[List[Tuple[int, int]]]]:
+    # 📌 User skills (manual + resume), normalized once at save time
+    features = get_features(profile)
+    snap = catalogue.current()
+    if not features["skills"]:
+        return snap, None
+    if MATCH_ENGINE == "tfidf":
+        return snap, _similar_careers(snap, features)
+    return snap, _match_careers(snap, features["skills"])
+
+
+def recommend_careers(profile: Dict):
+    snap, ranked = _ranked(profile)
+    if ranked is None:
+        return _no_skills()
+    return [_career_row(snap, pos, score) for pos, score in ranked]
+
+
+def recommend_careers_json(profile: Dict) -> bytes:
+    """recommend_careers, encoded: the static part of each row is spliced in pre-encoded."""
+    snap, ranked = _ranked(profile)
+    if ranked is None:
+        return fast_json.dumps(_no_skills())
+    return _encode_ranked(snap, ranked)
+
+
+def _encode_ranked(snap: Snapshot, ranked: List[Tuple[int, int]]) -> bytes:
+    encoded = snap.get("career_rows_json")
+    return b"[" + b",".join(b"%s%d%s" % (encoded[pos][0], score, encoded[pos][1]) for pos, score in ranked) + b"]"
+
+
+def recommend_careers_batch(profiles: List[Dict], k: int = CAREER_TOP_K) -> List:
+    """recommend_careers for many profiles: one sparse product gives every overlap."""
+    features = [get_features(p) for p in profiles]
+    skill_lists = [f["skills"] for f in features]
+    snap = catalogue.current()
+    if MATCH_ENGINE == "tfidf":
+        overlap, to_score = similarity.score_matrix(snap.get("similarity"), "careers", features), percent
+    else:
+        _, vocab, matrix = snap.get("career_tables")
+        overlap = (indicator_matrix(skill_lists, vocab) @ matrix.T).tocsr()
+        to_score = lambda count: count * 20
+
+    out = []
+    for r, skills in enumerate(skill_lists):
+        if not skills:
+            out.append(_no_skills())
+            continue
+        lo, hi = overlap.indptr[r], overlap.indptr[r + 1]
+        counts = zip(overlap.indices[lo:hi].tolist(), overlap.data[lo:hi].tolist())
+        # best overlap first, ties in catalogue order
+        best = heapq.nsmallest(k, ((pos, c) for pos, c in counts if c > 0), key=lambda kv: (-kv[1], kv[0]))
+        out.append([_career_row(snap, pos, to_score(count)) for pos, count in best])
+    return out
@@ -0,0 +1,193 @@
+# app/services/catalogue.py
+"""
+Careers, exams, career clusters and the skill bank, loaded from a data file.
+
+The editable source is app/data/catalogue.json. It is compiled into
+app/data/catalogue.bin (see app/utils/catalogue_file.py), which every process
+memory-maps, so a large catalogue is held once in the page cache, not once per
+worker. Both files are checked at most every CATALOGUE_CHECK_INTERVAL seconds:
+an edited JSON is recompiled, and a replaced .bin is swapped in atomically
+without a restart.
+
+Each load produces an immutable Snapshot. Derived indexes (skill trie,
+career / exam matrices, ...) are registered by the services that own them and
+built once per snapshot, before it is published, so a request that grabs
+`catalogue.current()` once sees records and indexes from the same version:
+
+    catalogue.derive("career_tables", build_fn)   # build_fn(snapshot) -> index
+    snap = catalogue.current(); tables = snap.get("career_tables")
+
+    cd backend-ml && python -m app.services.catalogue      # compile catalogue.json -> catalogue.bin
+"""
+import hashlib, json, logging, os, sys, threading, time
+from typing import Any, Callable, Dict, List, Optional
+from app.utils.catalogue_file import CatalogueFile, Records, file_sig, write_catalogue
+
+log = logging.getLogger(__name__)
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+CATALOGUE_SOURCE = os.getenv("CATALOGUE_SOURCE", os.path.join(_DATA_DIR, "catalogue.json"))
+CATALOGUE_PATH = os.getenv("CATALOGUE_PATH", os.path.join(_DATA_DIR, "catalogue.bin"))
+CATALOGUE_CHECK_INTERVAL = float(os.getenv("CATALOGUE_CHECK_INTERVAL", "2"))  # seconds
+
+
+def _source_digest(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+def compile_catalogue(source: str = CATALOGUE_SOURCE, out: str = CATALOGUE_PATH) -> None:
+    """catalogue.json -> catalogue.bin; keyed sections become records carrying their key."""
+    with open(source, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+    write_catalogue(out, {
+        "careers": [{"role": role, **info} for role, info in data["careers"].items()],
+        "exams": data["exams"],
+        "career_clusters": [{"career": name, **cfg} for name, cfg in data["career_clusters"].items()],
+        "exam_skills": data["exam_skills"],
+        "skill_bank": data["skill_bank"],
+    }, meta={"source": _source_digest(raw)})
+
+
+class Snapshot:
+    """One loaded version of the catalogue, plus the indexes derived from it."""
+
+    def __init__(self, file: CatalogueFile, builders: Dict[str, Callable[["Snapshot"], Any]]):
+        self.file = file
+        self.careers: Records = file.records("careers")
+        self.exams: Records = file.records("exams")
+        self.career_clusters: Records = file.records("career_clusters")
+        self.exam_skills: Records = file.records("exam_skills")
+        self.skill_bank: Records = file.records("skill_bank")
+        self._builders = builders
+        self._derived: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def version(self, section: str) -> str:
+        return self.file.digest(section)
+
+    def get(self, name: str) -> Any:
+        value = self._derived.get(name)
+        if value is None:
+            with self._lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = self._derived[name] = self._builders[name](self)
+        return value
+
+
+class Catalogue:
+    def __init__(self, path: str = CATALOGUE_PATH, source: Optional[str] = CATALOGUE_SOURCE,
+                 check_interval: float = CATALOGUE_CHECK_INTERVAL):
+        self.path = path
+        self.source = source
+        self.check_interval = check_interval
+        self._builders: Dict[str, Callable[[Snapshot], Any]] = {}
+        self._eager: List[str] = []
+        self._listeners: List[Callable[[Snapshot], None]] = []
+        self._snapshot: Optional[Snapshot] = None
+        self._source_sig = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    # ---------- registration ----------
+    def derive(self, name: str, builder: Callable[[Snapshot], Any], eager: bool = True) -> None:
+        """Register an index built from each snapshot (eagerly at load, or on first get())."""
+        self._builders[name] = builder
+        if eager:
+            self._eager.append(name)
+            if self._snapshot is not None:
+                self._snapshot.get(name)
+
+    def on_reload(self, fn: Callable[[Snapshot], None]) -> None:
+        """Called with the new snapshot after every hot reload."""
+        self._listeners.append(fn)
+
+    # ---------- loading ----------
+    def _compile_if_edited(self) -> None:
+        """Recompile the .bin when catalogue.json changed since it was built."""
+        if not self.source:
+            return
+        sig = file_sig(self.source)
+        if sig is None or sig == self._source_sig:
+            return
+        self._source_sig = sig
+        with open(self.source, "rb") as f:
+            digest = _source_digest(f.read())
+        try:
+            built_from = CatalogueFile(self.path).meta.get("source")
+        except (FileNotFoundError, ValueError):
+            built_from = None
+        # another worker may have recompiled it already
+        if built_from != digest:
+            compile_catalogue(self.source, self.path)
+
+    def _load(self) -> Snapshot:
+        snap = Snapshot(CatalogueFile(self.path), self._builders)
+        for name in self._eager:
+            snap.get(name)
+        return snap
+
+    def current(self) -> Snapshot:
+        """The live snapshot; checks for a new file at most every check_interval seconds."""
+        snap = self._snapshot
+        if snap is not None and time.monotonic() < self._next_check:
+            return snap
+        if snap is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._compile_if_edited()
+                    self._snapshot = self._load()
+                    self._next_check = time.monotonic() + self.check_interval
+                return self._snapshot
+        # only one thread checks; the others keep serving the current snapshot
+        if self._lock.acquire(blocking=False):
+            try:
+                self._next_check = time.monotonic() + self.check_interval
+                self.reload()
+            except Exception:
+                log.exception("Catalogue reload failed; keeping the current snapshot")
+            finally:
+                self._lock.release()
+        return self._snapshot
+
+    def reload(self, force: bool = False) -> bool:
+        """Pick up an edited source or a replaced .bin. Returns True if a new snapshot went live."""
+        self._compile_if_edited()
+        old = self._snapshot
+        if not force and old is not None and file_sig(self.path) == old.file.sig:
+            return False
+        # built completely (indexes included) before it becomes visible
+        new = self._load()
+        self._snapshot = new
+        self.reloads += 1
+        log.info("Catalogue reloaded", extra={"careers": len(new.careers), "exams": len(new.exams)})
+        for fn in self._listeners:
+            fn(new)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        snap = self.current()
+        return {
+            "path": self.path,
+            "reloads": self.reloads,
+            "sections": {name: {"count": len(snap.file.records(name)), "version": snap.version(name)}
+                         for name in snap.file.sections()},
+            "derived": sorted(snap._derived),
+        }
+
+
+catalogue = Catalogue()
+
+
+def main() -> None:
+    t0 = time.perf_counter()
+    compile_catalogue()
+    size = os.path.getsize(CATALOGUE_PATH)
+    print(f"✅ {CATALOGUE_SOURCE} -> {CATALOGUE_PATH} ({size} bytes, {time.perf_counter() - t0:.2f}s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
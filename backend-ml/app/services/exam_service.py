@@ -1,47 +1,113 @@
 # app/services/exam_service.py
 
-from typing import Dict, List
-import re
-
-EXAM_DATABASE = [
-    {
-        "title": "GATE (CS)",
-        "type": "Government",
-        "eligibility": "btech engineering programming data structures algorithms",
-        "apply_link": "https://gate.iitkgp.ac.in",
-    },
-    {
-        "title": "SSC CGL",
-        "type": "Government",
-        "eligibility": "graduate reasoning maths english general awareness",
-        "apply_link": "https://ssc.nic.in",
-    },
-    {
-        "title": "ISRO Scientist",
-        "type": "Government",
-        "eligibility": "engineering programming electronics computer science",
-        "apply_link": "https://www.isro.gov.in",
-    },
-    {
-        "title": "TCS NQT",
-        "type": "Private",
-        "eligibility": "graduate aptitude programming communication",
-        "apply_link": "https://www.tcs.com",
-    },
-    {
-        "title": "Infosys InfyTQ",
-        "type": "Private",
-        "eligibility": "java python software development",
-        "apply_link": "https://infytq.onwingspan.com",
-    },
-    {
-        "title": "Google Data Internship",
-        "type": "Internship",
-        "eligibility": "python sql data science machine learning",
-        "apply_link": "https://careers.google.com",
-    },
-]
+from typing import Dict, List, Tuple
+import heapq
+from itertools import islice
+import numpy as np
+from scipy import sparse
+from app.services.profile_features import get_features, indicator_matrix, terms as _terms
+from app.services.catalogue import catalogue, Snapshot
+from app.services import similarity
+from app.services.similarity import MATCH_ENGINE, percent
+
+# exams (title, type, eligibility, apply link) live in app/data/catalogue.json;
+# see services/catalogue.py
+
+TOP_K = 6
+
+def _compile_exam_matrix(exams) -> Tuple[Dict[str, int], sparse.csr_matrix]:
+    """Term vocabulary + sparse exam x term matrix of eligibility word counts."""
+    vocab: Dict[str, int] = {}
+    rows, cols = [], []
+    for i, exam in enumerate(exams):
+        for term in _terms(exam["eligibility"]):
+            rows.append(i)
+            cols.append(vocab.setdefault(term, len(vocab)))
+    data = np.ones(len(rows), dtype=np.int32)  # repeated (row, col) pairs are summed
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(exams), len(vocab)), dtype=np.int32)
+    return vocab, matrix
+
+def _build_exam_postings(snap: Snapshot) -> Dict[str, List[Tuple[int, int]]]:
+    """term -> (exam position, count of the term in its eligibility), from the matrix"""
+    vocab, matrix = snap.get("exam_matrix")
+    by_term = matrix.T.tocsr()
+    return {term: list(zip(by_term.indices[by_term.indptr[j]:by_term.indptr[j + 1]].tolist(),
+                           by_term.data[by_term.indptr[j]:by_term.indptr[j + 1]].tolist()))
+            for term, j in vocab.items()}
+
+# compiled once per catalogue version: the matrix for batches, postings for single profiles
+catalogue.derive("exam_matrix", lambda snap: _compile_exam_matrix(snap.exams))
+catalogue.derive("exam_postings", _build_exam_postings)
+
+# cap on the dense (profiles x exams) score block materialized at once
+_DENSE_CELLS = 4_000_000
+
+def _top_k_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """Per row, indices of the k best scores, best first; ties keep catalogue order."""
+    n = scores.shape[1]
+    k = min(k, n)
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    if scores.dtype.kind == "f":
+        # similarity scores: stable sort keeps catalogue order on ties
+        return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    # unique sort key: score first, then earlier catalogue position
+    key = scores.astype(np.int64) * n + (n - 1 - np.arange(n))
+    idx = np.argpartition(-key, k - 1, axis=1)[:, :k] if k < n else np.tile(np.arange(n), (len(key), 1))
+    order = np.argsort(-np.take_along_axis(key, idx, axis=1), axis=1)
+    return np.take_along_axis(idx, order, axis=1)
+
+def _incomplete() -> Dict:
+    # if no data, ask user to complete profile
+    return {
+        "profile_incomplete": True,
+        "message": "Add your skills or upload resume for exam recommendations.",
+        "recommended_exams": [],
+    }
 
+def _exam_row(snap: Snapshot, i: int, score: int) -> Dict:
+    exam = snap.exams[i]
+    return {
+        "title": exam["title"],
+        "type": exam["type"],
+        "apply_link": exam["apply_link"],
+        "eligibility_score": score,
+    }
+
+def _top_k(scores: Dict[int, float], n: int, k: int) -> List[Tuple[int, float]]:
+    """k best (position, score) of the nonzero scores, best first, ties in catalogue
+    order; padded with zero-score exams in catalogue order, like _top_k_rows."""
+    best = heapq.nsmallest(k, ((i, s) for i, s in scores.items() if s > 0), key=lambda kv: (-kv[1], kv[0]))
+    if len(best) < k:
+        taken = {i for i, _ in best}
+        best += [(i, 0) for i in islice((i for i in range(n) if i not in taken), k - len(best))]
+    return best
+
+def _similar_exams(features: Dict, k: int = TOP_K) -> Dict:
+    # TF-IDF cosine for one profile (MATCH_ENGINE=tfidf): walks only its own terms
+    if not features["terms"]:
+        return _incomplete()
+    snap = catalogue.current()
+    scores = similarity.scores(snap.get("similarity"), "exams", features)
+    return {
+        "profile_incomplete": False,
+        "recommended_exams": [_exam_row(snap, i, percent(s)) for i, s in _top_k(scores, len(snap.exams), k)]
+    }
+
+def _match_exams(features: Dict, k: int = TOP_K) -> Dict:
+    # keyword overlap for one profile: walks only its own terms' postings
+    if not features["terms"]:
+        return _incomplete()
+    snap = catalogue.current()
+    postings = snap.get("exam_postings")
+    overlap: Dict[int, int] = {}
+    for term in features["terms"]:
+        for i, count in postings.get(term, ()):
+            overlap[i] = overlap.get(i, 0) + count
+    return {
+        "profile_incomplete": False,
+        "recommended_exams": [_exam_row(snap, i, s * 20) for i, s in _top_k(overlap, len(snap.exams), k)]
+    }
 
 def recommend_exams(profile: Dict):
     """
@@ -50,53 +116,43 @@ def recommend_exams(profile: Dict):
     - skills (manual)
     - resumeInfo.skills
     """
-
-    # Get academic
-    education = profile.get("academic", {}).get("level", "").lower()
-
-    # Extract skills (manual skills + resume skills)
-    skills = []
-
-    # manual profile builder skills
-    for s in profile.get("skills", []):
-        if isinstance(s, dict):
-            skills.append(s.get("name", "").lower())
-
-    # resume extracted skills
-    resume_skills = profile.get("resumeInfo", {}).get("skills", [])
-    skills += [s.lower() for s in resume_skills]
-
-    combined_text = education + " " + " ".join(skills)
-
-    # if no data, ask user to complete profile
-    if not combined_text.strip():
-        return {
-            "profile_incomplete": True,
-            "message": "Add your skills or upload resume for exam recommendations.",
-            "recommended_exams": [],
-        }
-
-    results = []
-
-    for exam in EXAM_DATABASE:
-        score = 0
-        eligibility_words = exam["eligibility"].split()
-
-        for w in eligibility_words:
-            if w in combined_text:
-                score += 1
-
-        results.append({
-            "title": exam["title"],
-            "type": exam["type"],
-            "apply_link": exam["apply_link"],
-            "eligibility_score": score * 20,  # convert matching to % similarity
-        })
-
-    # sort by best match
-    results.sort(key=lambda x: x["eligibility_score"], reverse=True)
-
-    return {
-        "profile_incomplete": False,
-        "recommended_exams": results[:6]
-    }
+    features = get_features(profile)
+    if MATCH_ENGINE == "tfidf":
+        return _similar_exams(features)
+    return _match_exams(features)
+
+def recommend_exams_batch(profiles: List[Dict], k: int = TOP_K) -> List[Dict]:
+    """recommend_exams for many profiles with one sparse matrix product per block."""
+    # normalized once at save time (see profile_features)
+    features = [get_features(p) for p in profiles]
+    term_lists = [f["terms"] for f in features]
+    snap = catalogue.current()
+    tfidf = MATCH_ENGINE == "tfidf"
+    if not tfidf:
+        vocab, exam_matrix = snap.get("exam_matrix")
+        # user term matrix: 1 for every vocabulary term each user has
+        users = indicator_matrix(term_lists, vocab)
+
+    out: List[Dict] = []
+    step = max(1, _DENSE_CELLS // max(1, len(snap.exams)))
+    for start in range(0, len(profiles), step):
+        # (block x exams) scores for every exam at once
+        if tfidf:
+            scores = similarity.score_matrix(snap.get("similarity"), "exams", features[start:start + step]).toarray()
+        else:
+            scores = (users[start:start + step] @ exam_matrix.T).toarray()
+        top = _top_k_rows(scores, k)
+        for r in range(scores.shape[0]):
+            if not term_lists[start + r]:
+                out.append(_incomplete())
+                continue
+
+            results = []
+            for i in top[r]:
+                # convert matching to % similarity
+                results.append(_exam_row(snap, i, percent(scores[r, i]) if tfidf else int(scores[r, i]) * 20))
+            out.append({
+                "profile_incomplete": False,
+                "recommended_exams": results
+            })
+    return out
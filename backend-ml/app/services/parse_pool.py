@@ -0,0 +1,125 @@
+# app/services/parse_pool.py
+"""
+Bounded process pool for CPU-heavy resume parsing.
+
+Parsing (pdfplumber / docx2txt) runs in worker processes so it neither blocks
+the event loop nor competes for the GIL. At most `workers + queue_depth` jobs
+are admitted at once; anything beyond that is rejected immediately (the route
+turns it into a 429) instead of piling up behind slow uploads.
+
+The pool is per uvicorn worker, so it defaults to a single process: with
+WEB_CONCURRENCY=2 that is already two PyMuPDF / spaCy processes on a small
+instance. A job that overruns the timeout can't be cancelled once it runs, so
+its worker processes are terminated and the next job starts a fresh pool;
+jobs that were queued behind it are resubmitted once. Otherwise a stuck PDF
+would hold its worker (and slot) forever and every later upload would get a 429.
+"""
+import asyncio, os, threading, weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+RESUME_PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", "1"))      # processes per uvicorn worker
+RESUME_PARSE_QUEUE = int(os.getenv("RESUME_PARSE_QUEUE", "8"))         # jobs allowed to wait for a worker
+RESUME_PARSE_TIMEOUT = float(os.getenv("RESUME_PARSE_TIMEOUT", "30"))  # seconds per job
+
+
+class ParserBusy(Exception):
+    """Every worker is busy and the wait queue is full."""
+
+
+class ParseTimeout(Exception):
+    """A job didn't finish within the per-job timeout."""
+
+
+class ParsePool:
+    def __init__(self, workers: int = RESUME_PARSE_WORKERS, queue_depth: int = RESUME_PARSE_QUEUE,
+                 timeout: float = RESUME_PARSE_TIMEOUT):
+        self.workers = max(1, workers)
+        self.queue_depth = max(0, queue_depth)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_depth)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.recycled = 0
+        self._recycled: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _release(self, _fut) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+
+    def _submit(self, fn: Callable, *args: Any):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise ParserBusy()
+        self.in_flight += 1
+        try:
+            executor = self._pool()
+            fut = executor.submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        # the slot is only freed when the job really ends (or its worker is killed)
+        fut.add_done_callback(self._release)
+        return executor, fut
+
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        for attempt in range(2):
+            executor, fut = self._submit(fn, *args)
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(fut), self.timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                self._recycle(executor)
+                raise ParseTimeout()
+            except BrokenProcessPool:
+                if executor in self._recycled and attempt == 0:
+                    continue  # killed because another job overran; not this job's fault
+                # a worker died (e.g. OOM on a huge PDF); start a fresh pool next time
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = None
+                raise
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        """Kill a pool whose job overran: a running job can't be cancelled any other way."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+            self._recycled.add(executor)
+        self.recycled += 1
+        terminate = getattr(executor, "terminate_workers", None)  # Python 3.14+
+        if terminate is not None:
+            terminate()
+            return
+        for proc in list((getattr(executor, "_processes", None) or {}).values()):
+            proc.terminate()
+        executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "recycled": self.recycled,
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+resume_parse_pool = ParsePool()
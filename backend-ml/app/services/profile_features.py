@@ -0,0 +1,93 @@
+# app/services/profile_features.py
+"""
+Canonical per-profile features shared by every recommender.
+
+Skills come from two places (profile builder + resume) in whatever casing the
+user typed; this module normalizes them once, when the profile is saved, and
+stores the result in the profile under "features" with a version stamp.
+Recommenders call get_features(), which only rebuilds for profiles saved
+before features existed (or with an older FEATURES_VERSION).
+"""
+import hashlib, json, re
+from typing import Dict, List
+import numpy as np
+from scipy import sparse
+
+FEATURES_VERSION = 2
+FEATURES_KEY = "features"
+
+# words, not substrings: "c" must not match inside "science"
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+# spellings folded onto the word used in catalogue text
+_TERM_ALIASES = {
+    "graduation": "graduate", "graduated": "graduate", "graduates": "graduate",
+    "math": "maths", "mathematics": "maths",
+}
+
+
+def normalize_skill(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+def terms(text: str) -> List[str]:
+    """Word tokens used for catalogue matching."""
+    # drop dots first so "b.tech" -> "btech", "node.js" -> "nodejs"
+    return [_TERM_ALIASES.get(t, t) for t in _TOKEN_RE.findall(text.lower().replace(".", ""))]
+
+
+def build_features(profile: Dict) -> Dict:
+    skills = set()
+    # manual profile builder skills
+    for s in profile.get("skills") or []:
+        if isinstance(s, dict):
+            skills.add(normalize_skill(s.get("name") or ""))
+    # resume extracted skills
+    for s in (profile.get("resumeInfo") or {}).get("skills") or []:
+        skills.add(normalize_skill(s))
+    skills.discard("")
+
+    education = normalize_skill((profile.get("academic") or {}).get("level") or "")
+    skill_list = sorted(skills)
+    feats = {
+        "version": FEATURES_VERSION,
+        "skills": skill_list,
+        "education": education,
+        "terms": sorted(set(terms(education + " " + " ".join(skill_list)))),
+    }
+    # identifies everything a recommender can see; used to key cached results
+    raw = json.dumps(feats, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    feats["digest"] = hashlib.blake2b(raw, digest_size=8).hexdigest()
+    return feats
+
+
+def with_features(profile: Dict) -> Dict:
+    """Attach freshly built features to a profile that is about to be saved."""
+    profile[FEATURES_KEY] = build_features(profile)
+    return profile
+
+
+def get_features(profile: Dict) -> Dict:
+    feats = profile.get(FEATURES_KEY)
+    if isinstance(feats, dict) and feats.get("version") == FEATURES_VERSION:
+        return feats
+    return build_features(profile)
+
+
+def public_view(profile: Dict) -> Dict:
+    """The profile as the app knows it, without the derived features."""
+    if FEATURES_KEY not in profile:
+        return profile
+    return {k: v for k, v in profile.items() if k != FEATURES_KEY}
+
+
+def indicator_matrix(term_lists: List[List[str]], vocab: Dict[str, int]) -> sparse.csr_matrix:
+    """One row per profile, 1 in every column whose vocab term it has."""
+    rows, cols = [], []
+    for r, items in enumerate(term_lists):
+        for t in items:
+            j = vocab.get(t)
+            if j is not None:
+                rows.append(r)
+                cols.append(j)
+    data = np.ones(len(rows), dtype=np.int32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(term_lists), len(vocab)), dtype=np.int32)
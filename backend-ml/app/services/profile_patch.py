@@ -0,0 +1,168 @@
+# app/services/profile_patch.py
+"""
+Partial profile updates: apply a patch to a stored profile document.
+
+Two formats, told apart by the body's shape:
+
+- JSON Merge Patch (RFC 7396), an object: its fields replace the profile's,
+  nested objects merge, null removes a field.
+
+      {"preferences": {"arrangement": "remote"}, "profileCompletion": 80}
+
+- JSON Patch (RFC 6902), a list of operations on JSON-pointer paths:
+  add / remove / replace / move / copy / test ("/skills/-" appends).
+
+      [{"op": "add", "path": "/skills/-", "value": {"name": "docker"}},
+       {"op": "remove", "path": "/interests/0"}]
+
+apply_patch() works on a copy and returns it with the set of top-level
+fields it touched, so the route validates only those fields.
+"""
+import copy
+from typing import Any, Dict, List, Set, Tuple, Union
+
+Patch = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+
+class PatchError(ValueError):
+    """Malformed patch, or an operation that doesn't fit the document."""
+
+
+class PatchTestFailed(PatchError):
+    """A JSON Patch "test" operation didn't match the stored value."""
+
+
+_MISSING = object()
+
+
+# ---------- RFC 7396 merge patch ----------
+def merge_patch(target: Any, patch: Any) -> Any:
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    out = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            out.pop(key, None)
+        else:
+            out[key] = merge_patch(out.get(key), value)
+    return out
+
+
+# ---------- RFC 6902 JSON patch ----------
+def _pointer(path: Any) -> List[str]:
+    if not isinstance(path, str) or (path and not path.startswith("/")):
+        raise PatchError(f"Invalid JSON pointer: {path!r}")
+    return [p.replace("~1", "/").replace("~0", "~") for p in path.split("/")[1:]]
+
+
+def _index(container: List, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError(f"Invalid list index: {token!r}")
+    i = int(token)
+    if i > len(container) or (i == len(container) and not allow_end):
+        raise PatchError(f"List index out of range: {i}")
+    return i
+
+
+def _parent(doc: Any, tokens: List[str]) -> Any:
+    node = doc
+    for token in tokens[:-1]:
+        if isinstance(node, dict) and token in node:
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token)]
+        else:
+            raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+    return node
+
+
+def _get(doc: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        return doc
+    parent, last = _parent(doc, tokens), tokens[-1]
+    if isinstance(parent, dict) and last in parent:
+        return parent[last]
+    if isinstance(parent, list):
+        return parent[_index(parent, last)]
+    raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def _add(doc: Any, tokens: List[str], value: Any) -> None:
+    parent, last = _parent(doc, tokens), tokens[-1]
+    if isinstance(parent, dict):
+        parent[last] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, last, allow_end=True), value)
+    else:
+        raise PatchError(f"Cannot add under a scalar: /{'/'.join(tokens)}")
+
+
+def _remove(doc: Any, tokens: List[str]) -> Any:
+    parent, last = _parent(doc, tokens), tokens[-1]
+    if isinstance(parent, dict) and last in parent:
+        return parent.pop(last)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, last))
+    raise PatchError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """JSON equality for "test": unlike ==, true is not 1 and 0 is not false."""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return isinstance(a, bool) and isinstance(b, bool) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, (dict, list)) or isinstance(b, (dict, list)):
+        return False
+    return a == b
+
+
+def json_patch(doc: Dict[str, Any], ops: List[Dict[str, Any]]) -> Dict[str, Any]:
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if not isinstance(op, dict):
+            raise PatchError("Each operation must be an object")
+        name, tokens = op.get("op"), _pointer(op.get("path"))
+        value = op.get("value", _MISSING)
+        if name in ("add", "replace", "test") and value is _MISSING:
+            raise PatchError(f"'{name}' needs a value")
+        if not tokens and name != "test":
+            raise PatchError("Operations on the whole document are not allowed")
+
+        if name == "add":
+            _add(doc, tokens, copy.deepcopy(value))
+        elif name == "remove":
+            _remove(doc, tokens)
+        elif name == "replace":
+            _get(doc, tokens)  # must exist
+            _remove(doc, tokens)
+            _add(doc, tokens, copy.deepcopy(value))
+        elif name in ("move", "copy"):
+            source = _pointer(op.get("from"))
+            if name == "move" and len(tokens) > len(source) and tokens[:len(source)] == source:
+                raise PatchError("Cannot move a value into itself")
+            moved = _remove(doc, source) if name == "move" else copy.deepcopy(_get(doc, source))
+            _add(doc, tokens, moved)
+        elif name == "test":
+            if not _json_equal(_get(doc, tokens), value):
+                raise PatchTestFailed(f"Test failed at {op.get('path')}")
+        else:
+            raise PatchError(f"Unknown operation: {name!r}")
+    return doc
+
+
+# ---------- entry point ----------
+def apply_patch(doc: Dict[str, Any], patch: Patch) -> Tuple[Dict[str, Any], Set[str]]:
+    """(patched copy of doc, top-level fields whose value changed)."""
+    if isinstance(patch, list):
+        patched = json_patch(doc, patch)
+    elif isinstance(patch, dict):
+        patched = merge_patch(doc, patch)
+    else:
+        raise PatchError("Patch must be an object (merge patch) or a list of operations (JSON Patch)")
+    changed = {k for k in doc.keys() | patched.keys() if doc.get(k, _MISSING) != patched.get(k, _MISSING)}
+    return patched, changed
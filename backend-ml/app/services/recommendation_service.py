@@ -1,33 +1,25 @@
 # app/services/recommendation_service.py
-from typing import List, Dict
+from typing import List, Dict, Set, Tuple
+from app.services.profile_features import normalize_skill
+from app.services.catalogue import catalogue, Snapshot
 
-# very simple mapping; expand for your needs
-CAREER_CLUSTERS = {
-    "Data Science": {"skills": {"Python","Pandas","Numpy","SQL","Scikit-Learn"}},
-    "Machine Learning Engineer": {"skills": {"Python","Tensorflow","Pytorch","Numpy","Pandas"}},
-    "Backend Developer": {"skills": {"Python","Django","Flask","Fastapi","SQL","Docker"}},
-    "Frontend Developer": {"skills": {"JavaScript","React","HTML","CSS"}},
-    "Mobile Developer": {"skills": {"Dart","Flutter","Kotlin","Swift"}},
-    "Cloud/DevOps Engineer": {"skills": {"Docker","Kubernetes","AWS","GCP","Azure","Linux","CI/Cd"}},
-}
+# career clusters and skill-tagged exams live in app/data/catalogue.json
+# ("career_clusters", "exam_skills"); see services/catalogue.py
 
-EXAMS = [
-    # govt (India-centric placeholders; tweak as needed)
-    {"name":"GATE-CS", "type":"govt", "tags":["CS","Programming","Math"], "eligible_skills":["Python","Data Structures","Algorithms"]},
-    {"name":"SSC CGL", "type":"govt", "tags":["General"], "eligible_skills":[]},
-    {"name":"IBPS PO", "type":"govt", "tags":["General"], "eligible_skills":[]},
-    # private / certs / internships
-    {"name":"TCS NQT", "type":"private", "tags":["Aptitude","Programming"], "eligible_skills":["Java","Python","SQL"]},
-    {"name":"Google Cloud Associate", "type":"private", "tags":["Cloud"], "eligible_skills":["GCP","Docker","Kubernetes"]},
-    {"name":"AWS Cloud Practitioner", "type":"private", "tags":["Cloud"], "eligible_skills":["AWS"]},
-    {"name":"Meta Front-End Cert", "type":"private", "tags":["Frontend"], "eligible_skills":["React","JavaScript","HTML","CSS"]},
-]
+def _build_skill_sets(snap: Snapshot) -> Tuple[Dict[str, Set[str]], List[Set[str]]]:
+    # catalogue skills normalized the same way as profile features, once per version
+    clusters = {c["career"]: {normalize_skill(x) for x in c["skills"]} for c in snap.career_clusters}
+    exams = [{normalize_skill(x) for x in exam["eligible_skills"]} for exam in snap.exam_skills]
+    return clusters, exams
+
+catalogue.derive("skill_sets", _build_skill_sets)
 
 def recommend_careers(user_skills: List[str], interests: List[Dict], preferences: Dict) -> List[Dict]:
-    skills_set = {s.title() for s in user_skills}
+    skills_set = {normalize_skill(s) for s in user_skills}
+    cluster_skills = catalogue.current().get("skill_sets")[0]
     scored = []
-    for career, cfg in CAREER_CLUSTERS.items():
-        overlap = len(skills_set & {x.title() for x in cfg["skills"]})
+    for career in cluster_skills:
+        overlap = len(skills_set & cluster_skills[career])
         boost = 0
         if preferences.get("workEnvironment","").lower() == "remote" and career in ["Frontend Developer","Backend Developer","Mobile Developer"]:
             boost += 1
@@ -36,12 +28,12 @@ def recommend_careers(user_skills: List[str], interests: List[Dict], preferences
     return [c for c in scored if c["score"] > 0][:5]
 
 def recommend_exams(user_skills: List[str], academic: Dict, preferences: Dict) -> List[Dict]:
-    skills = {s.title() for s in user_skills}
+    skills = {normalize_skill(s) for s in user_skills}
+    snap = catalogue.current()
     out = []
-    for exam in EXAMS:
-        req = set([x.title() for x in exam["eligible_skills"]])
+    for exam, req in zip(snap.exam_skills, snap.get("skill_sets")[1]):
         if not req or (req & skills):
-            out.append(exam)
+            out.append((0 if req & skills else 1, exam))
     # quick prioritization: cloud if cloud-ish, programming if dev-ish
-    out.sort(key=lambda e: 0 if set([x.title() for x in e["eligible_skills"]]) & skills else 1)
-    return out[:6]
+    out.sort(key=lambda e: e[0])
+    return [exam for _, exam in out[:6]]
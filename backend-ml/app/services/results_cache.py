@@ -0,0 +1,165 @@
+# app/services/results_cache.py
+"""
+Materialized recommendation results.
+
+Recommendations are a pure function of (catalogue, profile features), so
+results are cached under (kind, catalogue version, features digest) as
+pre-encoded JSON bytes plus an ETag. Nothing ever needs invalidating: a
+profile save produces a new features digest and a catalogue change produces a
+new catalogue version, and both schedule a background recompute so the next
+dashboard load is a cache lookup (or a 304 when the app sends If-None-Match).
+A catalogue change only recomputes the profiles looked up most recently (at
+most as many as the cache holds); everyone else is computed on their next
+visit. Background computes are timed as the "scoring_background" stage so
+they don't show up in request latency.
+
+Routes register how to compute each kind, and the catalogue version it
+depends on (a cheap string - see services/catalogue.py):
+
+    results_cache.register("exams", compute_fn, lambda: catalogue.current().version("exams"))
+"""
+import hashlib, json, logging, os, queue, threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import Response
+from app.utils import fast_json
+from app.utils.cache import LRUCache
+from app.utils.metrics import stage
+from app.services.profile_features import get_features
+from app.services.catalogue import catalogue
+
+log = logging.getLogger(__name__)
+
+RESULTS_CACHE_SIZE = int(os.getenv("RESULTS_CACHE_SIZE", "4096"))
+
+
+def _digest(obj: Any) -> str:
+    raw = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=list).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
+class ResultsCache:
+    def __init__(self, maxsize: int = RESULTS_CACHE_SIZE):
+        self._cache = LRUCache(maxsize=maxsize)
+        self._kinds: Dict[str, Tuple[Callable[[Dict], Any], Callable[[], Any]]] = {}
+        self._versions: Dict[str, str] = {}
+        self._queue: "queue.Queue[Tuple[str, Optional[Dict]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        # features digest -> profile, most recently used last; what a catalogue change re-warms
+        self._recent: "OrderedDict[str, Dict]" = OrderedDict()
+        self._recent_max = max(0, int(maxsize))
+        self._lock = threading.Lock()
+        self.recomputed = 0
+
+    def register(self, kind: str, compute: Callable[[Dict], Any], catalogue: Callable[[], Any]) -> None:
+        """compute(profile) -> JSON-able result (or its encoded bytes); catalogue() -> version (or data) it depends on."""
+        self._kinds[kind] = (compute, catalogue)
+        self._versions[kind] = self.catalogue_version(kind)
+
+    def catalogue_version(self, kind: str) -> str:
+        version = self._kinds[kind][1]()
+        return version if isinstance(version, str) else _digest(version)
+
+    # ---------- read path ----------
+    def _key(self, kind: str, profile: Dict) -> Tuple[str, str, str]:
+        # asked on every lookup, so a hot-reloaded catalogue is never served stale results
+        return (kind, self.catalogue_version(kind), get_features(profile)["digest"])
+
+    def _compute(self, key: Tuple[str, str, str], profile: Dict, stage_name: str = "scoring") -> Tuple[str, bytes]:
+        compute, _ = self._kinds[key[0]]
+        with stage(stage_name):
+            result = compute(profile)
+            body = result if isinstance(result, bytes) else fast_json.dumps(result)
+        entry = (f'"{key[0]}-{key[1]}-{key[2]}"', body)
+        self._cache.set(key, entry)
+        return entry
+
+    def get(self, kind: str, profile: Dict) -> Tuple[str, bytes]:
+        """(etag, encoded JSON body) for this profile, computed on a miss."""
+        key = self._key(kind, profile)
+        self._touch(key[2], profile)
+        entry = self._cache.get(key)
+        return entry if entry is not None else self._compute(key, profile)
+
+    def _touch(self, digest: str, profile: Dict) -> None:
+        with self._lock:
+            self._recent[digest] = profile
+            self._recent.move_to_end(digest)
+            while len(self._recent) > self._recent_max:
+                self._recent.popitem(last=False)
+
+    # ---------- background refresh ----------
+    def schedule(self, profile: Dict) -> None:
+        """Precompute every kind for a just-saved profile."""
+        self._touch(get_features(profile)["digest"], profile)
+        self._ensure_worker()
+        self._queue.put(("profile", profile))
+
+    def check_catalogues(self) -> bool:
+        """Re-hash the catalogues; on any change, recompute results for the recently used profiles."""
+        changed = False
+        for kind in self._kinds:
+            version = self.catalogue_version(kind)
+            if version != self._versions[kind]:
+                self._versions[kind] = version
+                changed = True
+        if changed:
+            self._ensure_worker()
+            self._queue.put(("all", None))
+        return changed
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="results-refresh", daemon=True)
+                self._worker.start()
+
+    def _warm(self, profile: Dict) -> None:
+        for kind in self._kinds:
+            key = self._key(kind, profile)
+            if key not in self._cache:
+                self._compute(key, profile, "scoring_background")
+                self.recomputed += 1
+
+    def _run(self) -> None:
+        while True:
+            job, profile = self._queue.get()
+            try:
+                if job == "profile":
+                    self._warm(profile)
+                else:
+                    with self._lock:
+                        recent = list(reversed(self._recent.values()))  # most recent first
+                    for p in recent:
+                        self._warm(p)
+            except Exception:
+                log.exception("Recommendation refresh failed", extra={"job": job})
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cache": self._cache.stats(), "versions": dict(self._versions),
+                "pending": self._queue.qsize(), "recent": len(self._recent), "recomputed": self.recomputed}
+
+
+results_cache = ResultsCache()
+# a catalogue hot reload recomputes recently used profiles' results in the background
+catalogue.on_reload(lambda _snap: results_cache.check_catalogues())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return etag in tags or f"W/{etag}" in tags
+
+
+def cached_response(kind: str, profile: Dict, if_none_match: Optional[str]) -> Response:
+    """Serve a precomputed result, or a bodyless 304 if the client already has it."""
+    etag, body = results_cache.get(kind, profile)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,151 @@
+# app/services/resume_cache.py
+"""
+Content-addressed storage for uploaded resumes and their parse results.
+
+Uploads are stored once per BLAKE2b digest of their bytes, so re-uploading the
+same file reuses the existing blob. Parse results are cached in memory (LRU)
+and on disk as uploads/parsed/<digest>.<parser version>.json. Both directories
+are size-bounded: the least recently used entries are removed first.
+
+Eviction scans both directories, so it runs in a background thread at most
+once every RESUME_CACHE_EVICT_INTERVAL seconds rather than on every save. It
+never removes a blob younger than RESUME_BLOB_MIN_AGE (by default twice the
+parse timeout): that upload may still be being parsed. store_blob() touches
+a blob it reuses, so a re-upload counts as new too.
+"""
+import hashlib, json, logging, os, threading, time
+from typing import Dict, List, Optional, Tuple
+from app.utils.cache import LRUCache
+from app.services.resume_service import parser_version
+from app.services.parse_pool import RESUME_PARSE_TIMEOUT
+
+log = logging.getLogger(__name__)
+
+RESUME_CACHE_MEM_SIZE = int(os.getenv("RESUME_CACHE_MEM_SIZE", "512"))          # parsed results kept in memory
+RESUME_CACHE_MAX_FILES = int(os.getenv("RESUME_CACHE_MAX_FILES", "5000"))       # parsed results kept on disk
+RESUME_UPLOAD_MAX_BYTES = int(os.getenv("RESUME_UPLOAD_MAX_BYTES", str(512 << 20)))  # total size of stored blobs
+RESUME_CACHE_EVICT_INTERVAL = float(os.getenv("RESUME_CACHE_EVICT_INTERVAL", "30"))  # seconds between eviction scans
+RESUME_BLOB_MIN_AGE = float(os.getenv("RESUME_BLOB_MIN_AGE", str(2 * RESUME_PARSE_TIMEOUT)))  # may still be parsing
+
+
+def new_hasher():
+    return hashlib.blake2b(digest_size=16)
+
+
+class ResumeCache:
+    def __init__(self, upload_dir: str, mem_size: int = RESUME_CACHE_MEM_SIZE,
+                 max_files: int = RESUME_CACHE_MAX_FILES, max_blob_bytes: int = RESUME_UPLOAD_MAX_BYTES,
+                 evict_interval: float = RESUME_CACHE_EVICT_INTERVAL, blob_min_age: float = RESUME_BLOB_MIN_AGE):
+        self.upload_dir = upload_dir
+        self.parsed_dir = os.path.join(upload_dir, "parsed")
+        self.max_files = max_files
+        self.max_blob_bytes = max_blob_bytes
+        self.evict_interval = evict_interval
+        self.blob_min_age = blob_min_age
+        self._mem = LRUCache(maxsize=mem_size)
+        self._evicting = threading.Lock()
+        self._last_evict = float("-inf")
+        self.disk_hits = self.eviction_scans = 0
+        os.makedirs(self.parsed_dir, exist_ok=True)
+
+    # ---------- blobs ----------
+    def blob_path(self, digest: str, ext: str) -> str:
+        return os.path.join(self.upload_dir, f"{digest}.{ext}")
+
+    def store_blob(self, digest: str, ext: str, src_path: str) -> str:
+        """Move a freshly written upload into place; an identical blob is reused."""
+        path = self.blob_path(digest, ext)
+        if os.path.exists(path):
+            try:
+                os.utime(path)  # touch first: eviction spares young blobs
+            except FileNotFoundError:
+                pass  # evicted in between: fall through and store ours
+            else:
+                os.remove(src_path)
+                return path
+        os.replace(src_path, path)
+        return path
+
+    # ---------- parse results ----------
+    def _parsed_path(self, digest: str, version: str) -> str:
+        return os.path.join(self.parsed_dir, f"{digest}.{version}.json")
+
+    def get(self, digest: str) -> Optional[Dict]:
+        # the version follows the skill bank, so a catalogue reload misses old results
+        version = parser_version()
+        parsed = self._mem.get((digest, version))
+        if parsed is None:
+            path = self._parsed_path(digest, version)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    parsed = json.load(f)
+            except (OSError, ValueError):
+                return None
+            os.utime(path)  # mark as recently used for eviction
+            self.disk_hits += 1
+            self._mem.set((digest, version), parsed)
+        # callers may tweak the result; keep the cached copy pristine
+        return json.loads(json.dumps(parsed))
+
+    def put(self, digest: str, parsed: Dict) -> None:
+        version = parser_version()
+        self._mem.set((digest, version), json.loads(json.dumps(parsed)))
+        path = self._parsed_path(digest, version)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(parsed, f)
+        os.replace(tmp, path)
+        self._maybe_evict()
+
+    # ---------- eviction ----------
+    @staticmethod
+    def _entries(directory: str) -> List[Tuple[float, int, str]]:
+        out = []
+        with os.scandir(directory) as it:
+            for e in it:
+                if e.is_file() and not e.name.endswith(".tmp"):
+                    st = e.stat()
+                    out.append((st.st_mtime, st.st_size, e.path))
+        out.sort()
+        return out
+
+    def _maybe_evict(self) -> None:
+        now = time.monotonic()
+        if now - self._last_evict < self.evict_interval or not self._evicting.acquire(blocking=False):
+            return
+        self._last_evict = now
+        threading.Thread(target=self._evict_safely, name="resume-cache-evict", daemon=True).start()
+
+    def _evict_safely(self) -> None:
+        try:
+            self._evict()
+        except Exception:
+            log.exception("Resume cache eviction failed")  # the next scan tries again
+        finally:
+            self._evicting.release()
+
+    def _evict(self) -> None:
+        parsed = self._entries(self.parsed_dir)
+        for _, _, path in parsed[:max(0, len(parsed) - self.max_files)]:
+            _silent_remove(path)
+
+        blobs = self._entries(self.upload_dir)
+        total = sum(size for _, size, _ in blobs)
+        young = time.time() - self.blob_min_age
+        for mtime, size, path in blobs:
+            if total <= self.max_blob_bytes or mtime > young:
+                break  # sorted by mtime: everything from here on may still be parsing
+            _silent_remove(path)
+            total -= size
+        self.eviction_scans += 1
+
+    def stats(self) -> Dict:
+        return {"memory": self._mem.stats(), "disk_hits": self.disk_hits, "eviction_scans": self.eviction_scans,
+                "parser_version": parser_version()}
+
+
+def _silent_remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,24 +1,87 @@
 # app/services/resume_service.py
 import re
 import os
-from typing import List, Dict
+import hashlib
+import time
+from typing import List, Dict, Optional, Tuple
+from app.services.catalogue import catalogue
+
+# PDF backend: "pymupdf" (fast, default) or "pdfplumber" (slow, layout-aware)
+RESUME_PDF_BACKEND = os.getenv("RESUME_PDF_BACKEND", "pymupdf")
+# resumes rarely run past a few pages; don't let a 200-page PDF hog a worker
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "6"))
 
 # PDF + DOCX text extraction
-def _read_pdf(path: str) -> str:
+def _read_pdf_pdfplumber(path: str, max_pages: int = RESUME_MAX_PAGES) -> str:
     import pdfplumber
     text_chunks = []
     with pdfplumber.open(path) as pdf:
-        for p in pdf.pages:
+        for p in pdf.pages[:max_pages]:
             text_chunks.append(p.extract_text() or "")
     return "\n".join(text_chunks)
 
+def _read_pdf_pymupdf(path: str, max_pages: int = RESUME_MAX_PAGES) -> str:
+    try:
+        import pymupdf
+    except ImportError:  # PyMuPDF < 1.24.3
+        import fitz as pymupdf
+    text_chunks = []
+    seen = set()
+    done_at = None
+    with pymupdf.open(path) as doc:
+        for i, page in enumerate(doc):
+            if i >= max_pages or (done_at is not None and i > done_at + 1):
+                break
+            page_text = page.get_text() or ""
+            text_chunks.append(page_text)
+            # everything extract_resume_data looks for has shown up: read one more page
+            # (a section that starts here, e.g. the skills list, may run onto it), then stop
+            seen.update(name for name, rx in _SECTION_HINTS.items() if rx.search(page_text))
+            if done_at is None and len(seen) == len(_SECTION_HINTS):
+                done_at = i
+    return "\n".join(text_chunks)
+
+PDF_BACKENDS = {
+    "pymupdf": _read_pdf_pymupdf,
+    "pdfplumber": _read_pdf_pdfplumber,
+}
+
+def _read_pdf(path: str, backend: str = "") -> str:
+    backend = backend or RESUME_PDF_BACKEND
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {backend}")
+    text = PDF_BACKENDS[backend](path)
+    # scanned / oddly encoded PDFs can come back empty from the fast path
+    if not text.strip() and backend != "pdfplumber":
+        text = _read_pdf_pdfplumber(path)
+    return text
+
 def _read_docx(path: str) -> str:
     # works well for simple extraction
     import docx2txt
     return docx2txt.process(path) or ""
 
+def preload_parsers() -> None:
+    """Import the PDF / DOCX libraries ahead of the first upload (parse workers fork with them loaded)."""
+    if RESUME_PDF_BACKEND == "pdfplumber":
+        import pdfplumber
+    else:
+        try:
+            import pymupdf
+        except ImportError:  # PyMuPDF < 1.24.3
+            import fitz as pymupdf
+    import docx2txt
+
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 PHONE_RE = re.compile(r"(\+?\d[\d\s\-]{7,}\d)")
+EDU_RE = re.compile(r"(B\.?Tech|B\.?E\.?|BSc|MSc|MCA|MBA|Diploma).{0,40}(CS|IT|Computer|Electronics)?",
+                    flags=re.IGNORECASE)
+# sections whose presence lets the PDF reader stop turning pages
+_SECTION_HINTS = {
+    "contact": EMAIL_RE,
+    "skills": re.compile(r"\bskills?\b", flags=re.IGNORECASE),
+    "education": EDU_RE,
+}
 # crude “name” guess: first non-empty line before email
 def _guess_name(text: str, email: str) -> str:
     lines = [l.strip() for l in text.splitlines() if l.strip()]
@@ -35,43 +98,86 @@ def _guess_name(text: str, email: str) -> str:
     # else first line as fallback
     return lines[0] if len(lines[0].split()) <= 5 else ""
 
-# a seed skills dictionary (extend as needed)
-SKILL_BANK = {
-    # programming
-    "python","java","javascript","typescript","c","c++","dart","flutter","kotlin","swift",
-    # data
-    "sql","mysql","postgresql","mongodb","pandas","numpy","matplotlib","scikit-learn","tensorflow","pytorch",
-    # web/app
-    "react","node","express","django","flask","fastapi","html","css","rest api","graphql",
-    # cloud/devops
-    "docker","kubernetes","aws","gcp","azure","git","ci/cd","linux",
-    # soft skills
-    "communication","leadership","teamwork","problem solving","time management",
+# the skill bank lives in app/data/catalogue.json ("skill_bank"); see services/catalogue.py
+
+# common spellings that should count as a skill bank entry
+SKILL_ALIASES = {
+    "js": "javascript", "ts": "typescript",
+    "postgres": "postgresql", "mongo": "mongodb",
+    "nodejs": "node", "node js": "node",
+    "reactjs": "react", "react js": "react",
+    "expressjs": "express", "express js": "express",
+    "html5": "html", "css3": "css",
+    "sklearn": "scikit-learn", "k8s": "kubernetes",
+    "amazon web services": "aws", "google cloud": "gcp",
+    "restful api": "rest api",
 }
 
-# normalize text for matching
-def _normalize(s: str) -> str:
-    return re.sub(r"\s+", " ", s.lower().strip())
+# skills are matched on whole tokens, so "c" only matches a standalone "c";
+# "+" and "#" are kept inside tokens for c++ / c#
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_END = ""  # trie key marking "a skill ends here" (never a real token)
+
+def _tokenize(s: str) -> List[str]:
+    return _TOKEN_RE.findall(s.lower())
+
+def _display(sk: str) -> str:
+    return sk.title() if " " not in sk else " ".join(w.title() for w in sk.split())
+
+def _compile_skill_trie(bank, aliases: Dict[str, str]) -> Dict:
+    """Token trie over every skill / alias phrase; leaves hold the canonical skill."""
+    bank = set(bank)
+    root: Dict = {}
+    phrases = [(sk, sk) for sk in bank] + list(aliases.items())
+    for phrase, canonical in phrases:
+        if canonical not in bank:
+            raise ValueError(f"alias {phrase!r} points at unknown skill {canonical!r}")
+        node = root
+        for tok in _tokenize(phrase):
+            node = node.setdefault(tok, {})
+        node[_END] = canonical
+    return root
 
-def _extract_skills(text: str) -> List[str]:
-    t = _normalize(text)
+# compiled once per catalogue version
+catalogue.derive("skill_trie", lambda snap: _compile_skill_trie(snap.skill_bank, SKILL_ALIASES))
+
+# bump _PARSER_REV when extraction logic changes; skill list edits change the
+# hash by themselves. Cached parse results are keyed by this.
+_PARSER_REV = 3
+_PARSER_CONFIG = hashlib.blake2b(
+    repr((sorted(SKILL_ALIASES.items()), RESUME_PDF_BACKEND, RESUME_MAX_PAGES)).encode(),
+    digest_size=4).hexdigest()
+
+def parser_version() -> str:
+    return f"{_PARSER_REV}-{_PARSER_CONFIG}-{catalogue.current().version('skill_bank')[:8]}"
+
+def _extract_skills(text: str, trie: Optional[Dict] = None) -> List[str]:
+    """Single left-to-right pass over the tokens, taking the longest skill
+    phrase that starts at each position (so "node js" wins over "node")."""
+    if trie is None:
+        trie = catalogue.current().get("skill_trie")
+    tokens = _tokenize(text)
     found = set()
-    for sk in SKILL_BANK:
-        if sk in t:
-            found.add(sk.title() if " " not in sk else " ".join(w.title() for w in sk.split()))
-    # also try bullet lines like "Skills: Python, SQL, ... "
-    m = re.findall(r"skills?[:\-]\s*(.+)", text, flags=re.IGNORECASE)
-    for block in m:
-        for token in re.split(r"[,\|/•·]", block):
-            tok = _normalize(token)
-            if not tok:
-                continue
-            for sk in SKILL_BANK:
-                if sk in tok:
-                    found.add(sk.title() if " " not in sk else " ".join(w.title() for w in sk.split()))
+    i, n = 0, len(tokens)
+    while i < n:
+        node, j, match = trie, i, None
+        while j < n:
+            node = node.get(tokens[j])
+            if node is None:
+                break
+            j += 1
+            if _END in node:
+                match = (node[_END], j)
+        if match:
+            found.add(_display(match[0]))
+            i = match[1]
+        else:
+            i += 1
     return sorted(found)
 
-def extract_resume_data(path: str) -> Dict:
+def extract_resume_data(path: str, timings: Optional[Dict[str, float]] = None) -> Dict:
+    """timings, if given, receives seconds spent per stage (text_extraction, skill_extraction)."""
+    t0 = time.perf_counter()
     ext = path.lower().split(".")[-1]
     if ext == "pdf":
         text = _read_pdf(path)
@@ -79,6 +185,7 @@ def extract_resume_data(path: str) -> Dict:
         text = _read_docx(path)
     else:
         raise ValueError("Unsupported file type")
+    t1 = time.perf_counter()
 
     email = EMAIL_RE.search(text)
     email = email.group(0) if email else ""
@@ -87,12 +194,14 @@ def extract_resume_data(path: str) -> Dict:
     phone = phone.group(0) if phone else ""
 
     skills = _extract_skills(text)
+    if timings is not None:
+        timings["text_extraction"] = t1 - t0
+        timings["skill_extraction"] = time.perf_counter() - t1
     name = _guess_name(text, email)
 
     # try education hint
     edu = ""
-    edu_match = re.search(r"(B\.?Tech|B\.?E\.?|BSc|MSc|MCA|MBA|Diploma).{0,40}(CS|IT|Computer|Electronics)?",
-                          text, flags=re.IGNORECASE)
+    edu_match = EDU_RE.search(text)
     if edu_match:
         edu = edu_match.group(0).strip()
 
@@ -104,3 +213,10 @@ def extract_resume_data(path: str) -> Dict:
         "education": edu,
         "raw_length": len(text),
     }
+
+
+def extract_resume_data_timed(path: str) -> Tuple[Dict, Dict[str, float]]:
+    """Parse-pool entry point: the parse plus its stage timings, which the
+    parent process records (metrics live in the web worker, not the pool)."""
+    timings: Dict[str, float] = {}
+    return extract_resume_data(path, timings), timings
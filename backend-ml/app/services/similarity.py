@@ -0,0 +1,185 @@
+# app/services/similarity.py
+"""
+TF-IDF similarity engine for career and exam matching.
+
+A TfidfVectorizer is fitted over the catalogue text (career skills + roadmaps,
+exam titles + eligibility) and the fitted state - vocabulary, idf weights and
+the L2-normalized item x term matrices - is saved with joblib. At startup the
+file is loaded with mmap_mode="r", so the arrays are paged in from disk rather
+than rebuilt or copied. Profiles are weighted with the same idf and scored by
+cosine similarity (a sparse dot product, since every row is unit length).
+
+Only the fit needs scikit-learn; scoring uses the saved arrays directly:
+single profiles walk the term -> item postings of their own terms, batches do
+one sparse product.
+
+    cd backend-ml && python -m app.services.similarity          # (re)build the index file
+
+Opt in with MATCH_ENGINE=tfidf; the default stays keyword overlap.
+"""
+import logging, math, os, re, sys, time
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from scipy import sparse
+from app.services.profile_features import terms
+from app.services.catalogue import catalogue, Snapshot
+
+log = logging.getLogger(__name__)
+
+MATCH_ENGINE = os.getenv("MATCH_ENGINE", "overlap")  # "overlap" | "tfidf"
+SIMILARITY_INDEX_PATH = os.getenv(
+    "SIMILARITY_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "similarity.joblib"),
+)
+INDEX_VERSION = 1
+
+# phrases are matched on their own so "sql, excel" never yields the bigram "sql excel"
+_PHRASE_SPLIT_RE = re.compile(r"[,;:/()→\-]+|\.\s")
+
+
+def _phrases(text: str) -> List[str]:
+    return [p for p in _PHRASE_SPLIT_RE.split(text) if p.strip()]
+
+
+def analyze(phrases: List[str]) -> List[str]:
+    """Unigrams + in-phrase bigrams ("machine learning") of a list of phrases."""
+    out: List[str] = []
+    for phrase in phrases:
+        words = terms(phrase)
+        out.extend(words)
+        out.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return out
+
+
+def career_document(data: Dict) -> List[str]:
+    return [data["role"], *data["skills"], *_phrases(data.get("roadmap", ""))]
+
+
+def exam_document(exam: Dict) -> List[str]:
+    return [exam["title"], exam["eligibility"]]
+
+
+def profile_document(features: Dict) -> List[str]:
+    return [*features["skills"], features["education"]]
+
+
+def catalogue_key(snap: Snapshot) -> str:
+    """Which catalogue (and index format) a saved index was fitted on."""
+    return f"{INDEX_VERSION}-{snap.version('careers')}-{snap.version('exams')}"
+
+
+def results_version(snap: Snapshot, section: str) -> str:
+    """What cached results for a catalogue section depend on: the match engine, and
+    the section (overlap) or the similarity index (tfidf) it scores against."""
+    if MATCH_ENGINE == "tfidf":
+        return f"tfidf-{catalogue_key(snap)}"
+    return f"overlap-{snap.version(section)}"
+
+
+def fit_index(snap: Snapshot) -> Dict:
+    """Fit one vectorizer over both catalogues; returns the arrays scoring needs."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    careers, exams = list(snap.careers), list(snap.exams)
+    docs = [career_document(c) for c in careers] + [exam_document(e) for e in exams]
+    vec = TfidfVectorizer(analyzer=analyze, sublinear_tf=True, norm="l2", dtype=np.float32)
+    matrix = vec.fit_transform(docs).tocsr()
+    n = len(careers)
+    return {
+        "version": INDEX_VERSION,
+        "catalogue": catalogue_key(snap),
+        "vocabulary": {t: int(j) for t, j in vec.vocabulary_.items()},
+        "idf": vec.idf_.astype(np.float32),
+        "careers": matrix[:n].tocsr(),
+        "exams": matrix[n:].tocsr(),
+        # term -> items postings for single-profile scoring
+        "careers_by_term": matrix[:n].T.tocsr(),
+        "exams_by_term": matrix[n:].T.tocsr(),
+    }
+
+
+def save_index(index: Dict, path: str = SIMILARITY_INDEX_PATH) -> None:
+    import joblib
+    tmp = f"{path}.{os.getpid()}.tmp"  # workers starting together may each write one
+    joblib.dump(index, tmp)  # uncompressed, so it can be memory-mapped
+    os.replace(tmp, path)
+
+
+def load_index(path: str = SIMILARITY_INDEX_PATH) -> Optional[Dict]:
+    import joblib
+    try:
+        return joblib.load(path, mmap_mode="r")
+    except FileNotFoundError:
+        return None
+
+
+def _load_or_fit(snap: Snapshot, path: str = SIMILARITY_INDEX_PATH) -> Dict:
+    index = load_index(path)
+    if index is None or index.get("catalogue") != catalogue_key(snap):
+        # missing or built for another catalogue: fit now, keep it for the next start
+        index = fit_index(snap)
+        try:
+            save_index(index, path)
+        except OSError as e:
+            log.warning("Could not save similarity index: %s", e, extra={"path": path})
+    return index
+
+# one index per catalogue version; only loaded up front when it will be used
+catalogue.derive("similarity", _load_or_fit, eager=MATCH_ENGINE == "tfidf")
+
+
+# ---------- scoring ----------
+def weights(index: Dict, features: Dict) -> Dict[int, float]:
+    """Query vector (column -> weight): sublinear tf x idf, L2-normalized."""
+    vocab, idf = index["vocabulary"], index["idf"]
+    counts: Dict[int, int] = defaultdict(int)
+    for t in analyze(profile_document(features)):
+        j = vocab.get(t)
+        if j is not None:
+            counts[j] += 1
+    w = {j: (1.0 + math.log(c)) * float(idf[j]) for j, c in counts.items()}
+    norm = math.sqrt(sum(v * v for v in w.values())) or 1.0
+    return {j: v / norm for j, v in w.items()}
+
+
+def scores(index: Dict, kind: str, features: Dict) -> Dict[int, float]:
+    """Cosine similarity of one profile to every item (by catalogue position) it shares a term with."""
+    by_term = index[f"{kind}_by_term"]
+    out: Dict[int, float] = defaultdict(float)
+    for j, w in weights(index, features).items():
+        lo, hi = by_term.indptr[j], by_term.indptr[j + 1]
+        for pos, v in zip(by_term.indices[lo:hi].tolist(), by_term.data[lo:hi].tolist()):
+            out[pos] += w * v
+    return out
+
+
+def score_matrix(index: Dict, kind: str, features: Sequence[Dict]) -> sparse.csr_matrix:
+    """(profiles x items) cosine similarities for a batch."""
+    rows, cols, data = [], [], []
+    for r, f in enumerate(features):
+        for j, w in weights(index, f).items():
+            rows.append(r)
+            cols.append(j)
+            data.append(w)
+    queries = sparse.csr_matrix((np.asarray(data, dtype=np.float64), (rows, cols)),
+                                shape=(len(features), len(index["vocabulary"])))
+    return (queries @ index[kind].T).tocsr()
+
+
+def percent(score: float) -> int:
+    """Cosine similarity as a 0-100 match percentage."""
+    return int(round(min(score, 1.0) * 100))
+
+
+def main() -> None:
+    t0 = time.perf_counter()
+    index = fit_index(catalogue.current())
+    save_index(index)
+    print(f"✅ Similarity index: {len(index['vocabulary'])} terms, {index['careers'].shape[0]} careers, "
+          f"{index['exams'].shape[0]} exams -> {SIMILARITY_INDEX_PATH} ({time.perf_counter() - t0:.2f}s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
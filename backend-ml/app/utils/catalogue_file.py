@@ -0,0 +1,127 @@
+# app/utils/catalogue_file.py
+"""
+Read-only, memory-mapped catalogue file.
+
+Layout (all integers little-endian):
+
+    b"CTLG0001"                         magic + format version
+    u64  header length
+    header: compact JSON {"meta": {...}, "sections": {name: {"offset", "count", "digest"}}}
+    per section, at its offset:
+        (count + 1) x u64 record offsets, relative to the end of the table
+        the records, each one compact UTF-8 JSON value
+
+The file is mapped, not read: every process (uvicorn workers, parse pool
+workers) shares the same page-cache pages, and a record is only decoded when
+it is accessed. Writers build a new file and os.replace() it over the old one,
+so readers always see a complete file.
+"""
+import hashlib, json, mmap, os, struct
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+
+MAGIC = b"CTLG0001"
+_U64 = struct.Struct("<Q")
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_catalogue(path: str, sections: Dict[str, List[Any]], meta: Optional[Dict] = None) -> None:
+    """Write sections (name -> list of JSON-able records) to path atomically."""
+    blobs: Dict[str, Tuple[np.ndarray, bytes]] = {}
+    for name, records in sections.items():
+        encoded = [_dumps(r) for r in records]
+        offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        blobs[name] = (offsets, b"".join(encoded))
+
+    # header size depends on the offsets it contains: lay out until it settles
+    header: Dict[str, Any] = {"meta": meta or {}, "sections": {}}
+    for name, (offsets, data) in blobs.items():
+        header["sections"][name] = {"offset": 0, "count": len(offsets) - 1,
+                                    "digest": hashlib.blake2b(data, digest_size=8).hexdigest()}
+    while True:
+        raw_header = _dumps(header)
+        pos = len(MAGIC) + _U64.size + len(raw_header)
+        moved = False
+        for name, (offsets, data) in blobs.items():
+            pos += -pos % 8  # offset tables are u64-aligned
+            moved |= header["sections"][name]["offset"] != pos
+            header["sections"][name]["offset"] = pos
+            pos += offsets.nbytes + len(data)
+        if not moved:
+            break
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + _U64.pack(len(raw_header)) + raw_header)
+        for name, (offsets, data) in blobs.items():
+            f.write(b"\0" * (header["sections"][name]["offset"] - f.tell()))
+            f.write(offsets.tobytes())
+            f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Records(Sequence):
+    """Lazily decoded records of one section; each access returns a fresh object."""
+
+    def __init__(self, buf: mmap.mmap, offset: int, count: int):
+        self._buf = buf
+        self._offsets = np.frombuffer(buf, dtype="<u8", count=count + 1, offset=offset)
+        self._base = offset + self._offsets.nbytes
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        lo, hi = int(self._offsets[i]), int(self._offsets[i + 1])
+        return json.loads(self._buf[self._base + lo:self._base + hi])
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class CatalogueFile:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            self.sig = (st.st_ino, st.st_size, st.st_mtime_ns)
+            # the mapping stays valid after the file is replaced or closed
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._buf[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path}: not a catalogue file")
+        (n,) = _U64.unpack_from(self._buf, len(MAGIC))
+        start = len(MAGIC) + _U64.size
+        header = json.loads(self._buf[start:start + n])
+        self.path = path
+        self.meta: Dict[str, Any] = header["meta"]
+        self._sections: Dict[str, Dict] = header["sections"]
+
+    def sections(self) -> List[str]:
+        return list(self._sections)
+
+    def digest(self, name: str) -> str:
+        return self._sections[name]["digest"]
+
+    def records(self, name: str) -> Records:
+        s = self._sections[name]
+        return Records(self._buf, s["offset"], s["count"])
+
+
+def file_sig(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
@@ -1,48 +1,151 @@
 # app/utils/database.py
-import json, os, threading
-from typing import Any, Dict
+import copy, os, threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from app.utils.record_store import RecordStore
+from app.utils.cache import LRUCache
+from app.utils.metrics import stage
 
 # Separate files for clarity
 USER_DB = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "users.json"))
+# where auth_routes used to keep its own copy of the users (backend-ml/users.json)
+LEGACY_AUTH_USER_DB = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "users.json"))
 PROFILE_DB = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "profiles.json"))
+
+# Append-only logs that actually back the stores. The legacy *.json files are
+# imported once, the first time a log is created, and are not written anymore.
+USER_LOG = os.path.splitext(USER_DB)[0] + ".log"
+PROFILE_LOG = os.path.splitext(PROFILE_DB)[0] + ".log"
+
+# fsync every write (survives power loss, costs a disk flush per save)
+DB_FSYNC = os.getenv("DB_FSYNC", "0") == "1"
+
+# read-through cache for get_profile (dashboard loads hit it several times each)
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "2048"))
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "300"))
+_profile_cache = LRUCache(maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL)
+_profile_writes = 0  # bumped by every upsert so a racing miss never caches a stale doc
+_profile_lock = threading.Lock()  # guards _profile_writes together with the cache fill / invalidation
+
+_stores: Dict[str, RecordStore] = {}
 _lock = threading.Lock()
 
-def _read(path: str) -> Dict[str, Any]:
-    if not os.path.exists(path):
-        return {}
-    with open(path, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except Exception:
-            return {}
-
-def _write(path: str, data: Dict[str, Any]) -> None:
-    tmp = path + ".tmp"
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-    os.replace(tmp, path)
-
-# ✅ USER DATA (for login/signup)
+def _store(log_path: str, legacy_paths: List[str],
+           on_change: Optional[Callable[[Set[str]], None]] = None) -> RecordStore:
+    store = _stores.get(log_path)
+    if store is None:
+        with _lock:
+            store = _stores.get(log_path)
+            if store is None:
+                store = RecordStore(log_path, legacy_paths=legacy_paths, fsync=DB_FSYNC)
+                if on_change is not None:
+                    store.on_change(on_change)
+                _stores[log_path] = store
+    return store
+
+def _users() -> RecordStore:
+    # later paths win when both legacy files know the same email
+    return _store(USER_LOG, [USER_DB, LEGACY_AUTH_USER_DB])
+
+def _evict_profiles(keys) -> None:
+    # change feed: profiles another worker rewrote must not be served from our cache
+    global _profile_writes
+    with _profile_lock:
+        _profile_writes += 1
+        for key in keys:
+            _profile_cache.invalidate(key)
+
+def _profiles() -> RecordStore:
+    return _store(PROFILE_LOG, [PROFILE_DB], on_change=_evict_profiles)
+
+# ✅ USER DATA (for login/signup), keyed by email
 def get_user(email: str) -> Dict[str, Any] | None:
-    with _lock:
-        db = _read(USER_DB)
-        return db.get(email)
+    store = _users()
+    store.refresh()  # pick up signups made by other workers
+    return store.get(email)
+
+def user_exists(email: str) -> bool:
+    """Index-only check, no record read."""
+    store = _users()
+    store.refresh()
+    return email in store
+
+def create_user(email: str, doc: Dict[str, Any]) -> bool:
+    """Insert a new user; False if the email is already registered."""
+    store = _users()
+    store.refresh()
+    return store.insert(email, doc)
+
+def update_user(email: str, fn: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]) -> Dict[str, Any] | None:
+    """Atomically apply fn to the stored user and persist the result."""
+    store = _users()
+    store.refresh()
+    return store.update(email, fn)
 
 def upsert_user(email: str, doc: Dict[str, Any]) -> None:
-    with _lock:
-        db = _read(USER_DB)
-        db[email] = doc
-        _write(USER_DB, db)
+    _users().put(email, doc)
 
 # ✅ PROFILE DATA (for skills, academic, resume info)
 def get_profile(user_id: str) -> Dict[str, Any] | None:
-    with _lock:
-        db = _read(PROFILE_DB)
-        return db.get(user_id)
-
-def upsert_profile(user_id: str, doc: Dict[str, Any]) -> None:
-    with _lock:
-        db = _read(PROFILE_DB)
-        db[user_id] = doc
-        _write(PROFILE_DB, db)
+    """Cached profile lookup. Returns a private copy, so callers may modify it."""
+    return get_profile_versioned(user_id)[0]
+
+def get_profile_versioned(user_id: str) -> Tuple[Dict[str, Any] | None, Optional[int]]:
+    """(profile, version) as one cached read; the version is the one If-Match compares against."""
+    with stage("profile_load"):
+        return _get_profile(user_id)
+
+def _get_profile(user_id: str) -> Tuple[Dict[str, Any] | None, Optional[int]]:
+    store = _profiles()
+    store.refresh()  # picks up other workers' writes; on_change evicts their keys from the cache
+
+    entry = _profile_cache.get(user_id)
+    if entry is None:
+        writes = _profile_writes
+        entry = store.get_versioned(user_id)
+        if entry[0] is not None:
+            with _profile_lock:
+                # a write that landed after our read has bumped the counter: don't cache what we read
+                if writes == _profile_writes:
+                    _profile_cache.set(user_id, entry)
+    doc, version = entry
+    # the cached dict must never be mutated by a caller
+    return (copy.deepcopy(doc) if doc is not None else None), version
+
+def _profile_written(user_id: str) -> None:
+    global _profile_writes
+    with _profile_lock:
+        _profile_writes += 1
+        _profile_cache.invalidate(user_id)
+
+def upsert_profile(user_id: str, doc: Dict[str, Any], expected_version: Optional[int] = None) -> int:
+    """Store the profile and return its new version (VersionConflict if expected_version is stale)."""
+    version = _profiles().put(user_id, doc, expected_version)
+    _profile_written(user_id)
+    return version
+
+def update_profile(user_id: str, fn: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+                   expected_version: Optional[int] = None) -> Tuple[Dict[str, Any] | None, Optional[int]]:
+    """Atomic read-modify-write of a stored profile: (new doc, new version); (None, None) if missing."""
+    doc, version = _profiles().update_versioned(user_id, fn, expected_version)
+    if doc is not None:
+        _profile_written(user_id)
+    return doc, version
+
+def profile_version(user_id: str) -> Optional[int]:
+    """Monotonic version of the stored profile (bumped by every write, from any worker)."""
+    store = _profiles()
+    store.refresh()
+    return store.version(user_id)
+
+def profile_cache_stats() -> Dict[str, Any]:
+    return _profile_cache.stats()
+
+def read_profile(user_id: str) -> Dict[str, Any] | None:
+    """Uncached read straight from the store, for bulk jobs that must not churn the LRU."""
+    store = _profiles()
+    store.refresh()
+    return store.get(user_id)
+
+def iter_profiles() -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Stream every stored profile without loading the whole store at once."""
+    return _profiles().items()
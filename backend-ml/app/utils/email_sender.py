@@ -1,17 +1,206 @@
 # app/utils/email_sender.py
+"""
+Background email delivery through the Resend HTTP API.
 
-import os
+send_otp_email() only validates and enqueues; the request returns right away.
+A few worker tasks on the event loop drain the queue through one long-lived
+httpx.AsyncClient (pooled keep-alive connections, so no TLS handshake per
+mail). Network errors, 429 and 5xx are retried with exponential backoff and
+jitter, off the workers, so a slow or failing provider never holds a request
+handler or a delivery slot. Mails that run out of attempts, or are rejected
+outright (other 4xx), go to a dead-letter log (JSON lines, without the body).
+
+RESEND_API_URL can point at a local stand-in server for testing.
+"""
+import asyncio, json, logging, os, random, threading, time
+from typing import Any, Dict, Optional
 import httpx
 from fastapi import HTTPException
 
+log = logging.getLogger(__name__)
+
 RESEND_API_KEY = os.getenv("re_hjdRkSHs_9uxPJDnfwPvbF6EQWUQ2VtsA")
+RESEND_API_URL = os.getenv("RESEND_API_URL", "https://api.resend.com/emails")
+
+EMAIL_QUEUE_SIZE = int(os.getenv("EMAIL_QUEUE_SIZE", "1000"))        # mails waiting for delivery
+EMAIL_CONCURRENCY = int(os.getenv("EMAIL_CONCURRENCY", "4"))         # requests in flight to the provider
+EMAIL_TIMEOUT = float(os.getenv("EMAIL_TIMEOUT", "10"))              # seconds per attempt
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_BACKOFF_BASE = float(os.getenv("EMAIL_BACKOFF_BASE", "1"))     # first retry after ~1s, then 2s, 4s, ...
+EMAIL_BACKOFF_MAX = float(os.getenv("EMAIL_BACKOFF_MAX", "60"))
+EMAIL_DEAD_LETTER_PATH = os.getenv(
+    "EMAIL_DEAD_LETTER_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "email_dead_letter.log"),
+)
+
+
+class EmailQueueFull(Exception):
+    """Too many mails waiting for delivery."""
+
+
+def _retryable(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
+class EmailQueue:
+    def __init__(self, url: str = RESEND_API_URL, api_key: Optional[str] = RESEND_API_KEY,
+                 maxsize: int = EMAIL_QUEUE_SIZE, concurrency: int = EMAIL_CONCURRENCY,
+                 timeout: float = EMAIL_TIMEOUT, max_attempts: int = EMAIL_MAX_ATTEMPTS,
+                 backoff_base: float = EMAIL_BACKOFF_BASE, backoff_max: float = EMAIL_BACKOFF_MAX,
+                 dead_letter_path: str = EMAIL_DEAD_LETTER_PATH):
+        self.url = url
+        self.api_key = api_key
+        self.maxsize = maxsize
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.dead_letter_path = dead_letter_path
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._workers: list = []
+        self._retries: Dict[asyncio.TimerHandle, Dict] = {}   # backoff timer -> mail waiting on it
+        self._dl_lock = threading.Lock()
+        self.sent = self.retried = self.dead = self.rejected = self.in_flight = 0
+
+    # ---------- lifecycle ----------
+    def _start(self) -> asyncio.Queue:
+        """Queue, pooled client and workers are created on first use, on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            )
+            self._workers = [loop.create_task(self._worker()) for _ in range(self.concurrency)]
+            self._retries = {}
+        return self._queue
+
+    async def close(self, drain_timeout: float = 5.0) -> None:
+        """Give queued mails a moment to go out, then stop workers and close the pool."""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), drain_timeout)
+        except asyncio.TimeoutError:
+            log.warning("Email queue closed with mail undelivered", extra={"undelivered": self._queue.qsize()})
+        for handle, job in self._retries.items():
+            handle.cancel()
+            self._dead_letter(job, "shut down while waiting to retry")
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        await self._client.aclose()
+        self._loop, self._queue, self._client, self._workers, self._retries = None, None, None, [], {}
+
+    # ---------- producer ----------
+    def enqueue(self, payload: Dict[str, Any]) -> None:
+        """Queue one Resend payload; raises EmailQueueFull instead of waiting."""
+        job = {"payload": payload, "attempt": 0, "queued_at": time.time()}
+        try:
+            self._start().put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise EmailQueueFull()
+
+    # ---------- delivery ----------
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self.in_flight += 1
+            try:
+                await self._deliver(job)
+            except Exception as e:  # never let one bad mail kill a worker
+                self._dead_letter(job, f"unexpected: {e!r}")
+            finally:
+                self.in_flight -= 1
+                self._queue.task_done()
+
+    async def _deliver(self, job: Dict) -> None:
+        job["attempt"] += 1
+        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+        retry_after = None
+        try:
+            res = await self._client.post(self.url, json=job["payload"], headers=headers)
+        except httpx.HTTPError as e:
+            error = f"{type(e).__name__}: {e}"
+        else:
+            if res.status_code < 400:
+                self.sent += 1
+                log.info("OTP sent", extra={"to": job["payload"]["to"][0], "attempt": job["attempt"]})
+                return
+            error = f"HTTP {res.status_code}: {res.text[:200]}"
+            if not _retryable(res.status_code):
+                self._dead_letter(job, error)
+                return
+            retry_after = res.headers.get("retry-after")
+
+        if job["attempt"] >= self.max_attempts:
+            self._dead_letter(job, error)
+            return
+        self._schedule_retry(job, error, retry_after)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        delay *= random.uniform(0.5, 1.0)  # jitter, so a provider outage doesn't end in a retry stampede
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.backoff_max))
+        return delay
+
+    def _schedule_retry(self, job: Dict, error: str, retry_after: Optional[str]) -> None:
+        # the worker moves on; the mail re-enters the queue after the backoff
+        delay = self._backoff(job["attempt"], retry_after)
+        self.retried += 1
+        log.warning("Email attempt failed, will retry",
+                    extra={"attempt": job["attempt"], "error": error, "retry_in": round(delay, 1)})
+        queue = self._queue
+
+        def _requeue():
+            self._retries.pop(handle, None)
+            try:
+                queue.put_nowait(job)
+            except asyncio.QueueFull:
+                self._dead_letter(job, f"{error}; queue full on retry")
+
+        handle = asyncio.get_running_loop().call_later(delay, _requeue)
+        self._retries[handle] = job
+
+    def _dead_letter(self, job: Dict, error: str) -> None:
+        self.dead += 1
+        payload = job["payload"]
+        # who / what / why, never the body: it carries the OTP
+        entry = {"ts": time.time(), "queued_at": job["queued_at"], "to": payload.get("to"),
+                 "subject": payload.get("subject"), "attempts": job["attempt"], "error": error}
+        log.error("Email sending failed for good", extra={"attempts": job["attempt"], "error": error})
+        try:
+            with self._dl_lock, open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            log.error("Could not write email dead letter: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": self.in_flight,
+            "retry_pending": len(self._retries),
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead_lettered": self.dead,
+            "rejected": self.rejected,
+        }
+
+
+email_queue = EmailQueue()
+
 
 async def send_otp_email(email: str, otp: str):
     if not RESEND_API_KEY:
         raise HTTPException(status_code=500, detail="Missing RESEND_API_KEY")
 
-    url = "https://api.resend.com/emails"
-
     html = f"""
     <p>Your Careerise OTP is:</p>
     <h2>{otp}</h2>
@@ -25,23 +214,9 @@ async def send_otp_email(email: str, otp: str):
         "html": html
     }
 
-    headers = {
-        "Authorization": f"Bearer {RESEND_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
+    # delivery (and retries) happen in the background
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            res = await client.post(url, json=payload, headers=headers)
-
-        print("📨 RESEND RESPONSE:", res.text)
-
-        if res.status_code >= 400:
-            raise HTTPException(status_code=500, detail=f"Resend error: {res.text}")
-
-        print(f"📨 OTP sent successfully to {email}")
-        return True
-
-    except Exception as e:
-        print("❌ Email sending failed:", e)
-        raise HTTPException(status_code=500, detail=str(e))
+        email_queue.enqueue(payload)
+    except EmailQueueFull:
+        raise HTTPException(status_code=503, detail="Email service busy, please try again shortly")
+    return True
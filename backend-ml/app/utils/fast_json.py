@@ -0,0 +1,62 @@
+# app/utils/fast_json.py
+"""
+One JSON encoder for responses, cached results and the record stores.
+
+Output is always compact (no indent, no spaces after separators, UTF-8 rather
+than \\u escapes). With FAST_JSON=1 and orjson installed it is produced by
+orjson, which is several times faster than the stdlib encoder and returns
+bytes directly; otherwise the stdlib json module produces the same JSON.
+Anything orjson refuses (ints beyond 64 bits, ...) falls back to the stdlib.
+
+    body = fast_json.dumps(obj)              # bytes
+    return fast_json.json_response(obj)      # Response, skipping jsonable_encoder
+
+FastJSONResponse is the app's default response class, so routes that return
+plain dicts are rendered by the same encoder (after FastAPI's
+jsonable_encoder). Routes whose result is already JSON-native (store docs,
+cached results) return json_response() / pre-encoded bytes and skip that
+walk entirely.
+"""
+import json, os
+from typing import Any, Dict, Optional
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder gives the same JSON
+    orjson = None
+
+FAST_JSON = os.getenv("FAST_JSON", "0") == "1"
+
+ENGINE = "orjson" if FAST_JSON and orjson is not None else "json"
+
+if ENGINE == "orjson":
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=_OPTIONS)
+        except TypeError:
+            return _std_dumps(obj)
+
+    loads = orjson.loads
+else:
+    def dumps(obj: Any) -> bytes:
+        return _std_dumps(obj)
+
+    loads = json.loads
+
+
+def _std_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Already JSON-native content (dicts / lists / str / numbers), encoded once."""
+    return Response(content=dumps(content), status_code=status_code, headers=headers,
+                    media_type="application/json")
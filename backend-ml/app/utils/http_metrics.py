@@ -0,0 +1,67 @@
+# app/utils/http_metrics.py
+"""
+ASGI middleware recording per-route request metrics:
+
+    http_requests_total{method,route,status}
+    http_request_duration_seconds{method,route}     (histogram, until the last body byte)
+    http_requests_in_flight{method}
+
+`route` is the path template ("/recommend/careers/{user_id}"), never the raw
+path, so user ids don't blow up the number of series. It is the matched
+route's path_format. Newer FastAPI leaves the router's own, unprefixed route
+in scope["route"] for included routers ("/{user_id}"), and keeps the
+prefixed one in scope["fastapi"]["effective_route_context"], so that one is
+read first. Endpoints without a route object (/docs) have fixed paths and are
+labelled by path. Requests with a path parameter but no template, and
+requests no route matched, are grouped under "<unmatched>".
+"""
+import time
+from typing import Any, Dict
+from app.utils import metrics
+
+REQUESTS = metrics.counter("http_requests_total", "HTTP requests served", ("method", "route", "status"))
+DURATION = metrics.histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+IN_FLIGHT = metrics.gauge("http_requests_in_flight", "HTTP requests being served", ("method",))
+
+UNMATCHED = "<unmatched>"
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Path template of the matched route: /exams/u123 -> /exams/{user_id}"""
+    effective = (scope.get("fastapi") or {}).get("effective_route_context")
+    template = getattr(effective, "path_format", None) or getattr(scope.get("route"), "path_format", None)
+    if template:
+        return template
+    if "endpoint" in scope and not scope.get("path_params"):
+        return scope["path"]
+    return UNMATCHED
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status = 500  # if the app dies before responding
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc((method,))
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - t0
+            IN_FLIGHT.dec((method,))
+            # routing has filled in the scope by now
+            route = route_template(scope)
+            DURATION.observe((method, route), elapsed)
+            REQUESTS.inc((method, route, str(status)))
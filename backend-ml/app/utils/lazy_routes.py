@@ -0,0 +1,95 @@
+# app/utils/lazy_routes.py
+"""
+Routers included on first use (STARTUP_MODE=lazy).
+
+The route modules drag in most of the app's import time: httpx for the OTP
+mailer, numpy / scipy and the compiled catalogue for the recommenders. In
+lazy mode none of them is imported at startup. The first request under a
+router's prefix imports its module (in a thread, so the loop keeps serving
+other requests) and includes the router, then routing carries on as usual.
+/docs and /openapi.json load every router first so the schema is complete.
+load_all() is what the background warm-up calls after startup.
+
+    routers = LazyRouters(app, lazy=True)
+    routers.add("app.routes.exam_routes", ("/exams", ["Exams"]), ("/recommend/exams", ["Exams"]))
+
+In eager mode (the default) add() imports and includes right away.
+"""
+import asyncio, importlib, logging, time
+from typing import Dict, List, Sequence, Tuple
+from fastapi import FastAPI
+
+log = logging.getLogger(__name__)
+
+Mount = Tuple[str, Sequence[str]]  # (prefix, tags)
+
+
+class LazyRouters:
+    def __init__(self, app: FastAPI, lazy: bool = False):
+        self.app = app
+        self.lazy = lazy
+        self._mounts: Dict[str, Tuple[Mount, ...]] = {}
+        self._loaded: Dict[str, float] = {}  # module -> import ms
+        if lazy:
+            # added first = innermost, so request metrics include the import
+            app.add_middleware(LazyRoutesMiddleware, routers=self)
+
+    def add(self, module: str, *mounts: Mount) -> None:
+        self._mounts[module] = mounts
+        if not self.lazy:
+            t0 = time.perf_counter()
+            self._include(module, self._import(module), (time.perf_counter() - t0) * 1000)
+
+    def pending(self, path: str) -> List[str]:
+        """Modules not loaded yet that serve this path."""
+        if path in (self.app.openapi_url, self.app.docs_url, self.app.redoc_url):
+            return [m for m in self._mounts if m not in self._loaded]
+        return [m for m, mounts in self._mounts.items() if m not in self._loaded
+                and any(path == prefix or path.startswith(prefix + "/") for prefix, _ in mounts)]
+
+    async def load(self, modules: Sequence[str]) -> None:
+        for module in modules:
+            if module in self._loaded:
+                continue
+            t0 = time.perf_counter()
+            mod = await asyncio.to_thread(self._import, module)
+            # including happens on the loop thread: routes never change under a request being matched
+            self._include(module, mod, (time.perf_counter() - t0) * 1000)
+
+    async def load_all(self) -> None:
+        await self.load(list(self._mounts))
+
+    def _import(self, module: str):
+        return importlib.import_module(module)
+
+    def _include(self, module: str, mod, ms: float = 0.0) -> None:
+        if module in self._loaded:  # two first requests raced; the second import was a no-op
+            return
+        for prefix, tags in self._mounts[module]:
+            self.app.include_router(mod.router, prefix=prefix, tags=list(tags))
+        self._loaded[module] = round(ms, 1)
+        self.app.openapi_schema = None
+        if self.lazy:
+            log.info("router loaded", extra={"router": module, "ms": self._loaded[module]})
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "lazy": self.lazy,
+            "loaded": dict(self._loaded),
+            "pending": [m for m in self._mounts if m not in self._loaded],
+        }
+
+
+class LazyRoutesMiddleware:
+    """Pure ASGI: load the routers a request needs before it is routed."""
+
+    def __init__(self, app, routers: LazyRouters):
+        self.app = app
+        self.routers = routers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            pending = self.routers.pending(scope["path"])
+            if pending:
+                await self.routers.load(pending)
+        await self.app(scope, receive, send)
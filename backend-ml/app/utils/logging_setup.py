@@ -0,0 +1,77 @@
+# app/utils/logging_setup.py
+"""
+Leveled, structured logging for the app (replaces the old print() calls).
+
+    log = logging.getLogger(__name__)
+    log.warning("Email attempt failed", extra={"attempt": 2, "error": "HTTP 503"})
+
+Records are handed to a QueueHandler and written by a QueueListener thread, so
+an async handler never blocks on a slow stdout / log pipe. LOG_FORMAT=json
+emits one JSON object per line (extra= fields included); "text" is for local
+runs. Forked children (the resume parse pool) log straight to stderr, since
+the listener thread does not survive a fork.
+"""
+import atexit, json, logging, logging.handlers, os, queue, sys, time
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")   # json | text
+
+# attributes every LogRecord has; anything else came in through extra=
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _stream_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stderr)
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s"))
+    return handler
+
+
+def _after_fork_in_child() -> None:
+    global _listener
+    _listener = None
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(_stream_handler())
+
+
+def setup_logging() -> None:
+    """Idempotent; called once from app.main."""
+    global _listener
+    if _listener is not None:
+        return
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(q, _stream_handler(), respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)   # flushes what is still queued
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(logging.handlers.QueueHandler(q))
+    # httpx logs every request at INFO, including each OTP mail sent
+    logging.getLogger("httpx").setLevel(max(root.level, logging.WARNING))
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_after_fork_in_child)
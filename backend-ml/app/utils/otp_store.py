@@ -0,0 +1,172 @@
+# app/utils/otp_store.py
+"""
+In-memory OTP store with per-key expiry.
+
+Codes live in a dict (O(1) issue / check / consume); a min-heap of expiry
+times lets a background sweeper evict stale codes without scanning every key.
+If OTP_SNAPSHOT_PATH is set, live codes are periodically written there and
+reloaded on start, so a restart doesn't invalidate codes already emailed.
+
+With OTP_STORE_PATH set, codes live in a shared record store instead, so
+with several uvicorn workers a code issued by one worker can be verified /
+consumed by another; consume() is atomic across processes. That costs a file
+lock and an append per issue / consume, so it is only the default when
+WEB_CONCURRENCY > 1 (app/data/otps.log); a single worker keeps the dict and
+does no disk I/O. Set OTP_STORE_PATH="" to force the dict.
+"""
+import atexit, heapq, json, os, threading, time
+from typing import Dict, List, Optional, Tuple
+from app.utils.record_store import RecordStore
+
+OTP_TTL = int(os.getenv("OTP_TTL", "300"))  # seconds
+OTP_SNAPSHOT_PATH = os.getenv("OTP_SNAPSHOT_PATH", "")
+OTP_SWEEP_INTERVAL = float(os.getenv("OTP_SWEEP_INTERVAL", "30"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+# shared store only when asked for, or when several workers must see the same codes
+OTP_STORE_PATH = os.getenv(
+    "OTP_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "otps.log") if WEB_CONCURRENCY > 1 else "",
+)
+
+# check() / consume() results
+OK, MISSING, EXPIRED, MISMATCH = "ok", "missing", "expired", "mismatch"
+
+
+class OTPStore:
+    def __init__(self, ttl: int = OTP_TTL, snapshot_path: str = "", sweep_interval: float = OTP_SWEEP_INTERVAL,
+                 store_path: str = ""):
+        self.ttl = ttl
+        # a shared store is already durable; snapshots are only for the in-process dict
+        self._store: Optional[RecordStore] = RecordStore(store_path) if store_path else None
+        self.snapshot_path = "" if self._store is not None else snapshot_path
+        self.sweep_interval = sweep_interval
+        self._codes: Dict[str, Tuple[str, float]] = {}   # key -> (code, expires_at)
+        self._heap: List[Tuple[float, str]] = []          # (expires_at, key); may hold stale entries
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        if self.snapshot_path:
+            self._load_snapshot()
+            atexit.register(self.snapshot)
+
+    # ---------- hot path ----------
+    def issue(self, key: str, code: str, ttl: Optional[int] = None) -> None:
+        expires = time.time() + (ttl or self.ttl)
+        if self._store is not None:
+            self._store.put(key, {"code": code, "exp": expires})
+            self._ensure_sweeper()
+            return
+        with self._lock:
+            self._codes[key] = (code, expires)
+            heapq.heappush(self._heap, (expires, key))
+            self._dirty = True
+        self._ensure_sweeper()
+
+    def check(self, key: str, code: str) -> str:
+        if self._store is not None:
+            self._store.refresh()
+            return self._status(self._shared_entry(self._store.get(key)), code)
+        with self._lock:
+            return self._status(self._codes.get(key), code)
+
+    def consume(self, key: str, code: str) -> str:
+        """Like check(), but a matching code is removed so it can't be reused."""
+        if self._store is not None:
+            now = time.time()
+            doc = self._store.delete_if(key, lambda d: d["code"] == code and d["exp"] >= now)
+            return self._status(self._shared_entry(doc), code, now)
+        with self._lock:
+            status = self._status(self._codes.get(key), code)
+            if status == OK:
+                del self._codes[key]
+                self._dirty = True
+            return status
+
+    @staticmethod
+    def _shared_entry(doc: Optional[Dict]) -> Optional[Tuple[str, float]]:
+        return (doc["code"], doc["exp"]) if doc is not None else None
+
+    @staticmethod
+    def _status(entry: Optional[Tuple[str, float]], code: str, now: Optional[float] = None) -> str:
+        if entry is None:
+            return MISSING
+        if entry[1] < (now if now is not None else time.time()):
+            return EXPIRED
+        return OK if entry[0] == code else MISMATCH
+
+    def __len__(self) -> int:
+        return len(self._store) if self._store is not None else len(self._codes)
+
+    # ---------- expiry ----------
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop every code that has expired; returns how many were removed."""
+        now = now if now is not None else time.time()
+        removed = 0
+        if self._store is not None:
+            self._store.refresh()
+            for key in self._store.keys():
+                # re-checked under the store's lock: the code may have been re-issued meanwhile
+                doc = self._store.delete_if(key, lambda d: d["exp"] <= now)
+                if doc is not None and doc["exp"] <= now:
+                    removed += 1
+            return removed
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires, key = heapq.heappop(self._heap)
+                entry = self._codes.get(key)
+                # a re-issued code leaves its old heap entry behind; skip those
+                if entry is not None and entry[1] == expires:
+                    del self._codes[key]
+                    removed += 1
+            if removed:
+                self._dirty = True
+        return removed
+
+    def _ensure_sweeper(self) -> None:
+        if self._sweeper is not None:
+            return
+        with self._lock:
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(target=self._run_sweeper, name="otp-sweeper", daemon=True)
+                self._sweeper.start()
+
+    def _run_sweeper(self) -> None:
+        while not self._stop.wait(self.sweep_interval):
+            self.sweep()
+            if self.snapshot_path and self._dirty:
+                self.snapshot()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ---------- snapshots ----------
+    def snapshot(self) -> None:
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            data = {k: [code, exp] for k, (code, exp) in self._codes.items()}
+            self._dirty = False
+        tmp = self.snapshot_path + ".tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(self.snapshot_path)), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.snapshot_path)
+
+    def _load_snapshot(self) -> None:
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, (code, expires) in data.items():
+            if expires > now:
+                self._codes[key] = (code, expires)
+                self._heap.append((expires, key))
+        heapq.heapify(self._heap)
+        if self._codes:
+            self._ensure_sweeper()
+
+
+otp_store = OTPStore(snapshot_path=OTP_SNAPSHOT_PATH, store_path=OTP_STORE_PATH)
@@ -0,0 +1,236 @@
+# app/utils/passwords.py
+"""
+Password hashing with scrypt (memory-hard), off the event loop.
+
+Hashes are stored as
+
+    scrypt$<log2 n>$<r>$<p>$<salt b64>$<key b64>
+
+so the cost travels with each hash and old hashes keep verifying after the
+cost goes up. hashlib.scrypt releases the GIL, so a small thread pool gives
+real parallelism; at most `workers + queue_depth` hashes are admitted at once
+and anything beyond that is rejected (the route answers 503) rather than
+queueing logins behind each other.
+
+The cost n is calibrated once per process: the smallest power of two (within
+PASSWORD_SCRYPT_MIN/MAX_LOG_N) whose hash takes PASSWORD_HASH_TARGET_MS on
+this machine. Pin it with PASSWORD_SCRYPT_LOG_N to skip calibration.
+
+Each hash holds 128 * r * n bytes while it runs, and `workers` of them run at
+once. PASSWORD_HASH_MAX_MEM (MiB, 0 = no limit) bounds that total: the cost
+calibration may pick is capped to fit, and if even the minimum (or pinned)
+cost doesn't fit, fewer hashes run at once.
+
+Users still carrying a plaintext "password" are verified once the old way and
+rehashed on that login (check_user returns the new hash to store); the same
+happens to hashes made with a lower cost than the current one.
+"""
+import asyncio, base64, hashlib, hmac, os, secrets, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "32"))           # hashes allowed to wait for a thread
+PASSWORD_HASH_TARGET_MS = float(os.getenv("PASSWORD_HASH_TARGET_MS", "50"))  # calibration target per hash
+PASSWORD_SCRYPT_MIN_LOG_N = int(os.getenv("PASSWORD_SCRYPT_MIN_LOG_N", "14"))
+PASSWORD_SCRYPT_MAX_LOG_N = int(os.getenv("PASSWORD_SCRYPT_MAX_LOG_N", "20"))
+PASSWORD_SCRYPT_LOG_N = os.getenv("PASSWORD_SCRYPT_LOG_N")                  # fixed cost, no calibration
+PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+PASSWORD_HASH_MAX_MEM = int(os.getenv("PASSWORD_HASH_MAX_MEM", "64"))        # MiB for all concurrent hashes
+
+_PREFIX = "scrypt"
+_SALT_BYTES = 16
+_KEY_BYTES = 32
+
+
+class HasherBusy(Exception):
+    """Every hashing thread is busy and the wait queue is full."""
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _unb64(s: str) -> bytes:
+    return base64.b64decode(s + "=" * (-len(s) % 4))
+
+
+def _mem(log_n: int, r: int) -> int:
+    """Bytes of scrypt's working array (what the memory budget counts per hash)."""
+    return 128 * r * (1 << log_n)
+
+
+def _scrypt(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=1 << log_n, r=r, p=p,
+                          maxmem=_mem(log_n, r) + 128 * r * (p + 2), dklen=_KEY_BYTES)
+
+
+def _parse(encoded: str) -> Optional[Tuple[int, int, int, bytes, bytes]]:
+    parts = encoded.split("$")
+    if len(parts) != 6 or parts[0] != _PREFIX:
+        return None
+    try:
+        return int(parts[1]), int(parts[2]), int(parts[3]), _unb64(parts[4]), _unb64(parts[5])
+    except ValueError:
+        return None
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue_depth: int = PASSWORD_HASH_QUEUE,
+                 target_ms: float = PASSWORD_HASH_TARGET_MS, min_log_n: int = PASSWORD_SCRYPT_MIN_LOG_N,
+                 max_log_n: int = PASSWORD_SCRYPT_MAX_LOG_N, r: int = PASSWORD_SCRYPT_R, p: int = PASSWORD_SCRYPT_P,
+                 log_n: Optional[int] = int(PASSWORD_SCRYPT_LOG_N) if PASSWORD_SCRYPT_LOG_N else None,
+                 max_mem_mb: int = PASSWORD_HASH_MAX_MEM):
+        self.queue_depth = max(0, queue_depth)
+        self.target_ms = target_ms
+        self.min_log_n = min_log_n
+        self.max_log_n = max(min_log_n, max_log_n)
+        self.r = r
+        self.p = p
+        self._log_n = log_n
+        self.max_mem = max(0, max_mem_mb) * 1024 * 1024
+        self.workers, self.max_log_n = self._fit_memory(max(1, workers))
+        self._calibrated_ms: Optional[float] = None
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_depth)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._calibration_lock = threading.Lock()
+        self._dummy_hash: Optional[str] = None
+        self.hashed = self.verified = self.rehashed = self.rejected = self.in_flight = 0
+
+    # ---------- cost ----------
+    def _fit_memory(self, workers: int) -> Tuple[int, int]:
+        """(workers, max log2(n)) so that `workers` concurrent hashes stay within max_mem."""
+        if not self.max_mem:
+            return workers, self.max_log_n
+        floor = self._log_n if self._log_n is not None else self.min_log_n
+        workers = max(1, min(workers, self.max_mem // _mem(floor, self.r)))
+        log_n = self.max_log_n
+        while log_n > self.min_log_n and workers * _mem(log_n, self.r) > self.max_mem:
+            log_n -= 1
+        return workers, log_n
+
+    def calibrate(self) -> int:
+        """Pick log2(n) for the target latency on this machine (once; pinned values are kept)."""
+        with self._calibration_lock:
+            if self._log_n is not None:
+                return self._log_n
+            salt = secrets.token_bytes(_SALT_BYTES)
+            log_n = self.min_log_n
+            while True:
+                t0 = time.perf_counter()
+                _scrypt("calibration", salt, log_n, self.r, self.p)
+                ms = (time.perf_counter() - t0) * 1000
+                # scrypt time is linear in n: stop when the next doubling overshoots more than this one undershoots
+                if log_n >= self.max_log_n or ms * 2 - self.target_ms > self.target_ms - ms:
+                    break
+                log_n += 1
+            self._log_n, self._calibrated_ms = log_n, round(ms, 1)
+            return log_n
+
+    @property
+    def log_n(self) -> int:
+        return self._log_n if self._log_n is not None else self.calibrate()
+
+    # ---------- blocking primitives (run in the pool) ----------
+    def hash_sync(self, password: str) -> str:
+        log_n, salt = self.log_n, secrets.token_bytes(_SALT_BYTES)
+        key = _scrypt(password, salt, log_n, self.r, self.p)
+        self.hashed += 1
+        return f"{_PREFIX}${log_n}${self.r}${self.p}${_b64(salt)}${_b64(key)}"
+
+    def verify_sync(self, password: str, encoded: str) -> bool:
+        parsed = _parse(encoded)
+        if parsed is None:
+            return False
+        log_n, r, p, salt, key = parsed
+        self.verified += 1
+        return hmac.compare_digest(_scrypt(password, salt, log_n, r, p), key)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        parsed = _parse(encoded)
+        # only upgrade: workers that calibrated a notch apart must not flip-flop a hash
+        return parsed is None or parsed[0] < self.log_n or parsed[1:3] != (self.r, self.p)
+
+    # ---------- async API ----------
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def _release(self, _fut) -> None:
+        self.in_flight -= 1
+        self._slots.release()
+
+    async def _run(self, fn: Callable, *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HasherBusy()
+        self.in_flight += 1
+        try:
+            fut = self._pool().submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        fut.add_done_callback(self._release)
+        return await asyncio.wrap_future(fut)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.hash_sync, password)
+
+    async def verify(self, password: str, encoded: str) -> bool:
+        return await self._run(self.verify_sync, password, encoded)
+
+    async def check_user(self, user: Optional[Dict[str, Any]], password: str) -> Tuple[bool, Optional[str]]:
+        """(password ok, new hash to store or None) for a stored user doc (None = unknown user)."""
+        if self._log_n is None:
+            await self._run(self.calibrate)  # normally done at startup
+        if user is None:
+            # same work as a real check, so response time doesn't reveal which emails exist
+            if self._dummy_hash is None:
+                self._dummy_hash = await self.hash(secrets.token_hex(8))
+            await self.verify(password, self._dummy_hash)
+            return False, None
+        encoded = user.get("password_hash")
+        if encoded:
+            if not await self.verify(password, encoded):
+                return False, None
+            if not self.needs_rehash(encoded):
+                return True, None
+        else:
+            # legacy plaintext record
+            legacy = user.get("password")
+            if not isinstance(legacy, str) or not hmac.compare_digest(legacy.encode("utf-8"), password.encode("utf-8")):
+                return False, None
+        self.rehashed += 1
+        return True, await self.hash(password)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "log_n": self._log_n,
+            "r": self.r,
+            "p": self.p,
+            "calibrated_ms": self._calibrated_ms,
+            "max_log_n": self.max_log_n,
+            "mem_per_hash_mb": round(_mem(self._log_n or self.max_log_n, self.r) / 2**20, 1),
+            "max_mem_mb": self.max_mem // 2**20,
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "hashed": self.hashed,
+            "verified": self.verified,
+            "rehashed": self.rehashed,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher()
+
+
+def set_password(user: Dict[str, Any], encoded: str) -> Dict[str, Any]:
+    """Store a hash on a user doc, dropping any legacy plaintext."""
+    user["password_hash"] = encoded
+    user.pop("password", None)
+    return user
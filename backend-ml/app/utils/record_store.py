@@ -0,0 +1,450 @@
+# app/utils/record_store.py
+"""
+Append-only key/value record log with an in-memory offset index.
+
+Every write appends one line to the log:
+
+    <crc32 hex> <compact json>\n
+
+where the JSON is {"k": key, "v": doc, "n": seq} (or {"k": key, "d": 1, "n": seq}
+for a delete). The index maps key -> (offset, length, seq) of its latest
+record, so a read is a single positioned read of that record and a write is a
+single append, independent of how many records the store holds.
+
+Several processes (uvicorn --workers N) can share one log. Writers take an
+exclusive flock on <log>.lock, catch their index up to the end of the file
+(picking up other workers' records, or a log another worker compacted) and
+only then append, so `seq` grows by one per write across all processes: a
+key's seq is its version, and the store's seq tells whether anything changed.
+put() / update_versioned() take an expected_version and refuse (VersionConflict)
+if the key moved on, checked under the same lock as the append.
+Readers take no file lock; refresh() compares the file's inode / size / mtime
+with what this process last saw and indexes only what is new. Keys changed by
+other processes are passed to on_change() listeners (the change feed that
+keeps per-worker caches fresh).
+
+Superseded records are garbage; once they outweigh the live data a background
+thread rewrites the live records into a fresh log and swaps it in atomically.
+On open the log is scanned once to rebuild the index and any torn / corrupt
+tail left by a crash is truncated away. Without fcntl (Windows) the file lock
+is a no-op and the store is safe for one process only.
+"""
+import glob, json, logging, os, threading, zlib
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from app.utils import fast_json
+from app.utils.metrics import stage
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+_HEADER_LEN = 9  # 8 hex digits of crc32 + one space
+COMPACT_MIN_BYTES = 1 << 20  # don't bother compacting tiny logs
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def _encode(rec: Dict[str, Any]) -> bytes:
+    body = fast_json.dumps(rec)
+    return b"%08x " % zlib.crc32(body) + body + b"\n"
+
+
+def _decode(line: bytes) -> Optional[Dict[str, Any]]:
+    """Parse one full log line (including the trailing newline); None if corrupt."""
+    if len(line) <= _HEADER_LEN or not line.endswith(b"\n"):
+        return None
+    body = line[_HEADER_LEN:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(body):
+            return None
+        rec = fast_json.loads(body)
+    except ValueError:
+        return None
+    return rec if isinstance(rec, dict) and "k" in rec else None
+
+
+class VersionConflict(Exception):
+    """A conditional write found the key at another version than the caller expected."""
+
+    def __init__(self, key: str, current: Optional[int]):
+        super().__init__(f"{key!r} is at version {current}")
+        self.key = key
+        self.current = current  # None: the key doesn't exist
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # exists, owned by someone else
+    return True
+
+
+class RecordStore:
+    def __init__(self, path: str, legacy_paths: Optional[List[str]] = None, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._index: Dict[str, Tuple[int, int, int]] = {}
+        self._end = 0          # byte offset of the end of the last good record
+        self._dead = 0         # bytes held by superseded / deleted records
+        self.seq = 0           # highest record sequence number seen (records written before versions: 0)
+        self._compacting = False
+        self._compact_lock = threading.Lock()
+        self._listeners: List[Callable[[Set[str]], None]] = []
+        self._flock_depth = 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock_fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT | _O_BINARY, 0o644)
+        with self._lock, self._file_lock():
+            self._remove_stale_compactions()
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND | _O_BINARY, 0o644)
+            # under the file lock: a short tail here is a crash leftover, not another worker mid-write
+            self._recover(truncate=True)
+            if not self._index and self._end == 0 and legacy_paths:
+                self._import_legacy(legacy_paths)
+            self._sig = self._stat_sig()
+
+    # ---------- cross-process locking ----------
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive flock shared by every process using this log (re-entrant per store)."""
+        if self._flock_depth == 0 and fcntl is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        self._flock_depth += 1
+        try:
+            yield
+        finally:
+            self._flock_depth -= 1
+            if self._flock_depth == 0 and fcntl is not None:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _writing(self):
+        """Thread lock + file lock, with the index caught up to the end of the log."""
+        changed: Set[str] = set()
+        try:
+            with self._lock, self._file_lock():
+                if self._flock_depth == 1:
+                    changed = self._sync()
+                yield
+        finally:
+            self._notify(changed)
+
+    def _remove_stale_compactions(self) -> None:
+        for tmp in glob.glob(glob.escape(self.path) + ".compact*"):
+            pid = tmp.rsplit(".", 1)[-1]
+            # a live worker may be compacting right now; only clear up after dead ones
+            if not pid.isdigit() or not _pid_alive(int(pid)):
+                os.remove(tmp)
+
+    # ---------- open / recovery ----------
+    def _recover(self, truncate: bool = False) -> None:
+        self._index.clear()
+        self._dead = 0
+        self._end = self._scan(0)
+        size = os.fstat(self._fd).st_size
+        if truncate and size > self._end:
+            log.warning("Dropping corrupt trailing bytes", extra={"store": os.path.basename(self.path), "bytes": size - self._end})
+            os.ftruncate(self._fd, self._end)
+
+    def _scan(self, start: int, touched: Optional[Set[str]] = None) -> int:
+        """Index records from byte `start` until EOF or the first bad record;
+        returns the offset just past the last good record."""
+        pos = start
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                rec = _decode(line)
+                if rec is None:
+                    break
+                self._apply(rec, pos, len(line))
+                if touched is not None:
+                    touched.add(rec["k"])
+                pos += len(line)
+        return pos
+
+    def _apply(self, rec: Dict[str, Any], offset: int, length: int) -> None:
+        key = rec["k"]
+        seq = rec.get("n", 0)
+        if seq > self.seq:
+            self.seq = seq
+        old = self._index.pop(key, None)
+        if old is not None:
+            self._dead += old[1]
+        if rec.get("d"):
+            self._dead += length
+        else:
+            self._index[key] = (offset, length, seq)
+
+    def _import_legacy(self, paths: List[str]) -> None:
+        merged: Dict[str, Any] = {}
+        for p in paths:
+            if not os.path.exists(p):
+                continue
+            try:
+                with open(p, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception:
+                continue
+            if isinstance(data, dict):
+                merged.update(data)
+        if not merged:
+            return
+        with self._lock:
+            for key, doc in merged.items():
+                self._append({"k": key, "v": doc})
+            os.fsync(self._fd)
+
+    def _stat_sig(self) -> Tuple[int, int, int]:
+        st = os.fstat(self._fd)
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    # ---------- change feed ----------
+    def on_change(self, fn: Callable[[Set[str]], None]) -> None:
+        """Call fn(keys) whenever records written by another process are picked up."""
+        self._listeners.append(fn)
+
+    def _notify(self, changed: Set[str]) -> None:
+        if changed:
+            for fn in self._listeners:
+                fn(changed)
+
+    def _sync(self) -> Set[str]:
+        """Index whatever other processes wrote since we last looked (caller holds self._lock)."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return set()
+        if (st.st_ino, st.st_size, st.st_mtime_ns) == self._sig:
+            return set()
+        ino, size, _ = self._sig
+        if st.st_ino == ino and st.st_size >= size:
+            # another writer appended records: index just the new tail
+            changed: Set[str] = set()
+            self._end = self._scan(self._end, changed)
+        else:
+            # the log was replaced (compacted elsewhere): rebuild from scratch
+            changed = set(self._index)
+            os.close(self._fd)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND | _O_BINARY)
+            self._recover()
+            changed |= set(self._index)
+        self._sig = self._stat_sig()
+        return changed
+
+    def refresh(self) -> Set[str]:
+        """Sync the index with changes made to the log by other processes.
+
+        Returns the keys whose records may have changed (empty if the file is
+        exactly as this process last left it).
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return set()
+        if (st.st_ino, st.st_size, st.st_mtime_ns) == self._sig:
+            return set()
+        with self._lock:
+            changed = self._sync()
+        self._notify(changed)
+        return changed
+
+    # ---------- low level I/O ----------
+    def _append(self, rec: Dict[str, Any]) -> int:
+        # callers hold the file lock and are caught up, so self.seq is the global latest
+        rec["n"] = self.seq + 1
+        line = _encode(rec)
+        with stage("storage_write"):
+            os.write(self._fd, line)
+            if self.fsync:
+                os.fsync(self._fd)
+        self._apply(rec, self._end, len(line))
+        self._end += len(line)
+        self._sig = self._stat_sig()
+        self._maybe_compact()
+        return rec["n"]
+
+    def _pread(self, offset: int, length: int) -> bytes:
+        if hasattr(os, "pread"):
+            return os.pread(self._fd, length, offset)
+        os.lseek(self._fd, offset, os.SEEK_SET)  # caller holds the lock
+        return os.read(self._fd, length)
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        loc = self._index.get(key)
+        if loc is None:
+            return None
+        rec = _decode(self._pread(loc[0], loc[1]))
+        return rec.get("v") if rec else None
+
+    # ---------- public API ----------
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._load(key)
+
+    def get_versioned(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """(doc, version) read together, so the version is the one that doc was written with."""
+        with self._lock:
+            return self._load(key), self.version(key)
+
+    def version(self, key: str) -> Optional[int]:
+        """Sequence number of the key's latest write (0 for records from before versions), None if absent."""
+        loc = self._index.get(key)
+        return loc[2] if loc is not None else None
+
+    def _expect(self, key: str, expected_version: Optional[int]) -> None:
+        # caller holds _writing(), so nobody can write the key between this check and the append
+        if expected_version is not None and self.version(key) != expected_version:
+            raise VersionConflict(key, self.version(key))
+
+    def put(self, key: str, doc: Dict[str, Any], expected_version: Optional[int] = None) -> int:
+        """Write `doc` and return its version. With expected_version the write only
+        happens if the key is still at that version (VersionConflict otherwise)."""
+        with self._writing():
+            self._expect(key, expected_version)
+            return self._append({"k": key, "v": doc})
+
+    def insert(self, key: str, doc: Dict[str, Any]) -> bool:
+        """Write `doc` only if `key` is absent; False if it already exists."""
+        with self._writing():
+            if key in self._index:
+                return False
+            self._append({"k": key, "v": doc})
+            return True
+
+    def update(self, key: str, fn: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Atomic read-modify-write (across processes too): store fn(current doc) and return it.
+
+        Nothing is written if the key is missing or fn returns None.
+        """
+        return self.update_versioned(key, fn)[0]
+
+    def update_versioned(self, key: str, fn: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+                         expected_version: Optional[int] = None) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """update() that also returns the key's version afterwards: (doc, version).
+
+        With expected_version, fn only runs if the key is still at that version
+        (VersionConflict otherwise); (None, None) if the key is missing.
+        """
+        with self._writing():
+            doc = self._load(key)
+            if doc is None:
+                return None, None
+            self._expect(key, expected_version)
+            doc = fn(doc)
+            if doc is None:
+                return None, self.version(key)
+            return doc, self._append({"k": key, "v": doc})
+
+    def delete(self, key: str) -> bool:
+        with self._writing():
+            if key not in self._index:
+                return False
+            self._append({"k": key, "d": 1})
+            return True
+
+    def delete_if(self, key: str, pred: Callable[[Dict[str, Any]], bool]) -> Optional[Dict[str, Any]]:
+        """Atomically delete the key if pred(doc) holds; returns the doc it saw (None if absent)."""
+        with self._writing():
+            doc = self._load(key)
+            if doc is not None and pred(doc):
+                self._append({"k": key, "d": 1})
+            return doc
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._index)
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream (key, doc) pairs for a snapshot of the current keys."""
+        for key in self.keys():
+            doc = self.get(key)
+            if doc is not None:
+                yield key, doc
+
+    def stats(self) -> Dict[str, int]:
+        return {"records": len(self._index), "log_bytes": self._end, "dead_bytes": self._dead, "seq": self.seq}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    # ---------- compaction ----------
+    def _maybe_compact(self) -> None:
+        if self._compacting or self._dead < max(COMPACT_MIN_BYTES, self._end - self._dead):
+            return
+        self._compacting = True
+        threading.Thread(target=self._compact_safely, name="record-store-compact", daemon=True).start()
+
+    def _compact_safely(self) -> None:
+        try:
+            self.compact()
+        except Exception:
+            log.exception("Compaction failed", extra={"store": os.path.basename(self.path)})
+        finally:
+            self._compacting = False
+
+    def compact(self) -> None:
+        """Rewrite only the live records into a new log and swap it in.
+
+        The bulk copy runs without holding any lock; writes that land meanwhile
+        (from any process) are carried over byte-for-byte before the atomic
+        rename, which happens under the file lock.
+        """
+        with self._compact_lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        with self._lock:
+            snapshot = sorted(self._index.items(), key=lambda kv: kv[1][0])
+            snap_end = self._end
+            snap_ino = self._sig[0]
+
+        tmp = f"{self.path}.compact.{os.getpid()}"
+        new_index: Dict[str, Tuple[int, int, int]] = {}
+        try:
+            with open(self.path, "rb") as src, open(tmp, "wb") as dst:
+                pos = 0
+                for key, (offset, length, seq) in snapshot:
+                    src.seek(offset)
+                    dst.write(src.read(length))
+                    new_index[key] = (pos, length, seq)
+                    pos += length
+
+                with self._writing():
+                    if self._sig[0] != snap_ino:
+                        return  # another worker compacted first; its log is already live
+                    # carry over records appended while we were copying
+                    src.seek(snap_end)
+                    tail = src.read(self._end - snap_end)
+                    dst.write(tail)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+
+                    os.replace(tmp, self.path)
+                    os.close(self._fd)
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND | _O_BINARY)
+                    self._index = new_index
+                    self._dead = 0
+                    self._end = self._scan(pos)
+                    self._sig = self._stat_sig()
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
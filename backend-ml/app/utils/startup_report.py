@@ -0,0 +1,154 @@
+# app/utils/startup_report.py
+"""
+Import-time / time-to-first-request report for CI.
+
+Starts a fresh interpreter under `python -X importtime`, imports app.main,
+runs the lifespan startup and sends the given GET requests straight to the
+ASGI app (no server, no httpx), then reports:
+
+- time to import app.main, to finish startup and to answer each request
+- import time per top-level package, and the slowest modules, per phase
+  (an import made while answering a request is charged to that request)
+
+    cd backend-ml && python -m app.utils.startup_report [--mode lazy] [--path /exams/x] [--json] [--budget-ms 1500]
+
+--budget-ms exits 1 when time to the last response goes over, so CI can
+track cold start. STARTUP_WARMUP is off in the child, so lazy-mode numbers
+show what an unwarmed first request pays.
+"""
+import argparse, json, os, re, subprocess, sys, time
+from typing import Dict, List
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_MARK = "## startup-report "
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+# runs in the child; phases are marked on stderr between the -X importtime lines
+_CHILD = r"""
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+
+def mark(phase):
+    sys.stderr.write("## startup-report " + phase + "\n")
+    sys.stderr.flush()
+
+mark("import")
+from app.main import app
+timings = {"import_ms": (time.perf_counter() - t0) * 1000}
+
+async def get(path):
+    status = []
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+             "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+             "headers": [(b"host", b"startup-report")], "client": ("127.0.0.1", 0), "server": ("startup-report", 80)}
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+    await app(scope, receive, send)
+    return status[0]
+
+async def main(paths):
+    mark("startup")
+    async with app.router.lifespan_context(app):
+        timings["startup_ms"] = (time.perf_counter() - t0) * 1000
+        timings["requests"] = []
+        for path in paths:
+            mark("GET " + path)
+            t = time.perf_counter()
+            status = await get(path)
+            timings["requests"].append({"path": path, "status": status, "ms": (time.perf_counter() - t) * 1000,
+                                        "at_ms": (time.perf_counter() - t0) * 1000})
+        mark("shutdown")
+
+asyncio.run(main(json.loads(sys.argv[1])))
+print(json.dumps(timings))
+"""
+
+
+def _parse_importtime(stderr: str) -> Dict[str, List[Dict]]:
+    """phase -> [{"module", "self_ms", "cumulative_ms", "depth"}] from -X importtime output."""
+    phases: Dict[str, List[Dict]] = {"interpreter": []}
+    phase = "interpreter"
+    for line in stderr.splitlines():
+        if line.startswith(_MARK):
+            phase = line[len(_MARK):]
+            phases.setdefault(phase, [])
+            continue
+        m = _LINE.match(line)
+        if m:
+            phases[phase].append({"module": m.group(4), "self_ms": int(m.group(1)) / 1000,
+                                  "cumulative_ms": int(m.group(2)) / 1000, "depth": len(m.group(3)) // 2})
+    return phases
+
+
+def _by_package(modules: List[Dict]) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for m in modules:
+        top = m["module"].split(".")[0]
+        totals[top] = totals.get(top, 0.0) + m["self_ms"]
+    return dict(sorted(((k, round(v, 1)) for k, v in totals.items()), key=lambda kv: -kv[1]))
+
+
+def run(mode: str, paths: List[str], top: int) -> Dict:
+    env = dict(os.environ, STARTUP_MODE=mode, STARTUP_WARMUP="0", LOG_LEVEL="WARNING")
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _CHILD, json.dumps(paths)], cwd=BASE_DIR,
+                          env=env, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        tail = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")][-20:]
+        raise RuntimeError("app failed to start:\n" + "\n".join(tail))
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    phases = _parse_importtime(proc.stderr)
+    report = {"mode": mode, "process_wall_ms": round(wall_ms, 1), **timings, "phases": {}}
+    for phase, modules in phases.items():
+        if not modules:
+            continue
+        report["phases"][phase] = {
+            "modules": len(modules),
+            "import_ms": round(sum(m["self_ms"] for m in modules), 1),
+            "packages": _by_package(modules),
+            "slowest": [{"module": m["module"], "self_ms": m["self_ms"], "cumulative_ms": m["cumulative_ms"]}
+                        for m in sorted(modules, key=lambda m: -m["self_ms"])[:top]],
+        }
+    return report
+
+
+def _print(report: Dict, top: int) -> None:
+    print(f"mode={report['mode']}  import app.main {report['import_ms']:.0f} ms  "
+          f"startup done {report['startup_ms']:.0f} ms  process {report['process_wall_ms']:.0f} ms")
+    for r in report["requests"]:
+        print(f"  GET {r['path']:<30} {r['status']}  {r['ms']:>7.1f} ms  (at {r['at_ms']:.0f} ms)")
+    for phase, p in report["phases"].items():
+        print(f"\n[{phase}] {p['modules']} modules, {p['import_ms']:.0f} ms importing")
+        packages = list(p["packages"].items())[:top]
+        print("  " + ", ".join(f"{name} {ms:.0f}" for name, ms in packages))
+        for m in p["slowest"]:
+            print(f"    {m['self_ms']:>8.1f} ms  {m['module']}  (cumulative {m['cumulative_ms']:.1f})")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Import-time and time-to-first-request report")
+    ap.add_argument("--mode", choices=("eager", "lazy"), default=os.getenv("STARTUP_MODE", "eager"))
+    ap.add_argument("--path", action="append", help="GET to send after startup (repeatable)")
+    ap.add_argument("--top", type=int, default=10, help="packages / modules listed per phase")
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    ap.add_argument("--budget-ms", type=float, help="exit 1 if the last response comes later than this")
+    args = ap.parse_args()
+
+    report = run(args.mode, args.path or ["/", "/exams/startup-report"], args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print(report, args.top)
+    last = report["requests"][-1]["at_ms"] if report["requests"] else report["startup_ms"]
+    if args.budget_ms is not None and last > args.budget_ms:
+        print(f"❌ time to first requests {last:.0f} ms > budget {args.budget_ms:.0f} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
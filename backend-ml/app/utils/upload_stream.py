@@ -0,0 +1,171 @@
+# app/utils/upload_stream.py
+"""
+Stream a multipart file upload straight to disk.
+
+The request body is fed chunk by chunk through python-multipart's push parser,
+so at most one network chunk is held in memory. The file part is hashed as it
+is written, its type is checked against magic bytes as soon as its first bytes
+arrive, and the stream is abandoned the moment it exceeds the size cap, so bad
+or oversized files are rejected without reading the rest of the body.
+"""
+import os
+from typing import Dict, Optional, Sequence, Tuple
+from uuid import uuid4
+from fastapi import Request
+
+try:
+    import python_multipart as multipart
+    from python_multipart.multipart import parse_options_header
+except ModuleNotFoundError:  # python-multipart < 0.0.13
+    import multipart
+    from multipart.multipart import parse_options_header
+
+# leading bytes of each accepted file type (docx is a zip container)
+MAGIC_BYTES: Dict[str, Tuple[bytes, ...]] = {
+    "pdf": (b"%PDF-",),
+    "docx": (b"PK\x03\x04",),
+}
+_SNIFF_LEN = max(len(m) for sigs in MAGIC_BYTES.values() for m in sigs)
+_MULTIPART_OVERHEAD = 64 * 1024  # room for boundaries / part headers / small fields
+
+
+def _limit(n: int) -> str:
+    return f"{n >> 20} MB" if n >= 1 << 20 else f"{n >> 10} KB"
+
+
+class UploadRejected(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class StreamedUpload:
+    def __init__(self, path: str, filename: str, ext: str, size: int, digest: str):
+        self.path = path
+        self.filename = filename
+        self.ext = ext
+        self.size = size
+        self.digest = digest
+
+
+class _FilePartWriter:
+    """python-multipart callbacks that write the `field` part to dest_dir."""
+
+    def __init__(self, dest_dir: str, field: str, max_bytes: int, allowed: Sequence[str], hasher):
+        self.dest_dir = dest_dir
+        self.field = field
+        self.max_bytes = max_bytes
+        self.allowed = allowed
+        self.hasher = hasher
+        self.out = None
+        self.path: Optional[str] = None
+        self.filename = ""
+        self.ext = ""
+        self.size = 0
+        self.done = False
+        self._head = b""
+        self._in_file = False
+        self._header_name = b""
+        self._header_value = b""
+        self._disposition = b""
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._in_file = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_name.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_name = self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if options.get(b"name", b"").decode("latin-1") != self.field or b"filename" not in options:
+            return  # unrelated form field, ignored
+        if self.done or self.out is not None:
+            raise UploadRejected(400, "Only one file may be uploaded")
+        self.filename = options[b"filename"].decode("utf-8", errors="replace")
+        self.ext = self.filename.lower().split(".")[-1]
+        if self.ext not in self.allowed:
+            raise UploadRejected(400, f"Only {' or '.join(a.upper() for a in self.allowed)} allowed")
+        self.path = os.path.join(self.dest_dir, f"{uuid4().hex}.{self.ext}.tmp")
+        self.out = open(self.path, "wb")
+        self._in_file = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._in_file:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadRejected(413, f"File too large (max {_limit(self.max_bytes)})")
+        if len(self._head) < _SNIFF_LEN:
+            self._head += chunk[:_SNIFF_LEN - len(self._head)]
+            if len(self._head) >= _SNIFF_LEN and not self._head.startswith(MAGIC_BYTES[self.ext]):
+                raise UploadRejected(415, f"File content is not a valid {self.ext.upper()}")
+        self.hasher.update(chunk)
+        self.out.write(chunk)
+
+    def on_part_end(self) -> None:
+        if self._in_file:
+            if not self._head.startswith(MAGIC_BYTES[self.ext]):
+                raise UploadRejected(415, f"File content is not a valid {self.ext.upper()}")
+            self.out.close()
+            self.done = True
+            self._in_file = False
+
+    def cleanup(self) -> None:
+        if self.out is not None and not self.out.closed:
+            self.out.close()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+async def stream_upload(request: Request, dest_dir: str, max_bytes: int, hasher, field: str = "file",
+                        allowed: Sequence[str] = ("pdf", "docx")) -> StreamedUpload:
+    """Write the uploaded `field` file to a temp file in dest_dir, feeding every
+    byte to `hasher` (any hashlib object) on the way.
+
+    Raises UploadRejected (with an HTTP status) for malformed, oversized or
+    wrongly-typed uploads; nothing is left on disk in that case.
+    """
+    ctype, params = parse_options_header(request.headers.get("content-type", ""))
+    if ctype != b"multipart/form-data" or b"boundary" not in params:
+        raise UploadRejected(400, "Expected a multipart/form-data upload")
+
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes + _MULTIPART_OVERHEAD:
+        raise UploadRejected(413, f"File too large (max {_limit(max_bytes)})")
+
+    writer = _FilePartWriter(dest_dir, field, max_bytes, allowed, hasher)
+    parser = multipart.MultipartParser(params[b"boundary"], {
+        "on_part_begin": writer.on_part_begin,
+        "on_part_data": writer.on_part_data,
+        "on_part_end": writer.on_part_end,
+        "on_header_field": writer.on_header_field,
+        "on_header_value": writer.on_header_value,
+        "on_header_end": writer.on_header_end,
+        "on_headers_finished": writer.on_headers_finished,
+    })
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except UploadRejected:
+        writer.cleanup()
+        raise
+    except Exception as e:
+        writer.cleanup()
+        raise UploadRejected(400, f"Malformed upload: {e}")
+
+    if not writer.done:
+        writer.cleanup()
+        raise UploadRejected(400, f"No '{field}' file in upload")
+    return StreamedUpload(writer.path, writer.filename, writer.ext, writer.size, writer.hasher.hexdigest())
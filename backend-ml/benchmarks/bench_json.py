@@ -0,0 +1,104 @@
+# benchmarks/bench_json.py
+"""
+Response encoding: time to encode and bytes on the wire per request for
+GET /profile/{id}, /exams/{id} and /recommend/careers/{id}.
+
+The payloads are what the routes produce for synthetic profiles
+(benchmarks/synthetic.py); only the encoding step is timed. Encoders:
+
+    before       what the route did before utils/fast_json.py (jsonable_encoder +
+                 JSONResponse for the profile, json.dumps with spaced separators for results)
+    json         stdlib json, compact (fast_json without FAST_JSON)
+    orjson       orjson (FAST_JSON=1), if installed
+    pre-encoded  careers only: ranked rows spliced from the catalogue's pre-encoded
+                 entries (what the results cache stores)
+
+    cd backend-ml && python benchmarks/bench_json.py [--profiles 500] [--rounds 5]
+"""
+import argparse, json, os, statistics, sys, time
+from typing import Callable, Dict, List
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+if BENCH_DIR not in sys.path:
+    sys.path.append(BENCH_DIR)
+
+import synthetic
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+from app.services import career_service
+from app.services.catalogue import catalogue
+from app.services.exam_service import recommend_exams
+from app.services.profile_features import public_view, with_features
+from app.utils import fast_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _std(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _encoders(endpoint: str) -> Dict[str, Callable]:
+    if endpoint == "profile":
+        before = lambda obj: JSONResponse(jsonable_encoder(obj)).body
+    else:
+        before = lambda obj: json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    out = {"before": before, "json": _std}
+    if orjson is not None:
+        out["orjson"] = lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return out
+
+
+def _time(fn: Callable, inputs: List, rounds: int) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        for x in inputs:
+            t = time.perf_counter()
+            fn(x)
+            samples.append((time.perf_counter() - t) * 1e6)
+    return samples
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--profiles", type=int, default=500)
+    ap.add_argument("--rounds", type=int, default=5, help="passes over the payloads")
+    ap.add_argument("--seed", type=int, default=11)
+    args = ap.parse_args()
+
+    profiles = [with_features(p) for p in synthetic.profiles(args.profiles, args.seed)]
+    snap = catalogue.current()
+    # careers for profiles with skills (the rest get a fixed two-field message)
+    ranked = [r for r in (career_service._ranked(p)[1] for p in profiles) if r]
+    payloads = {
+        "profile": [public_view(p) for p in profiles],
+        "exams": [recommend_exams(p) for p in profiles],
+        "careers": [[career_service._career_row(snap, pos, s) for pos, s in r] for r in ranked],
+    }
+    # careers as the results cache encodes them: ranking done, only the splice timed
+    splice = lambda r: career_service._encode_ranked(snap, r)
+    for rows, r in zip(payloads["careers"], ranked):
+        assert json.loads(splice(r)) == rows
+
+    print(f"{args.profiles} profiles x {args.rounds} rounds, fast_json engine: {fast_json.ENGINE}")
+    print(f"\n{'endpoint':<10} {'encoder':<12} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'bytes/req':>10}")
+    for endpoint, objs in payloads.items():
+        rows = [(name, fn, objs) for name, fn in _encoders(endpoint).items()]
+        if endpoint == "careers" and ranked:
+            rows.append(("pre-encoded", splice, ranked))
+        for name, fn, inputs in rows:
+            fn(inputs[0])  # warm-up (the pre-encoded entries are built on first use)
+            samples = _time(fn, inputs, args.rounds)
+            q = statistics.quantiles(samples, n=100)
+            size = statistics.mean(len(fn(x)) for x in inputs)
+            print(f"{endpoint:<10} {name:<12} {statistics.mean(samples):>9.1f} {q[49]:>9.1f} {q[98]:>9.1f} {size:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_matching.py
+"""
+Per-request and batch latency of the matching engines: keyword overlap vs
+TF-IDF cosine (services/similarity.py).
+
+Single-profile numbers are what one /recommend/careers or /exams request pays
+(cache misses); batch numbers are per profile through the *_batch functions
+used by /recommend/batch. Also reports index fit vs memory-mapped load time.
+
+    cd backend-ml && python benchmarks/bench_matching.py [--profiles 5000] [--batch 1000]
+"""
+import argparse, os, random, statistics, sys, tempfile, time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from app.services import career_service, exam_service, similarity
+from app.services.catalogue import catalogue
+from app.services.profile_features import with_features
+
+_LEVELS = ["", "btech", "B.Tech", "graduation", "BSc Computer Science", "12th"]
+
+
+def _profiles(n: int) -> list:
+    rng = random.Random(11)
+    bank = sorted(catalogue.current().skill_bank) + ["machine learning", "data science", "api", "excel", "pandas"]
+    return [with_features({
+        "skills": [{"name": s} for s in rng.sample(bank, rng.randint(0, 10))],
+        "academic": {"level": rng.choice(_LEVELS)},
+    }) for _ in range(n)]
+
+
+def _use(name: str) -> None:
+    career_service.MATCH_ENGINE = exam_service.MATCH_ENGINE = name
+
+
+def _report(label: str, samples_us: list) -> None:
+    q = statistics.quantiles(samples_us, n=100)
+    print(f"{label:<28} {statistics.mean(samples_us):>9.1f} {q[49]:>9.1f} {q[94]:>9.1f} {q[98]:>9.1f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--profiles", type=int, default=5000)
+    ap.add_argument("--batch", type=int, default=1000)
+    args = ap.parse_args()
+    profiles = _profiles(args.profiles)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "similarity.joblib")
+        t0 = time.perf_counter()
+        snap = catalogue.current()
+        similarity.save_index(similarity.fit_index(snap), path)
+        t1 = time.perf_counter()
+        index = similarity.load_index(path)
+        t2 = time.perf_counter()
+        print(f"index: {len(index['vocabulary'])} terms, fit+save {1000 * (t1 - t0):.1f} ms, "
+              f"mmap load {1000 * (t2 - t1):.1f} ms\n")
+    snap.get("similarity")  # the app's own index (fitted and saved if missing)
+
+    print(f"{'us/profile':<28} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for name in ("overlap", "tfidf"):
+        _use(name)
+        for kind, fn in (("careers", career_service.recommend_careers), ("exams", exam_service.recommend_exams)):
+            fn(profiles[0])  # warm-up
+            samples = []
+            for p in profiles:
+                t = time.perf_counter()
+                fn(p)
+                samples.append((time.perf_counter() - t) * 1e6)
+            _report(f"{name} {kind} single", samples)
+
+        for kind, fn in (("careers", career_service.recommend_careers_batch),
+                         ("exams", exam_service.recommend_exams_batch)):
+            samples = []
+            for i in range(0, len(profiles), args.batch):
+                chunk = profiles[i:i + args.batch]
+                t = time.perf_counter()
+                fn(chunk)
+                samples.append((time.perf_counter() - t) * 1e6 / len(chunk))
+            print(f"{name + ' ' + kind + ' batch':<28} {statistics.mean(samples):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_passwords.py
+"""
+Password hashing throughput: logins/sec at a given number of hashing threads,
+and how long the event loop stalls while they run.
+
+Calibrates the scrypt cost like the app does at startup (or uses --log-n),
+then verifies --logins passwords through PasswordHasher for each thread count,
+with a 1 ms heartbeat task on the loop. "inline" is the same work done
+directly in the async handler, for comparison: the loop stalls for the whole
+hash every time.
+
+    cd backend-ml && python benchmarks/bench_passwords.py [--threads 1,2,4] [--logins 200] [--target-ms 50]
+"""
+import argparse, asyncio, os, statistics, sys, time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from app.utils.passwords import PasswordHasher
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        t = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - t - 0.001) * 1000)
+
+
+async def _run(hasher: PasswordHasher, encoded: str, logins: int, concurrency: int, inline: bool) -> dict:
+    stop, lags, latencies = asyncio.Event(), [], []
+    beat = asyncio.create_task(_heartbeat(stop, lags))
+    counter = iter(range(logins))
+
+    async def _client():
+        for _ in counter:
+            t = time.perf_counter()
+            ok = hasher.verify_sync("bench-pass-123", encoded) if inline else await hasher.verify("bench-pass-123", encoded)
+            assert ok
+            latencies.append((time.perf_counter() - t) * 1000)
+            await asyncio.sleep(0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await beat
+    q = statistics.quantiles(latencies, n=100)
+    return {"rps": logins / elapsed, "p50": q[49], "p99": q[98], "loop_lag_max": max(lags, default=0.0)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threads", default=f"1,{os.cpu_count() or 1}", help="comma-separated thread counts")
+    ap.add_argument("--logins", type=int, default=200)
+    ap.add_argument("--target-ms", type=float, default=50.0)
+    ap.add_argument("--log-n", type=int, help="fixed scrypt cost instead of calibrating")
+    args = ap.parse_args()
+
+    cal = PasswordHasher(target_ms=args.target_ms, log_n=args.log_n)
+    t0 = time.perf_counter()
+    log_n = cal.calibrate()
+    print(f"scrypt n=2^{log_n} r={cal.r} p={cal.p} ({128 * cal.r * (1 << log_n) >> 20} MiB per hash), "
+          f"calibrated in {1000 * (time.perf_counter() - t0):.0f} ms, {os.cpu_count()} CPU(s), "
+          f"memory budget {cal.max_mem >> 20 or 'unlimited'} MiB")
+    encoded = cal.hash_sync("bench-pass-123")
+
+    print(f"\n{'mode':<12} {'logins/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'loop stall max ms':>18}")
+    rows = [("inline", 1, True)] + [(f"{t} thread(s)", t, False)
+                                    for t in sorted({int(x) for x in args.threads.split(",")})]
+    for label, threads, inline in rows:
+        hasher = PasswordHasher(workers=threads, queue_depth=args.logins, log_n=log_n)
+        if hasher.workers < threads:
+            label += f" (capped to {hasher.workers} by PASSWORD_HASH_MAX_MEM)"
+        r = asyncio.run(_run(hasher, encoded, args.logins, concurrency=max(2, 2 * threads), inline=inline))
+        print(f"{label:<12} {r['rps']:>9.1f} {r['p50']:>9.1f} {r['p99']:>9.1f} {r['loop_lag_max']:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_pdf.py
+"""
+Per-page PDF text extraction latency: PyMuPDF fast path vs pdfplumber.
+
+Runs every PDF in a corpus directory through each backend in
+resume_service.PDF_BACKENDS, with and without the page cap / early stop, and
+reports milliseconds per page of the source document. Without --corpus a
+synthetic set of 1-8 page resumes is generated with PyMuPDF.
+
+    cd backend-ml && python benchmarks/bench_pdf.py [--corpus DIR] [--samples 20]
+"""
+import argparse, glob, os, random, statistics, sys, tempfile, time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from app.services import resume_service as rs
+from app.services.catalogue import catalogue
+
+_FILLER = ("Designed and shipped features used by thousands of users. Worked closely with the "
+           "product team on performance, reliability and testing. ")
+
+
+def _synthetic_corpus(out_dir: str, samples: int) -> list:
+    import pymupdf
+    rng = random.Random(7)
+    skills = sorted(catalogue.current().skill_bank)
+    paths = []
+    for n in range(samples):
+        doc = pymupdf.open()
+        pages = rng.randint(1, 8)
+        for p in range(pages):
+            page = doc.new_page()
+            lines = []
+            if p == 0:
+                lines += [f"Candidate {n}", f"candidate{n}@example.com", "+91 98765 43210",
+                          "Skills: " + ", ".join(rng.sample(skills, 8)),
+                          "B.Tech Computer Science, 2024"]
+            lines += [_FILLER] * 20
+            page.insert_textbox(page.rect + (50, 50, -50, -50), "\n".join(lines), fontsize=9)
+        path = os.path.join(out_dir, f"resume_{n}.pdf")
+        doc.save(path)
+        paths.append(path)
+    return paths
+
+
+def _page_count(path: str) -> int:
+    import pymupdf
+    with pymupdf.open(path) as doc:
+        return doc.page_count
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--corpus", help="directory of sample resume PDFs")
+    ap.add_argument("--samples", type=int, default=20, help="synthetic resumes when no corpus is given")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = sorted(glob.glob(os.path.join(args.corpus, "*.pdf"))) if args.corpus \
+            else _synthetic_corpus(tmp, args.samples)
+        if not paths:
+            sys.exit("no PDFs found")
+        pages = {p: _page_count(p) for p in paths}
+        print(f"{len(paths)} PDFs, {sum(pages.values())} pages\n")
+        print(f"{'backend':<24} {'mean ms/page':>13} {'p50':>8} {'p95':>8} {'total s':>8}")
+
+        for name, reader in rs.PDF_BACKENDS.items():
+            for label, max_pages in ((" (no cap)", 10_000), (f" (max {rs.RESUME_MAX_PAGES}p)", rs.RESUME_MAX_PAGES)):
+                per_page = []
+                t_all = time.perf_counter()
+                for p in paths:
+                    t0 = time.perf_counter()
+                    reader(p, max_pages=max_pages)
+                    per_page.append((time.perf_counter() - t0) * 1000 / pages[p])
+                total = time.perf_counter() - t_all
+                q = statistics.quantiles(per_page, n=20) if len(per_page) > 1 else per_page * 19
+                print(f"{name + label:<24} {statistics.mean(per_page):>13.2f} "
+                      f"{statistics.median(per_page):>8.2f} {q[18]:>8.2f} {total:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
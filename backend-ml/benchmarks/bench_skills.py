@@ -0,0 +1,63 @@
+# benchmarks/bench_skills.py
+"""
+Micro-benchmark: skill extraction time vs. skill bank size.
+
+Compares the compiled token trie used by resume_service._extract_skills with
+the old per-skill substring scan, over a synthetic resume, as the bank grows
+from the shipped seed list to thousands of entries.
+
+    cd backend-ml && python benchmarks/bench_skills.py [--words 1500] [--repeat 20]
+"""
+import argparse, os, random, re, sys, time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from app.services import resume_service as rs
+from app.services.catalogue import catalogue
+
+SKILL_BANK = list(catalogue.current().skill_bank)
+
+
+def _substring_scan(text: str, bank) -> set:
+    # what _extract_skills did before the trie: `sk in text` for every skill
+    t = re.sub(r"\s+", " ", text.lower().strip())
+    return {sk for sk in bank if sk in t}
+
+
+def _resume(words: int, rng: random.Random) -> str:
+    vocab = ["developed", "built", "team", "project", "data", "using", "and", "with",
+             "the", "api", "service", "deployed", "users", "performance"] + sorted(SKILL_BANK)
+    return " ".join(rng.choice(vocab) for _ in range(words))
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--words", type=int, default=1500, help="resume length in words")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    rng = random.Random(42)
+    text = _resume(args.words, rng)
+    print(f"resume: {args.words} words\n")
+    print(f"{'bank size':>10} {'trie ms':>10} {'substring ms':>14}")
+    for extra in (0, 1_000, 5_000, 20_000):
+        bank = set(SKILL_BANK) | {f"skill{i} tool{i}" for i in range(extra)}
+        trie = rs._compile_skill_trie(bank, rs.SKILL_ALIASES)
+        trie_ms = _best_of(lambda: rs._extract_skills(text, trie), args.repeat)
+        scan_ms = _best_of(lambda: _substring_scan(text, bank), args.repeat)
+        print(f"{len(bank):>10} {trie_ms:>10.3f} {scan_ms:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# benchmarks/bench_suite.py
+"""
+Reproducible performance suite: micro-benchmarks of the hot functions plus an
+in-process load test of the main routes, reported as one JSON document.
+
+    cd backend-ml && python benchmarks/bench_suite.py --scale 10000 --out bench.json
+    python benchmarks/bench_suite.py --scale 10000 --compare bench.json     # deltas vs an earlier run
+
+1. Synthetic users / profiles (benchmarks/synthetic.py, fixed seed) are
+   written into a temp directory and the app's stores and upload dir are
+   pointed there, so the repo's own data is never touched.
+2. Micro-benchmarks: resume_service._extract_skills, exam_service.recommend_exams,
+   career_service.recommend_careers, database.upsert_profile (us per call).
+3. Load test through httpx's ASGI transport (no sockets, no server): POST
+   /auth/login, POST /profile/save, POST /resume/upload/{id}, GET /exams/{id},
+   each with --concurrency clients; throughput and latency percentiles.
+
+Same --scale / --seed / request counts give the same data and request mix on
+every commit, so runs are comparable; the commit is recorded in "meta".
+"""
+import argparse, asyncio, json, os, platform, random, statistics, subprocess, sys, tempfile, time
+from typing import Callable, Dict, List
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+if BENCH_DIR not in sys.path:
+    sys.path.append(BENCH_DIR)
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")  # the app logs per request at INFO
+
+import synthetic
+
+
+def _summary(samples: List[float], unit: str) -> Dict[str, float]:
+    n = len(samples)
+    if n < 2:
+        samples = samples * 2 or [0.0, 0.0]
+    # inclusive: percentiles stay within the observed range, even for a handful of samples
+    q = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"unit": unit, "n": n, "mean": round(statistics.mean(samples), 3),
+            "p50": round(q[49], 3), "p95": round(q[94], 3), "p99": round(q[98], 3), "max": round(max(samples), 3)}
+
+
+def _git_commit() -> str:
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True,
+                             text=True, timeout=10).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", "."], cwd=BASE_DIR, capture_output=True,
+                               text=True, timeout=30).stdout.strip()
+        return rev + ("-dirty" if dirty else "") if rev else "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+# ---------- setup ----------
+def _isolate(tmp: str, args) -> None:
+    """Generate the data set and point the app's stores / upload dir at it."""
+    from app.services.profile_features import with_features
+    from app.utils import database
+    from app.utils.passwords import password_hasher
+
+    t0 = time.perf_counter()
+    synthetic.write_store(os.path.join(tmp, "profiles.log"),
+                          ((p["userId"], with_features(p)) for p in synthetic.profiles(args.scale, args.seed)))
+    shared = None if args.plaintext_users else password_hasher.hash_sync(synthetic.PASSWORD)
+    synthetic.write_store(os.path.join(tmp, "users.log"), synthetic.users(args.users or args.scale, shared))
+    print(f"data: {args.scale} profiles, {args.users or args.scale} users in {time.perf_counter() - t0:.1f}s",
+          file=sys.stderr)
+
+    missing = os.path.join(tmp, "no-legacy.json")
+    database.USER_LOG, database.PROFILE_LOG = os.path.join(tmp, "users.log"), os.path.join(tmp, "profiles.log")
+    database.USER_DB = database.LEGACY_AUTH_USER_DB = database.PROFILE_DB = missing
+
+    from app.routes import resume_routes
+    from app.services.resume_cache import ResumeCache
+    resume_routes.UPLOAD_DIR = os.path.join(tmp, "uploads")
+    os.makedirs(resume_routes.UPLOAD_DIR, exist_ok=True)
+    resume_routes.resume_cache = ResumeCache(resume_routes.UPLOAD_DIR)
+
+
+# ---------- micro-benchmarks ----------
+def _time_calls(fn: Callable, inputs: List, n: int) -> List[float]:
+    fn(inputs[0])  # warm-up (lazy indexes, caches)
+    samples = []
+    for i in range(n):
+        x = inputs[i % len(inputs)]
+        t = time.perf_counter()
+        fn(x)
+        samples.append((time.perf_counter() - t) * 1e6)
+    return samples
+
+
+def micro(args) -> Dict[str, Dict]:
+    from app.services import resume_service, exam_service, career_service
+    from app.services.profile_features import with_features
+    from app.utils import database
+
+    rng = random.Random(args.seed)
+    bank = synthetic._bank()
+    texts = [synthetic.resume_text(rng, bank) for _ in range(50)]
+    featured = [with_features(p) for p in synthetic.profiles(min(args.scale, 2000), args.seed)]
+    # new ids past the stored population, so every save is a real append
+    writes = [with_features(synthetic.profile(args.scale + i, rng, bank)) for i in range(min(args.micro, 2000))]
+
+    out = {}
+    for name, fn, inputs in (
+        ("extract_skills", resume_service._extract_skills, texts),
+        ("recommend_exams", exam_service.recommend_exams, featured),
+        ("recommend_careers", career_service.recommend_careers, featured),
+        ("upsert_profile", lambda p: database.upsert_profile(p["userId"], p), writes),
+    ):
+        out[name] = _summary(_time_calls(fn, inputs, args.micro), "us")
+        print(f"{name:<20} p50 {out[name]['p50']:>9.1f}us  p99 {out[name]['p99']:>9.1f}us", file=sys.stderr)
+    return out
+
+
+# ---------- load test ----------
+async def _drive(client, make_request: Callable[[int], Dict], total: int, concurrency: int) -> Dict:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    counter = iter(range(total))
+
+    async def _client():
+        for i in counter:
+            req = make_request(i)
+            t = time.perf_counter()
+            res = await client.request(**req)
+            latencies.append((time.perf_counter() - t) * 1000)
+            statuses[str(res.status_code)] = statuses.get(str(res.status_code), 0) + 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    return {"requests": total, "concurrency": concurrency, "seconds": round(elapsed, 3),
+            "throughput_rps": round(total / elapsed, 1), "latency": _summary(latencies, "ms"), "status": statuses}
+
+
+async def _load(args) -> Dict[str, Dict]:
+    import httpx
+    from app.main import app
+    from app.services.parse_pool import resume_parse_pool
+
+    rng = random.Random(args.seed)
+    bank = synthetic._bank()
+    n_users = args.users or args.scale
+    ctype = {"docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+             "pdf": "application/pdf"}[args.resume_format]
+    uploads = list(synthetic.resumes(args.warmup + args.upload_requests, args.resume_format, args.seed))
+    saves = [synthetic.profile(rng.randrange(args.scale), rng, bank) for _ in range(args.warmup + args.requests)]
+
+    scenarios = {
+        "auth_login": lambda i: {"method": "POST", "url": "/auth/login", "json": {
+            "email": synthetic.email(rng.randrange(n_users)), "password": synthetic.PASSWORD}},
+        "profile_save": lambda i: {"method": "POST", "url": "/profile/save", "json": saves[i]},
+        "resume_upload": lambda i: {"method": "POST", "url": f"/resume/upload/{synthetic.user_id(i)}",
+                                    "files": {"file": (uploads[i][0], uploads[i][1], ctype)}},
+        "exams": lambda i: {"method": "GET", "url": f"/exams/{synthetic.user_id(rng.randrange(args.scale))}"},
+    }
+    # more uploads than the parse pool admits would only measure 429s
+    upload_slots = resume_parse_pool.workers + resume_parse_pool.queue_depth
+
+    out = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, make in scenarios.items():
+            total = {"resume_upload": args.upload_requests, "auth_login": args.login_requests}.get(name, args.requests)
+            concurrency = min(args.concurrency, upload_slots) if name == "resume_upload" else args.concurrency
+            await _drive(client, make, args.warmup, concurrency)
+            # the measured run continues after the warm-up inputs
+            out[name] = await _drive(client, lambda i, make=make: make(args.warmup + i), total, concurrency)
+            lat = out[name]["latency"]
+            print(f"{name:<20} {out[name]['throughput_rps']:>8.1f} req/s  p50 {lat['p50']:>7.2f}ms  "
+                  f"p95 {lat['p95']:>7.2f}ms  p99 {lat['p99']:>7.2f}ms  {out[name]['status']}", file=sys.stderr)
+    resume_parse_pool.shutdown()
+    return out
+
+
+# ---------- comparison ----------
+def compare(current: Dict, baseline: Dict) -> None:
+    print(f"\nvs {baseline['meta']['commit']} (p50 / p99 / throughput, + is slower)", file=sys.stderr)
+
+    def pct(new, old):
+        return f"{100 * (new - old) / old:+6.1f}%" if old else "   n/a"
+
+    for name, cur in current["micro"].items():
+        old = baseline.get("micro", {}).get(name)
+        if old:
+            print(f"  {name:<20} {pct(cur['p50'], old['p50'])} {pct(cur['p99'], old['p99'])}", file=sys.stderr)
+    for name, cur in current["load"].items():
+        old = baseline.get("load", {}).get(name)
+        if old:
+            # throughput: higher is better, so flip the sign to keep "+ is slower"
+            print(f"  {name:<20} {pct(cur['latency']['p50'], old['latency']['p50'])} "
+                  f"{pct(cur['latency']['p99'], old['latency']['p99'])} "
+                  f"{pct(old['throughput_rps'], cur['throughput_rps'])}", file=sys.stderr)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--scale", type=int, default=1000, help="stored profiles (1000 .. 1000000)")
+    ap.add_argument("--users", type=int, default=0, help="stored users (default: --scale)")
+    ap.add_argument("--seed", type=int, default=11)
+    ap.add_argument("--micro", type=int, default=2000, help="calls per micro-benchmark")
+    ap.add_argument("--requests", type=int, default=2000, help="requests per route")
+    ap.add_argument("--upload-requests", type=int, default=100, help="resume uploads (each a fresh parse)")
+    ap.add_argument("--login-requests", type=int, default=200, help="logins (each one scrypt hash)")
+    ap.add_argument("--plaintext-users", action="store_true", help="legacy users, rehashed on first login")
+    ap.add_argument("--resume-format", choices=("docx", "pdf"), default="docx")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--warmup", type=int, default=20, help="untimed requests per route")
+    ap.add_argument("--skip-micro", action="store_true")
+    ap.add_argument("--skip-load", action="store_true")
+    ap.add_argument("--out", default="-", help="JSON report path, '-' for stdout")
+    ap.add_argument("--compare", help="earlier JSON report to diff against")
+    args = ap.parse_args()
+
+    report = {"meta": {
+        "commit": _git_commit(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "match_engine": os.getenv("MATCH_ENGINE", "overlap"),
+        "args": vars(args),
+    }}
+    with tempfile.TemporaryDirectory(prefix="careerise-bench-") as tmp:
+        _isolate(tmp, args)
+        report["micro"] = {} if args.skip_micro else micro(args)
+        report["load"] = {} if args.skip_load else asyncio.run(_load(args))
+
+    raw = json.dumps(report, indent=2)
+    if args.out == "-":
+        print(raw)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(raw + "\n")
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/fake_resend.py
+"""
+Local stand-in for the Resend email API.
+
+Accepts POST /emails like the real service, optionally slow or flaky, and
+counts what it received, so OTP delivery (queue, retries, dead letters) can be
+exercised without sending mail:
+
+    cd backend-ml && python benchmarks/fake_resend.py --port 8025 --delay 2 --fail-rate 0.3
+    RESEND_API_URL=http://127.0.0.1:8025/emails uvicorn app.main:app
+
+GET /stats returns the counters.
+"""
+import argparse, json, random, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_stats = {"received": 0, "accepted": 0, "failed": 0}
+_lock = threading.Lock()
+
+
+def make_handler(delay: float, fail_rate: float, fail_status: int):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def _reply(self, status: int, body: dict) -> None:
+            raw = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_POST(self):
+            json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            time.sleep(delay)
+            failed = random.random() < fail_rate
+            with _lock:
+                _stats["received"] += 1
+                _stats["failed" if failed else "accepted"] += 1
+                n = _stats["received"]
+            if failed:
+                self._reply(fail_status, {"message": "stand-in failure"})
+            else:
+                self._reply(200, {"id": f"fake-{n}"})
+
+        def do_GET(self):
+            with _lock:
+                self._reply(200, dict(_stats))
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(port: int = 8025, delay: float = 0.0, fail_rate: float = 0.0, fail_status: int = 503) -> ThreadingHTTPServer:
+    """Start the stand-in on a background thread; returns the server (call .shutdown())."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(delay, fail_rate, fail_status))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8025)
+    ap.add_argument("--delay", type=float, default=0.0, help="seconds before each reply")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="fraction of sends answered with --fail-status")
+    ap.add_argument("--fail-status", type=int, default=503)
+    args = ap.parse_args()
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.delay, args.fail_rate, args.fail_status))
+    print(f"fake Resend on http://127.0.0.1:{args.port}/emails")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# benchmarks/synthetic.py
+"""
+Deterministic synthetic data for benchmarks and load tests: profiles, users
+and resumes (DOCX, or PDF through PyMuPDF), from 1k to 1M records.
+
+Everything is generated from a seed, so the same --scale / --seed gives the
+same data on every commit. Records are streamed, never held as one list.
+
+    cd backend-ml && python benchmarks/synthetic.py --out /tmp/careerise-data --profiles 100000 --users 100000 --resumes 200
+
+writes profiles.log / users.log (the app's record store format) and
+resumes/*.docx into --out.
+"""
+import argparse, io, os, random, sys, time, zipfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.append(BASE_DIR)
+
+from app.services.catalogue import catalogue
+from app.utils.record_store import RecordStore
+
+_LEVELS = ["", "btech", "B.Tech", "graduation", "BSc Computer Science", "12th", "MCA", "diploma"]
+_FIELDS = ["Computer Science", "IT", "Electronics", "Mechanical", "Commerce", ""]
+_EXTRA_SKILLS = ["machine learning", "data science", "api", "excel", "pandas", "communication", "leadership"]
+_FIRST = ["Asha", "Rahul", "Priya", "Arjun", "Neha", "Vikram", "Sara", "Kiran", "Anil", "Meera"]
+_LAST = ["Sharma", "Patel", "Iyer", "Khan", "Reddy", "Das", "Nair", "Gupta", "Singh", "Rao"]
+_FILLER = ["developed", "built", "team", "project", "data", "using", "and", "with", "designed",
+           "improved", "performance", "users", "feature", "internship", "college", "responsible"]
+
+# the password every synthetic user signs in with
+PASSWORD = "bench-pass-123"
+
+
+def user_id(i: int) -> str:
+    return f"bench{i:08d}"
+
+
+def email(i: int) -> str:
+    return f"user{i:08d}@careerise-bench.com"
+
+
+def _bank() -> List[str]:
+    return sorted(catalogue.current().skill_bank) + _EXTRA_SKILLS
+
+
+def profile(i: int, rng: random.Random, bank: List[str]) -> Dict:
+    """A profile as POST /profile/save would receive it."""
+    name = f"{rng.choice(_FIRST)} {rng.choice(_LAST)}"
+    return {
+        "userId": user_id(i),
+        "name": name,
+        "email": email(i),
+        "skills": [{"name": s, "type": "technical", "level": rng.choice(["beginner", "intermediate", "advanced"])}
+                   for s in rng.sample(bank, rng.randint(0, 12))],
+        "academic": {"level": rng.choice(_LEVELS), "field": rng.choice(_FIELDS),
+                     "gpa": f"{rng.uniform(5, 10):.1f}", "achievements": []},
+        "interests": [{"name": s} for s in rng.sample(bank, rng.randint(0, 3))],
+        "preferences": {"workEnvironment": "", "arrangement": rng.choice(["remote", "hybrid", "onsite"]),
+                        "companySize": ""},
+        "profileCompletion": rng.randint(10, 100),
+        "resumeInfo": {"name": name, "email": email(i), "phone": "", "skills": [], "education": ""},
+    }
+
+
+def profiles(n: int, seed: int = 11) -> Iterator[Dict]:
+    rng, bank = random.Random(seed), _bank()
+    for i in range(n):
+        yield profile(i, rng, bank)
+
+
+def users(n: int, password_hash: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+    """(email, stored user doc); every user has PASSWORD.
+
+    Without password_hash the users are legacy plaintext records (rehashed on
+    first login); with it they all share that one precomputed hash, since
+    hashing a million users one by one would take hours."""
+    for i in range(n):
+        doc = {"id": user_id(i), "name": f"Bench User {i}", "email": email(i), "created_at": 1700000000 + i}
+        if password_hash:
+            doc["password_hash"] = password_hash
+        else:
+            doc["password"] = PASSWORD
+        yield email(i), doc
+
+
+def resume_text(rng: random.Random, bank: List[str], words: int = 400) -> str:
+    lines = [f"{rng.choice(_FIRST)} {rng.choice(_LAST)}",
+             f"{rng.choice(_FIRST).lower()}{rng.randint(1, 9999)}@example.com  +91 98{rng.randint(10000000, 99999999)}",
+             f"Education: B.Tech {rng.choice(['CS', 'IT', 'Computer Science'])}", "Skills"]
+    lines.append(", ".join(rng.sample(bank, 15)))
+    body = []
+    for _ in range(words):
+        body.append(rng.choice(bank) if rng.random() < 0.08 else rng.choice(_FILLER))
+    for k in range(0, len(body), 16):
+        lines.append(" ".join(body[k:k + 16]))
+    return "\n".join(lines)
+
+
+_CONTENT_TYPES = ('<?xml version="1.0" encoding="UTF-8"?>'
+                  '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                  '<Default Extension="xml" ContentType="application/xml"/></Types>')
+
+
+def docx_bytes(text: str) -> bytes:
+    """A minimal .docx (one paragraph per line) that docx2txt can read."""
+    from xml.sax.saxutils import escape
+    paras = "".join(f"<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>" for line in text.splitlines())
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        z.writestr("word/document.xml",
+                   '<?xml version="1.0" encoding="UTF-8"?><w:document '
+                   'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                   f"<w:body>{paras}</w:body></w:document>")
+    return buf.getvalue()
+
+
+def pdf_bytes(text: str) -> bytes:
+    import pymupdf
+    doc = pymupdf.open()
+    lines = text.splitlines()
+    for k in range(0, len(lines), 45):
+        page = doc.new_page()
+        page.insert_text((50, 60), "\n".join(lines[k:k + 45]), fontsize=10)
+    raw = doc.tobytes()
+    doc.close()
+    return raw
+
+
+def resumes(n: int, fmt: str = "docx", seed: int = 7) -> Iterator[Tuple[str, bytes]]:
+    """(filename, bytes); every resume is distinct, so none hits the parse cache."""
+    rng, bank = random.Random(seed), _bank()
+    encode = pdf_bytes if fmt == "pdf" else docx_bytes
+    for i in range(n):
+        yield f"resume{i:06d}.{fmt}", encode(resume_text(rng, bank))
+
+
+def write_store(path: str, records: Iterator[Tuple[str, Dict]]) -> int:
+    store = RecordStore(path)
+    n = 0
+    try:
+        for key, doc in records:
+            store.put(key, doc)
+            n += 1
+    finally:
+        store.close()
+    return n
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--profiles", type=int, default=1000)
+    ap.add_argument("--users", type=int, default=1000)
+    ap.add_argument("--resumes", type=int, default=50)
+    ap.add_argument("--resume-format", choices=("docx", "pdf"), default="docx")
+    ap.add_argument("--seed", type=int, default=11)
+    ap.add_argument("--plaintext-users", action="store_true", help="legacy records without a password hash")
+    args = ap.parse_args()
+
+    from app.services.profile_features import with_features
+    from app.utils.passwords import password_hasher
+    os.makedirs(os.path.join(args.out, "resumes"), exist_ok=True)
+    t0 = time.perf_counter()
+    n_p = write_store(os.path.join(args.out, "profiles.log"),
+                      ((p["userId"], with_features(p)) for p in profiles(args.profiles, args.seed)))
+    shared = None if args.plaintext_users else password_hasher.hash_sync(PASSWORD)
+    n_u = write_store(os.path.join(args.out, "users.log"), users(args.users, shared))
+    for name, raw in resumes(args.resumes, args.resume_format, args.seed):
+        with open(os.path.join(args.out, "resumes", name), "wb") as f:
+            f.write(raw)
+    print(f"✅ {n_p} profiles, {n_u} users, {args.resumes} resumes -> {args.out} "
+          f"({time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+# tests/conftest.py
+import os, sys
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+# benchmarks/synthetic.py doubles as the test data generator
+BENCH_DIR = os.path.join(BASE_DIR, "benchmarks")
+if BENCH_DIR not in sys.path:
+    sys.path.append(BENCH_DIR)
+
+
+@pytest.fixture
+def tmp_db(tmp_path, monkeypatch):
+    """Point the user / profile stores at empty logs under tmp_path."""
+    from app.utils import database
+    monkeypatch.setattr(database, "USER_LOG", str(tmp_path / "users.log"))
+    monkeypatch.setattr(database, "USER_DB", str(tmp_path / "users.json"))
+    monkeypatch.setattr(database, "LEGACY_AUTH_USER_DB", str(tmp_path / "legacy-users.json"))
+    monkeypatch.setattr(database, "PROFILE_LOG", str(tmp_path / "profiles.log"))
+    monkeypatch.setattr(database, "PROFILE_DB", str(tmp_path / "profiles.json"))
+    monkeypatch.setattr(database, "_stores", {})
+    database._profile_cache.clear()
+    yield database
+    database._profile_cache.clear()
@@ -0,0 +1,69 @@
+# tests/test_auth_routes.py
+"""
+Auth routes against throwaway stores.
+
+    cd backend-ml && python -m pytest tests/test_auth_routes.py
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.utils.passwords import PasswordHasher
+
+
+@pytest.fixture
+def client(tmp_db, monkeypatch):
+    from app.routes import auth_routes
+    # cheapest scrypt cost: these tests count hashes, not time them
+    hasher = PasswordHasher(workers=1, queue_depth=4, log_n=10)
+    monkeypatch.setattr(auth_routes, "password_hasher", hasher)
+    app = FastAPI()
+    app.include_router(auth_routes.router, prefix="/auth")
+    with TestClient(app) as c:
+        c.hasher = hasher
+        yield c
+
+
+def test_duplicate_signup_is_rejected_before_hashing(client):
+    body = {"name": "Ada", "email": "ada@example.com", "password": "pw-123456"}
+    assert client.post("/auth/signup", json=body).status_code == 200
+    assert client.hasher.hashed == 1
+
+    r = client.post("/auth/signup", json=body)
+    assert r.status_code == 400
+    assert client.hasher.hashed == 1  # no scrypt for an email that's taken
+
+    r = client.post("/auth/login", json={"email": "ada@example.com", "password": "pw-123456"})
+    assert r.status_code == 200
+    assert client.post("/auth/login", json={"email": "ada@example.com", "password": "nope"}).status_code == 401
+
+
+def _signup(client, email):
+    assert client.post("/auth/signup", json={"name": "Ada", "email": email, "password": "pw-123456"}).status_code == 200
+
+
+def test_send_otp_stores_code_only_once_queued(client, monkeypatch):
+    from app.routes import auth_routes
+    from app.utils import email_sender
+    from app.utils.otp_store import OTPStore, MISSING, OK
+    otp_store = OTPStore()  # in-memory, whatever OTP_STORE_PATH says
+    monkeypatch.setattr(auth_routes, "otp_store", otp_store)
+    monkeypatch.setattr(email_sender, "RESEND_API_KEY", "test-key")
+    sent = []
+    monkeypatch.setattr(email_sender.email_queue, "enqueue", lambda payload: sent.append(payload))
+    _signup(client, "otp@example.com")
+
+    assert client.post("/auth/send-otp", json={"email": "otp@example.com"}).status_code == 200
+    code = otp_store._codes["otp@example.com"][0]
+    assert code in sent[0]["html"]
+    assert otp_store.check("otp@example.com", code) == OK
+
+    def full(payload):
+        raise email_sender.EmailQueueFull()
+
+    monkeypatch.setattr(email_sender.email_queue, "enqueue", full)
+    assert client.post("/auth/send-otp", json={"email": "otp@example.com"}).status_code == 503
+    assert otp_store.check("otp@example.com", code) == OK  # the mailed code still works, no new one stored
+
+    otp_store.consume("otp@example.com", code)
+    assert client.post("/auth/send-otp", json={"email": "otp@example.com"}).status_code == 503
+    assert otp_store.check("otp@example.com", "000000") == MISSING
@@ -0,0 +1,36 @@
+import bench_suite
+import synthetic
+
+
+def test_summary_stays_within_observed_range():
+    s = bench_suite._summary([1.0, 2.0, 3.0, 100.0], "us")
+    assert s["n"] == 4 and s["unit"] == "us"
+    assert 1.0 <= s["p50"] <= s["p95"] <= s["p99"] <= s["max"] == 100.0
+
+
+def test_summary_of_a_single_sample():
+    s = bench_suite._summary([5.0], "ms")
+    assert s["n"] == 1
+    assert s["p50"] == s["p99"] == s["max"] == s["mean"] == 5.0
+
+
+def test_synthetic_data_is_reproducible():
+    assert list(synthetic.profiles(20, seed=3)) == list(synthetic.profiles(20, seed=3))
+    assert list(synthetic.profiles(20, seed=3)) != list(synthetic.profiles(20, seed=4))
+    assert list(synthetic.resumes(3, seed=5)) == list(synthetic.resumes(3, seed=5))
+
+    ids = [p["userId"] for p in synthetic.profiles(50)]
+    assert len(set(ids)) == 50 and ids[0] == synthetic.user_id(0)
+
+
+def test_write_store_round_trips(tmp_path):
+    from app.utils.record_store import RecordStore
+
+    path = str(tmp_path / "users.db")
+    assert synthetic.write_store(path, synthetic.users(10)) == 10
+    store = RecordStore(path)
+    try:
+        doc = store.get(synthetic.email(3))
+        assert doc["id"] == synthetic.user_id(3) and doc["password"] == synthetic.PASSWORD
+    finally:
+        store.close()
@@ -0,0 +1,45 @@
+# tests/test_career_matching.py
+"""
+The skill -> career inverted index against a brute-force scan of the catalogue.
+
+    cd backend-ml && python -m pytest tests/test_career_matching.py
+"""
+import json
+import pytest
+import synthetic
+from app.services import career_service
+from app.services.catalogue import catalogue
+from app.services.profile_features import get_features, normalize_skill, with_features
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    return [with_features(p) for p in synthetic.profiles(300, seed=5)]
+
+
+def _brute_force(snap, skills, k=career_service.CAREER_TOP_K):
+    scored = []
+    for pos, career in enumerate(snap.careers):
+        overlap = len(set(skills) & {normalize_skill(s) for s in career["skills"]})
+        if overlap:
+            scored.append((-overlap, pos))
+    return [(pos, -neg * 20) for neg, pos in sorted(scored)[:k]]
+
+
+def test_index_matches_brute_force(profiles):
+    snap = catalogue.current()
+    for p in profiles:
+        skills = get_features(p)["skills"]
+        assert career_service._match_careers(snap, skills) == _brute_force(snap, skills)
+
+
+def test_batch_and_encoded_paths_agree(profiles, monkeypatch):
+    monkeypatch.setattr(career_service, "MATCH_ENGINE", "overlap")
+    batch = career_service.recommend_careers_batch(profiles)
+    for p, rows in zip(profiles, batch):
+        assert career_service.recommend_careers(p) == rows
+        assert json.loads(career_service.recommend_careers_json(p)) == rows
+
+
+def test_no_skills():
+    assert career_service.recommend_careers(with_features({"skills": []}))["careers"] == []
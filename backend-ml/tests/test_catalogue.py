@@ -0,0 +1,61 @@
+import json, os
+
+from app.services.catalogue import Catalogue
+
+
+def _source(path, extra_skill=None):
+    data = {
+        "careers": {"Data Analyst": {"skills": ["python", "sql"]}},
+        "exams": [{"name": "GATE", "skills": ["python"]}],
+        "career_clusters": {"Data Analyst": {"keywords": ["data"]}},
+        "exam_skills": [],
+        "skill_bank": ["python", "sql"] + ([extra_skill] if extra_skill else []),
+    }
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_picks_up_edited_source(tmp_path):
+    src, out = str(tmp_path / "catalogue.json"), str(tmp_path / "catalogue.bin")
+    _source(src)
+    cat = Catalogue(path=out, source=src, check_interval=0)
+
+    builds, seen = [], []
+    cat.derive("skills", lambda snap: builds.append(1) or [r for r in snap.skill_bank])
+    cat.on_reload(seen.append)
+
+    old = cat.current()
+    assert list(old.get("skills")) == ["python", "sql"]
+    assert cat.reload() is False       # nothing changed
+    assert seen == []
+
+    _source(src, extra_skill="excel")
+    _bump_mtime(src)
+    assert cat.reload() is True
+
+    new = cat.current()
+    assert new is not old and seen == [new]
+    assert new.version("skill_bank") != old.version("skill_bank")
+    assert new.version("careers") == old.version("careers")
+    assert list(new.get("skills")) == ["python", "sql", "excel"]
+    # the old snapshot keeps its own index
+    assert list(old.get("skills")) == ["python", "sql"]
+    assert len(builds) == 2 and cat.reloads == 1
+
+
+def test_lazy_derive_builds_on_first_get(tmp_path):
+    src, out = str(tmp_path / "catalogue.json"), str(tmp_path / "catalogue.bin")
+    _source(src)
+    cat = Catalogue(path=out, source=src, check_interval=0)
+    calls = []
+    cat.derive("n_careers", lambda snap: calls.append(1) or len(snap.careers), eager=False)
+
+    snap = cat.current()
+    assert calls == []
+    assert snap.get("n_careers") == 1 and snap.get("n_careers") == 1
+    assert calls == [1]
@@ -0,0 +1,50 @@
+# tests/test_database.py
+"""
+The cached profile reads in app/utils/database.py.
+
+    cd backend-ml && python -m pytest tests/test_database.py
+"""
+
+
+def test_get_profile_returns_a_private_copy(tmp_db):
+    tmp_db.upsert_profile("u1", {"skills": [{"name": "python"}]})
+    doc = tmp_db.get_profile("u1")
+    doc["skills"].append({"name": "mutated"})
+    assert tmp_db.get_profile("u1") == {"skills": [{"name": "python"}]}
+    assert tmp_db.profile_cache_stats()["hits"] >= 1
+
+
+def test_write_invalidates_cached_profile(tmp_db):
+    v1 = tmp_db.upsert_profile("u1", {"n": 1})
+    assert tmp_db.get_profile_versioned("u1") == ({"n": 1}, v1)
+    v2 = tmp_db.upsert_profile("u1", {"n": 2})
+    assert tmp_db.get_profile_versioned("u1") == ({"n": 2}, v2)
+
+
+def test_read_racing_a_write_is_not_cached(tmp_db):
+    tmp_db.upsert_profile("u1", {"n": 1})
+    tmp_db._profile_cache.clear()
+    store = tmp_db._profiles()
+    real = store.get_versioned
+
+    def read_then_write(key):
+        entry = real(key)  # the reader has the old doc...
+        store.get_versioned = real
+        tmp_db.upsert_profile("u1", {"n": 2})  # ...when a write lands
+        return entry
+
+    store.get_versioned = read_then_write
+    assert tmp_db.get_profile("u1") == {"n": 1}  # that read is served once
+    assert tmp_db.get_profile("u1") == {"n": 2}  # but never cached
+
+
+def test_batch_selection_bypasses_the_cache(tmp_db):
+    from app.services.batch_scoring import select_profiles
+    for i in range(3):
+        tmp_db.upsert_profile(f"u{i}", {"n": i})
+    tmp_db._profile_cache.clear()
+    before = tmp_db.profile_cache_stats()
+    assert [uid for uid, _ in select_profiles(["u0", "nobody", "u2"])] == ["u0", "u2"]
+    assert len(list(select_profiles())) == 3
+    after = tmp_db.profile_cache_stats()
+    assert after["size"] == 0 and after["misses"] == before["misses"]
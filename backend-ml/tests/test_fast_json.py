@@ -0,0 +1,49 @@
+import importlib.util, json
+
+import pytest
+import synthetic
+
+from app.services import career_service
+from app.services.profile_features import with_features
+from app.utils import fast_json
+
+DOC = {"name": "Zoë", "skills": ["c++", "python"], "score": 80, "gpa": 8.5, "nested": {"ok": True, "none": None}}
+
+
+def _load(monkeypatch, fast: str):
+    """A private copy of fast_json built under FAST_JSON=<fast>, leaving the app's copy alone."""
+    monkeypatch.setenv("FAST_JSON", fast)
+    spec = importlib.util.spec_from_file_location(f"_fast_json_{fast}", fast_json.__file__)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.mark.parametrize("fast", ["0", "1"])
+def test_dumps_is_compact_utf8(monkeypatch, fast):
+    if fast == "1":
+        pytest.importorskip("orjson")
+    mod = _load(monkeypatch, fast)
+    assert mod.ENGINE == ("orjson" if fast == "1" else "json")
+    body = mod.dumps(DOC)
+    assert body == json.dumps(DOC, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert "Zoë".encode("utf-8") in body
+    assert mod.loads(body) == DOC
+
+
+def test_orjson_falls_back_to_stdlib_on_big_ints(monkeypatch):
+    pytest.importorskip("orjson")
+    mod = _load(monkeypatch, "1")
+    assert mod.dumps({"n": 2 ** 70}) == b'{"n":%d}' % 2 ** 70
+
+
+def test_json_response():
+    res = fast_json.json_response(DOC, status_code=201, headers={"ETag": '"x"'})
+    assert res.status_code == 201 and res.media_type == "application/json"
+    assert res.headers["etag"] == '"x"'
+    assert json.loads(res.body) == DOC
+
+
+def test_encoded_careers_match_the_rows():
+    for profile in map(with_features, synthetic.profiles(25, seed=9)):
+        assert json.loads(career_service.recommend_careers_json(profile)) == career_service.recommend_careers(profile)
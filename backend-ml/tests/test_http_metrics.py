@@ -0,0 +1,41 @@
+# tests/test_http_metrics.py
+"""
+The `route` label of the request metrics.
+
+    cd backend-ml && python -m pytest tests/test_http_metrics.py
+"""
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from app.utils.http_metrics import REQUESTS, UNMATCHED, MetricsMiddleware
+
+
+def _labels():
+    return {labels[1] for labels in REQUESTS._values}
+
+
+def test_route_label_is_the_prefixed_template():
+    router = APIRouter()
+
+    @router.get("/{user_id}")
+    def by_user(user_id: str):
+        return {"user_id": user_id}
+
+    @router.get("/static/page")
+    def static():
+        return {}
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    # one router under two prefixes, like exam_routes (/exams and /recommend/exams)
+    app.include_router(router, prefix="/metrics-test")
+    app.include_router(router, prefix="/nested/metrics-test")
+    REQUESTS._values.clear()
+    with TestClient(app) as c:
+        assert c.get("/metrics-test/u1").status_code == 200
+        # a param value equal to a prefix segment must not be mistaken for it
+        assert c.get("/nested/metrics-test/nested").status_code == 200
+        c.get("/metrics-test/static/page")
+        c.get("/no/such/route")
+        c.get("/docs")
+    assert _labels() == {"/metrics-test/{user_id}", "/nested/metrics-test/{user_id}",
+                         "/metrics-test/static/page", "/docs", UNMATCHED}
@@ -0,0 +1,69 @@
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.lazy_routes import LazyRouters
+
+_ROUTER = '''
+from fastapi import APIRouter
+router = APIRouter()
+
+@router.get("/{item}")
+def read(item: str):
+    return {"module": __name__, "item": item}
+'''
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    """Two throwaway router modules, imported only when something asks for them."""
+    names = ["lazy_alpha_routes", "lazy_beta_routes"]
+    for name in names:
+        (tmp_path / f"{name}.py").write_text(_ROUTER)
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield names
+    for name in names:
+        sys.modules.pop(name, None)
+
+
+def _app(lazy: bool, alpha: str, beta: str):
+    app = FastAPI()
+    routers = LazyRouters(app, lazy=lazy)
+    routers.add(alpha, ("/alpha", ["A"]))
+    routers.add(beta, ("/beta", ["B"]), ("/also/beta", ["B"]))
+    return app, routers
+
+
+def test_eager_imports_at_add(modules):
+    alpha, beta = modules
+    app, routers = _app(False, alpha, beta)
+    assert alpha in sys.modules and beta in sys.modules
+    assert routers.stats()["pending"] == []
+    assert TestClient(app).get("/also/beta/x").json() == {"module": beta, "item": "x"}
+
+
+def test_lazy_loads_on_first_request_under_prefix(modules):
+    alpha, beta = modules
+    app, routers = _app(True, alpha, beta)
+    assert alpha not in sys.modules and beta not in sys.modules
+
+    assert routers.pending("/alpha/1") == [alpha]
+    assert routers.pending("/alphabet") == []
+    assert routers.pending("/also/beta") == [beta]
+
+    client = TestClient(app)
+    assert client.get("/alpha/1").json() == {"module": alpha, "item": "1"}
+    assert alpha in sys.modules and beta not in sys.modules
+    assert routers.stats()["pending"] == [beta]
+    assert routers.pending("/alpha/2") == []
+
+
+def test_openapi_loads_every_router(modules):
+    alpha, beta = modules
+    app, routers = _app(True, alpha, beta)
+    paths = TestClient(app).get("/openapi.json").json()["paths"]
+    assert {"/alpha/{item}", "/beta/{item}", "/also/beta/{item}"} <= set(paths)
+    assert routers.stats()["pending"] == []
@@ -0,0 +1,68 @@
+# tests/test_otp_store.py
+"""
+OTP issue / check / consume, expiry and the sweeper.
+
+    cd backend-ml && python -m pytest tests/test_otp_store.py
+"""
+import time
+import pytest
+from app.utils.otp_store import EXPIRED, MISMATCH, MISSING, OK, OTPStore
+
+
+@pytest.fixture(params=["memory", "shared"])
+def store(request, tmp_path):
+    s = OTPStore(ttl=60, sweep_interval=3600,
+                 store_path=str(tmp_path / "otps.log") if request.param == "shared" else "")
+    yield s
+    s.stop()
+
+
+def test_issue_check_consume(store):
+    store.issue("a@example.com", "123456")
+    assert store.check("a@example.com", "123456") == OK
+    assert store.check("a@example.com", "654321") == MISMATCH
+    assert store.check("b@example.com", "123456") == MISSING
+    assert store.consume("a@example.com", "654321") == MISMATCH
+    assert store.consume("a@example.com", "123456") == OK
+    assert store.consume("a@example.com", "123456") == MISSING  # single use
+
+
+def test_expiry(store):
+    store.issue("a@example.com", "123456", ttl=0.05)
+    time.sleep(0.1)
+    assert store.check("a@example.com", "123456") == EXPIRED
+    assert store.consume("a@example.com", "123456") == EXPIRED
+
+
+def test_reissue_replaces_code(store):
+    store.issue("a@example.com", "111111")
+    store.issue("a@example.com", "222222")
+    assert store.check("a@example.com", "111111") == MISMATCH
+    assert store.check("a@example.com", "222222") == OK
+
+
+def test_sweep_drops_only_expired(store):
+    now = time.time()
+    store.issue("old@example.com", "1", ttl=10)
+    store.issue("new@example.com", "2", ttl=1000)
+    # re-issued with a longer ttl: its first expiry must not remove it
+    store.issue("again@example.com", "3", ttl=10)
+    store.issue("again@example.com", "4", ttl=1000)
+    assert store.sweep(now=now + 100) == 1
+    assert len(store) == 2
+    assert store.check("old@example.com", "1") == MISSING
+    assert store.check("again@example.com", "4") == OK
+
+
+def test_snapshot_survives_restart(tmp_path):
+    path = str(tmp_path / "otps.json")
+    s = OTPStore(snapshot_path=path, sweep_interval=3600)
+    s.issue("a@example.com", "123456")
+    s.issue("gone@example.com", "1", ttl=0.01)
+    time.sleep(0.05)
+    s.snapshot()
+    s.stop()
+    reloaded = OTPStore(snapshot_path=path, sweep_interval=3600)
+    assert reloaded.check("a@example.com", "123456") == OK
+    assert reloaded.check("gone@example.com", "1") == MISSING  # expired codes aren't reloaded
+    reloaded.stop()
@@ -0,0 +1,53 @@
+# tests/test_parse_pool.py
+"""
+ParsePool admission, timeouts and worker recycling.
+
+    cd backend-ml && python -m pytest tests/test_parse_pool.py
+"""
+import asyncio, os, time
+import pytest
+from app.services.parse_pool import ParsePool, ParserBusy, ParseTimeout
+
+
+def _sleep(seconds: float) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+@pytest.fixture
+def pool():
+    p = ParsePool(workers=1, queue_depth=1, timeout=0.5)
+    yield p
+    p.shutdown()
+
+
+def test_stuck_job_is_killed_and_pool_recovers(pool):
+    async def scenario():
+        stuck = asyncio.ensure_future(pool.run(_sleep, 60))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(pool.run(_sleep, 0))  # waits behind the stuck job
+        with pytest.raises(ParseTimeout):
+            await stuck
+        # the queued job is resubmitted to a fresh worker instead of failing
+        first = await queued
+        # and the stuck worker no longer holds a slot: the pool keeps admitting
+        assert await pool.run(_sleep, 0) == first
+        return first
+
+    t0 = time.perf_counter()
+    asyncio.run(scenario())
+    assert time.perf_counter() - t0 < 10  # nobody waited for the 60 s job
+    assert pool.stats()["recycled"] == 1
+    assert pool.stats()["in_flight"] == 0
+
+
+def test_full_queue_is_rejected(pool):
+    async def scenario():
+        jobs = [asyncio.ensure_future(pool.run(_sleep, 0.2)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(ParserBusy):
+            await pool.run(_sleep, 0)
+        await asyncio.gather(*jobs)
+
+    asyncio.run(scenario())
+    assert pool.stats()["rejected"] == 1
@@ -0,0 +1,113 @@
+# tests/test_profile_patch.py
+"""
+Profile patches: the patch formats themselves, and PATCH /profile/{id}.
+
+    cd backend-ml && python -m pytest tests/test_profile_patch.py
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.services.profile_patch import PatchError, PatchTestFailed, apply_patch, json_patch, merge_patch
+
+DOC = {"skills": [{"name": "python"}, {"name": "sql"}], "preferences": {"arrangement": "onsite", "relocate": True},
+       "profileCompletion": 0, "name": "Ada"}
+
+
+# ---------- merge patch ----------
+def test_merge_patch_null_removes_field():
+    out = merge_patch(DOC, {"name": None, "preferences": {"relocate": None, "arrangement": "remote"}})
+    assert "name" not in out
+    assert out["preferences"] == {"arrangement": "remote"}
+    assert DOC["name"] == "Ada" and DOC["preferences"]["relocate"] is True  # input untouched
+
+
+def test_apply_patch_reports_changed_fields():
+    patched, changed = apply_patch(DOC, {"name": None, "profileCompletion": 0})
+    assert changed == {"name"}
+    assert "name" not in patched
+
+
+# ---------- JSON patch ----------
+def test_add_at_end_of_list():
+    out = json_patch(DOC, [{"op": "add", "path": "/skills/-", "value": {"name": "docker"}}])
+    assert [s["name"] for s in out["skills"]] == ["python", "sql", "docker"]
+    assert len(DOC["skills"]) == 2
+
+
+def test_add_inserts_before_index():
+    out = json_patch(DOC, [{"op": "add", "path": "/skills/0", "value": {"name": "go"}}])
+    assert [s["name"] for s in out["skills"]] == ["go", "python", "sql"]
+
+
+@pytest.mark.parametrize("path", ["/skills/01", "/skills/-1", "/skills/x", "/skills/5"])
+def test_bad_list_index(path):
+    with pytest.raises(PatchError):
+        json_patch(DOC, [{"op": "remove", "path": path}])
+
+
+def test_move_into_itself():
+    with pytest.raises(PatchError, match="into itself"):
+        json_patch(DOC, [{"op": "move", "from": "/preferences", "path": "/preferences/nested"}])
+
+
+def test_move_and_copy():
+    out = json_patch(DOC, [{"op": "copy", "from": "/skills/0", "path": "/skills/-"},
+                           {"op": "move", "from": "/skills/0", "path": "/skills/1"}])
+    assert [s["name"] for s in out["skills"]] == ["sql", "python", "python"]
+
+
+def test_test_op():
+    json_patch(DOC, [{"op": "test", "path": "/preferences/relocate", "value": True}])
+    with pytest.raises(PatchTestFailed):
+        json_patch(DOC, [{"op": "test", "path": "/name", "value": "Bob"}])
+
+
+@pytest.mark.parametrize("path,value", [("/preferences/relocate", 1), ("/profileCompletion", False),
+                                        ("/skills", [{"name": "python"}, {"name": "sql"}, {"name": "go"}])])
+def test_test_op_is_type_aware(path, value):
+    with pytest.raises(PatchTestFailed):
+        json_patch(DOC, [{"op": "test", "path": path, "value": value}])
+
+
+def test_failed_op_leaves_doc_untouched():
+    with pytest.raises(PatchError):
+        json_patch(DOC, [{"op": "remove", "path": "/name"}, {"op": "remove", "path": "/missing"}])
+    assert DOC["name"] == "Ada"
+
+
+# ---------- PATCH /profile/{id} ----------
+@pytest.fixture
+def client(tmp_db):
+    from app.routes import profile_routes
+    app = FastAPI()
+    app.include_router(profile_routes.router, prefix="/profile")
+    with TestClient(app) as c:
+        assert c.post("/profile/save", json={"userId": "u1", "name": "Ada", "skills": [{"name": "python"}]}).status_code == 200
+        yield c
+
+
+def test_patch_route_applies_and_versions(client):
+    r = client.patch("/profile/u1", json=[{"op": "add", "path": "/skills/-", "value": {"name": "sql"}}])
+    assert r.status_code == 200
+    assert [s["name"] for s in r.json()["skills"]] == ["python", "sql"]
+    etag = r.headers["ETag"]
+
+    r = client.patch("/profile/u1", json={"name": None}, headers={"If-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["name"] == ""  # removed field goes back to its default
+    # the old version no longer matches
+    r = client.patch("/profile/u1", json={"name": "Eve"}, headers={"If-Match": etag})
+    assert r.status_code == 409
+
+
+def test_patch_route_test_failure_is_409(client):
+    r = client.patch("/profile/u1", json=[{"op": "test", "path": "/name", "value": "Bob"},
+                                          {"op": "replace", "path": "/name", "value": "Eve"}])
+    assert r.status_code == 409
+    assert client.get("/profile/u1").json()["name"] == "Ada"
+
+
+def test_patch_route_rejects_bad_patch(client):
+    assert client.patch("/profile/u1", json=[{"op": "remove", "path": "/skills/01"}]).status_code == 422
+    assert client.patch("/profile/u1", json={"skills": "python"}).status_code == 422
+    assert client.patch("/profile/nobody", json={"name": "x"}).status_code == 404
@@ -0,0 +1,46 @@
+# tests/test_recommendation_routes.py
+"""
+GET /recommend/careers/{id} and POST /recommend/batch against a throwaway store.
+
+    cd backend-ml && python -m pytest tests/test_recommendation_routes.py
+"""
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.services.career_service import recommend_careers
+from app.services.profile_features import with_features
+from app.utils.record_store import RecordStore
+
+PROFILE = {"userId": "u1", "skills": [{"name": "python"}, {"name": "sql"}, {"name": "machine learning"}]}
+
+
+@pytest.fixture
+def client(tmp_db):
+    from app.routes import recommendation_routes
+    tmp_db.upsert_profile("u1", with_features(dict(PROFILE)))
+    tmp_db.upsert_profile("u2", with_features({"userId": "u2", "skills": []}))
+    app = FastAPI()
+    app.include_router(recommendation_routes.router, prefix="/recommend")
+    with TestClient(app) as c:
+        yield c
+
+
+def test_careers_for_one_profile_never_scan_the_store(client, monkeypatch):
+    def scan(self):
+        raise AssertionError("a single-profile request walked the whole store")
+
+    monkeypatch.setattr(RecordStore, "items", scan)
+    r = client.get("/recommend/careers/u1")
+    assert r.status_code == 200
+    assert r.json() == recommend_careers(with_features(dict(PROFILE)))
+    assert r.json()[0]["matchingScore"] > 0
+    assert client.get("/recommend/careers/nobody").status_code == 404
+
+
+def test_batch_streams_one_line_per_known_profile(client):
+    r = client.post("/recommend/batch", json={"userIds": ["u1", "nobody", "u2"], "batchSize": 1})
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["userId"] for row in rows] == ["u1", "u2"]
+    assert rows[0]["careers"] == recommend_careers(with_features(dict(PROFILE)))
+    assert rows[1]["careers"]["careers"] == []
@@ -0,0 +1,65 @@
+# tests/test_results_cache.py
+"""
+Precomputed results, their ETags and 304s.
+
+    cd backend-ml && python -m pytest tests/test_results_cache.py
+"""
+import time
+import pytest
+from app.services import results_cache as rc
+from app.services.profile_features import with_features
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    version = {"v": "1"}
+    calls = []
+
+    def compute(profile):
+        calls.append(profile["userId"])
+        return {"skills": sorted(s["name"] for s in profile["skills"])}
+
+    c = rc.ResultsCache(maxsize=16)
+    c.register("demo", compute, lambda: version["v"])
+    monkeypatch.setattr(rc, "results_cache", c)
+    c.version, c.calls = version, calls
+    return c
+
+
+def _profile(*skills):
+    return with_features({"userId": "u1", "skills": [{"name": s} for s in skills]})
+
+
+def test_etag_round_trip_gives_304(cache):
+    profile = _profile("python")
+    r = rc.cached_response("demo", profile, None)
+    assert r.status_code == 200 and r.body == b'{"skills":["python"]}'
+    etag = r.headers["ETag"]
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        r304 = rc.cached_response("demo", profile, header)
+        assert r304.status_code == 304 and r304.body == b""
+        assert r304.headers["ETag"] == etag
+    assert rc.cached_response("demo", profile, '"stale"').status_code == 200
+    assert cache.calls == ["u1"]  # computed once, every later answer came from the cache
+
+
+def test_profile_or_catalogue_change_changes_etag(cache):
+    etag = rc.cached_response("demo", _profile("python"), None).headers["ETag"]
+    changed = rc.cached_response("demo", _profile("python", "sql"), etag)
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+    cache.version["v"] = "2"
+    reloaded = rc.cached_response("demo", _profile("python"), etag)
+    assert reloaded.status_code == 200 and reloaded.headers["ETag"] != etag
+
+
+def test_catalogue_change_rewarms_recent_profiles(cache):
+    cache.get("demo", _profile("python"))
+    cache.version["v"] = "2"
+    assert cache.check_catalogues()
+    deadline = time.time() + 5
+    while cache.recomputed < 1 and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.recomputed == 1
+    assert not cache.check_catalogues()  # nothing changed since
@@ -0,0 +1,53 @@
+# tests/test_resume_cache.py
+"""
+Resume blob storage and eviction.
+
+    cd backend-ml && python -m pytest tests/test_resume_cache.py
+"""
+import os, time
+from app.services.resume_cache import ResumeCache
+
+
+def _upload(cache, name, size=8):
+    path = os.path.join(cache.upload_dir, name)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    return path
+
+
+def test_reupload_reuses_and_touches_blob(tmp_path):
+    cache = ResumeCache(str(tmp_path))
+    path = cache.store_blob("d1", "pdf", _upload(cache, "up1"))
+    os.utime(path, (time.time() - 1000,) * 2)
+    src = _upload(cache, "up2")
+    assert cache.store_blob("d1", "pdf", src) == path
+    assert not os.path.exists(src)
+    assert os.path.getmtime(path) > time.time() - 60
+
+
+def test_blob_evicted_during_reupload_is_stored_again(tmp_path, monkeypatch):
+    cache = ResumeCache(str(tmp_path))
+    path = cache.store_blob("d1", "pdf", _upload(cache, "up1"))
+    real_exists = os.path.exists
+
+    def exists_then_evicted(p):
+        found = real_exists(p)
+        if p == path and found:
+            os.remove(p)  # eviction wins the race right after the existence check
+        return found
+
+    monkeypatch.setattr(os.path, "exists", exists_then_evicted)
+    src = _upload(cache, "up2")
+    assert cache.store_blob("d1", "pdf", src) == path
+    monkeypatch.undo()
+    assert os.path.exists(path) and not os.path.exists(src)
+
+
+def test_eviction_spares_young_blobs(tmp_path):
+    cache = ResumeCache(str(tmp_path), max_blob_bytes=10, evict_interval=0, blob_min_age=60)
+    old = cache.store_blob("old", "pdf", _upload(cache, "up1"))
+    os.utime(old, (time.time() - 1000,) * 2)
+    young = [cache.store_blob(f"d{i}", "pdf", _upload(cache, f"up{i + 2}")) for i in range(3)]
+    cache._evict()
+    assert not os.path.exists(old)
+    assert all(os.path.exists(p) for p in young)  # over budget, but may still be parsing
@@ -0,0 +1,41 @@
+# tests/test_resume_service.py
+"""
+Resume text extraction and skill matching.
+
+    cd backend-ml && python -m pytest tests/test_resume_service.py
+"""
+import pytest
+from app.services import resume_service
+
+pymupdf = pytest.importorskip("pymupdf")
+
+
+def _pdf(path, pages):
+    doc = pymupdf.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_skills_running_onto_the_next_page_are_read(tmp_path):
+    path = _pdf(tmp_path / "resume.pdf", [
+        "Asha Rao\nasha@example.com\nB.Tech Computer Science\n\nSkills\nPython, Docker",
+        "Kubernetes, PostgreSQL",
+        "Hobbies: chess",
+        "References available on request",
+    ])
+    text = resume_service._read_pdf_pymupdf(path)
+    assert "Kubernetes" in text
+    assert "References" not in text  # still stops early once the sections are covered
+
+    data = resume_service.extract_resume_data(path)
+    assert {"Python", "Docker", "Kubernetes", "Postgresql"} <= set(data["skills"])
+    assert data["email"] == "asha@example.com"
+
+
+def test_page_cap(tmp_path):
+    path = _pdf(tmp_path / "long.pdf", [f"page {i}" for i in range(5)])
+    text = resume_service._read_pdf_pymupdf(path, max_pages=2)
+    assert "page 1" in text and "page 2" not in text
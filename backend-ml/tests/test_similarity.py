@@ -0,0 +1,64 @@
+# tests/test_similarity.py
+"""
+The TF-IDF engine (MATCH_ENGINE=tfidf): per-profile scoring and top-k against
+the batch matrix product.
+
+    cd backend-ml && python -m pytest tests/test_similarity.py
+"""
+import numpy as np
+import pytest
+import synthetic
+from app.services import career_service, exam_service, similarity
+from app.services.catalogue import catalogue
+from app.services.profile_features import get_features, with_features
+
+
+@pytest.fixture(scope="module")
+def index():
+    return similarity.fit_index(catalogue.current())
+
+
+@pytest.fixture(scope="module")
+def profiles():
+    return [with_features(p) for p in synthetic.profiles(200, seed=9)]
+
+
+@pytest.fixture
+def tfidf(monkeypatch, index):
+    for module in (similarity, exam_service, career_service):
+        monkeypatch.setattr(module, "MATCH_ENGINE", "tfidf")
+    monkeypatch.setattr(catalogue.current(), "get",
+                        lambda name, _get=catalogue.current().get: index if name == "similarity" else _get(name))
+
+
+def test_single_profile_scores_match_the_batch_product(index, profiles):
+    features = [get_features(p) for p in profiles]
+    for kind in ("exams", "careers"):
+        dense = similarity.score_matrix(index, kind, features).toarray()
+        for r, f in enumerate(features):
+            row = np.zeros(dense.shape[1])
+            for pos, s in similarity.scores(index, kind, f).items():
+                row[pos] = s
+            np.testing.assert_allclose(row, dense[r], atol=1e-6)
+            assert dense[r].max() <= 1.0 + 1e-6  # cosine of L2-normalized vectors
+
+
+def test_top_k_is_best_first_with_ties_in_catalogue_order(index, profiles):
+    n = len(catalogue.current().exams)
+    for p in profiles:
+        scores = similarity.scores(index, "exams", get_features(p))
+        top = exam_service._top_k(scores, n, exam_service.TOP_K)
+        expected = sorted(range(n), key=lambda i: (-scores.get(i, 0.0), i))[:exam_service.TOP_K]
+        assert [i for i, _ in top] == expected
+
+
+def test_per_profile_and_batch_recommendations_agree(tfidf, profiles):
+    assert [exam_service.recommend_exams(p) for p in profiles] == exam_service.recommend_exams_batch(profiles)
+    assert [career_service.recommend_careers(p) for p in profiles] == career_service.recommend_careers_batch(profiles)
+
+
+def test_results_version_follows_the_engine(monkeypatch):
+    snap = catalogue.current()
+    overlap = similarity.results_version(snap, "exams")
+    monkeypatch.setattr(similarity, "MATCH_ENGINE", "tfidf")
+    assert similarity.results_version(snap, "exams") != overlap
@@ -0,0 +1,44 @@
+# tests/test_skill_trie.py
+"""
+The compiled skill trie in resume_service.
+
+    cd backend-ml && python -m pytest tests/test_skill_trie.py
+"""
+import pytest
+from app.services.resume_service import _compile_skill_trie, _extract_skills
+
+BANK = ["python", "c", "c++", "c#", "node", "javascript", "react", "machine learning", "scikit-learn",
+        "postgresql", "aws", "rest api"]
+ALIASES = {"js": "javascript", "node js": "node", "nodejs": "node", "reactjs": "react", "sklearn": "scikit-learn",
+           "postgres": "postgresql", "amazon web services": "aws", "restful api": "rest api"}
+
+
+@pytest.fixture(scope="module")
+def trie():
+    return _compile_skill_trie(BANK, ALIASES)
+
+
+def test_aliases_map_to_canonical_skills(trie):
+    text = "Built REST services in NodeJS and ReactJS, models with sklearn on Postgres, deployed to Amazon Web Services"
+    assert _extract_skills(text, trie) == ["Aws", "Node", "Postgresql", "React", "Scikit-Learn"]
+
+
+def test_longest_phrase_wins(trie):
+    # "node js" is one alias of node; "node" then "js" would wrongly add Javascript
+    assert _extract_skills("Node JS backend", trie) == ["Node"]
+    assert _extract_skills("Machine Learning and a RESTful API", trie) == ["Machine Learning", "Rest Api"]
+
+
+def test_whole_tokens_only(trie):
+    assert _extract_skills("C, C++ and C# but not cobol or pythonic", trie) == ["C", "C#", "C++"]
+    assert _extract_skills("", trie) == []
+
+
+def test_alias_to_unknown_skill_is_rejected():
+    with pytest.raises(ValueError):
+        _compile_skill_trie(["python"], {"py": "pypy"})
+
+
+def test_catalogue_trie_is_used_by_default():
+    # the shipped skill bank plus SKILL_ALIASES, compiled once per catalogue version
+    assert "Javascript" in _extract_skills("Senior JS developer")